@@ -47,6 +47,24 @@ options:
       - name: HETZNER_API_TOKEN
 """
 
+    # NOTE: This document fragment adds the wait option to modules that change record sets.
+    WAIT = r"""
+options:
+  wait:
+    description:
+      - Whether to wait for the changes to be applied.
+      - The new API (O(hetzner_api_token)) applies changes asynchronously. If set to V(false),
+        the module returns as soon as all changes have been started, and returns the IDs of the
+        started actions as RV(action_ids). Use M(felixfontein.antsibull_nox_playground.hetzner_dns_wait_for_actions)
+        to wait for them later, for example after changing multiple zones.
+      - If set to V(false), the returned record values reflect the requested state, not the
+        state returned by the API after the changes have been applied.
+      - The old API (O(hetzner_token)) always applies changes immediately.
+    type: bool
+    default: true
+    version_added: 3.6.0
+"""
+
     # NOTE: This document fragment adds additional information on records.
     RECORD_NOTES = r"""
 options: {}
@@ -42,6 +42,19 @@ options:
       - If set to V(true), will remove all existing records in the zone that are not listed in O(record_sets).
     type: bool
     default: false
+  diff_scope:
+    description:
+      - Determines which record sets are shown when the module is run in diff mode.
+      - With V(full), the diff contains all record sets of the zone before and after the changes.
+      - With V(changed), the diff only contains record sets that are created, modified, or deleted. For large zones
+        this is considerably smaller and faster to compute.
+      - This option has no effect when not running in diff mode.
+    type: str
+    choices:
+      - changed
+      - full
+    default: full
+    version_added: 3.6.0
   record_sets:
     description:
       - The records that should be present in the zone.
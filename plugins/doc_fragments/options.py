@@ -23,6 +23,28 @@ options:
     default: 2
 """
 
+    ZONE_FILE_IMPORT = r"""
+options:
+  update_strategy:
+    description:
+      - Determines how the changes are applied.
+      - With V(changes), the records are created, updated and deleted with individual or bulk requests.
+      - With V(zone_file_import), the desired state of the whole zone is rendered as a zone file,
+        which replaces all records of the zone in one request. This is faster for big changes,
+        like the initial provisioning of a zone.
+      - Changes are computed first in both cases, so nothing is sent when nothing changes.
+      - Zone files cannot contain comments of records. With V(zone_file_import), the module fails before
+        sending anything if a record of the resulting zone has a comment, also in check mode.
+      - With V(zone_file_import), record values are written to the zone file as they are sent to
+        the API. Names in values that do not end with a dot are relative to the zone.
+    type: str
+    choices:
+      - changes
+      - zone_file_import
+    default: changes
+    version_added: 3.6.0
+"""
+
     RECORD_TRANSFORMATION = r"""
 options:
   txt_transformation:
@@ -65,3 +87,124 @@ options:
     default: decimal
     version_added: 2.5.0
 """
+
+    HTTP_CLIENT = r"""
+options:
+  api_trace_file:
+    description:
+      - If set, every API request is appended to this file as a JSON object on a separate line.
+      - The objects contain the time, HTTP method, URL, URL template, HTTP status, number of bytes
+        received, latency, and time spent waiting because of rate limiting.
+    type: path
+    version_added: 3.6.0
+  collect_api_stats:
+    description:
+      - Whether to collect statistics on the API requests.
+      - Modules return the statistics as RV(ignore:api_stats). Inventory plugins ignore this option.
+      - The statistics are a dictionary with the number of requests (C(requests)), the sum of their
+        latencies in seconds (C(time)), the number of seconds spent waiting because of rate limiting
+        (C(wait)), the number of bytes received (C(bytes)), and the number of requests per HTTP status
+        (C(statuses)).
+      - The same values are returned per HTTP method and URL template as a list of dictionaries in C(endpoints),
+        with the additional keys C(method) and C(url). Identifiers in URL templates are replaced by V({id}).
+    type: bool
+    default: false
+    version_added: 3.6.0
+  http_cache_dir:
+    description:
+      - If set, responses of API requests that read data are stored in this directory and reused
+        by later tasks.
+      - If the API returns an C(ETag) or C(Last-Modified) header, the stored response is revalidated with
+        a conditional request, and the API only needs to send the data again if it changed.
+        Otherwise the stored response is reused for O(http_cache_max_age) seconds without asking the API.
+      - All stored responses are removed when a task changes anything through the API. Changes done by other
+        means might not be visible for up to O(http_cache_max_age) seconds.
+      - The stored responses can contain sensitive information. Use a directory only readable by yourself.
+      - This is only supported by the JSON based APIs.
+    type: path
+    version_added: 3.6.0
+  http_cache_max_age:
+    description:
+      - The number of seconds a stored response without C(ETag) and C(Last-Modified) header is reused
+        when O(http_cache_dir) is set.
+      - Set to V(0) to only reuse responses that can be revalidated.
+    type: float
+    default: 10
+    version_added: 3.6.0
+  http_compression:
+    description:
+      - Whether to ask the API to send compressed responses (C(gzip) or C(deflate) encoding).
+      - Record listings are very repetitive and usually compress very well, so this reduces the
+        amount of data that needs to be transferred.
+    type: bool
+    default: true
+    version_added: 3.6.0
+  http_concurrency:
+    description:
+      - The maximal number of API requests that are sent at the same time when listing
+        records or record sets that are split into multiple pages, and when creating,
+        updating, or deleting multiple records or record sets one by one.
+      - The default V(1) sends one request after the other.
+      - For APIs which do not tell the total number of pages, up to this number of following
+        pages is requested speculatively.
+      - When O(http_keepalive=true), the number of connections is also limited by O(http_max_connections).
+    type: int
+    default: 1
+    version_added: 3.6.0
+  http_keepalive:
+    description:
+      - Whether to keep HTTP connections to the API open and reuse them for further requests.
+      - This avoids a new TCP connection and TLS handshake for every request, which speeds up
+        operations that need many requests, like listing large zones or changing many records.
+      - When set to V(true), requests are sent with Python's C(http.client) instead of Ansible's
+        URL functions. TLS certificates are validated in the same way.
+      - Proxies are not supported by C(http.client). If a proxy is configured, for example with the
+        E(https_proxy) or E(http_proxy) environment variable, this option is ignored and Ansible's
+        URL functions are used.
+    type: bool
+    default: false
+    version_added: 3.6.0
+  http_max_connections:
+    description:
+      - The maximal number of simultaneous connections to the same host when O(http_keepalive=true).
+    type: int
+    default: 4
+    version_added: 3.6.0
+  http_rate_limit:
+    description:
+      - If set, limits the number of API requests to this number per second.
+      - Requests are paced with a token bucket before they are sent, instead of waiting for the
+        API to reject them with HTTP status 429. Rate limit headers returned by the API (remaining
+        requests and reset time) are taken into account.
+      - See O(http_rate_limit_file) for sharing the budget between multiple tasks running in parallel.
+    type: float
+    version_added: 3.6.0
+  http_rate_limit_burst:
+    description:
+      - The number of requests that can be sent without waiting when O(http_rate_limit) is set.
+    type: int
+    default: 10
+    version_added: 3.6.0
+  http_rate_limit_file:
+    description:
+      - A file in which the state of the rate limiter is stored when O(http_rate_limit) is set.
+      - All tasks and forks using the same file share one budget. The file is locked while being
+        updated. Use a file on a local file system that is not shared with other hosts.
+      - If not set, every task has its own budget.
+    type: path
+    version_added: 3.6.0
+  zone_cache_dir:
+    description:
+      - If set, the names, IDs, and information of zones are stored in this directory, and later
+        tasks and inventory runs look up zones there instead of asking the API.
+      - A stored zone is removed and looked up again if the API cannot find its records.
+      - This is not supported by the HostTech WSDL API.
+    type: path
+    version_added: 3.6.0
+  zone_cache_max_age:
+    description:
+      - The number of seconds a zone stored in O(zone_cache_dir) is used.
+    type: float
+    default: 3600
+    version_added: 3.6.0
+"""
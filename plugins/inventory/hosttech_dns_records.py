@@ -45,6 +45,7 @@ extends_documentation_fragment:
   - felixfontein.antsibull_nox_playground.hosttech.record_type_seealso
   - felixfontein.antsibull_nox_playground.hosttech.zone_id_type
   - felixfontein.antsibull_nox_playground.inventory_records
+  - felixfontein.antsibull_nox_playground.options.http_client
   - felixfontein.antsibull_nox_playground.options.record_transformation
   - community.library_inventory_filtering_v1.inventory_filter
 
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import json
+import re
+import sys
+import threading
+import time
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2.x fallback:
+    from urlparse import urlsplit  # type: ignore
+
+
+if sys.version_info >= (3, 6):
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from collections.abc import Callable  # pragma: no cover
+
+
+# Key in the info dictionary returned by HTTP helpers which contains the number of seconds
+# the request waited for the client-side rate limiter
+RATE_LIMIT_WAIT_INFO_KEY = 'rate_limit_wait'
+
+_LITERAL_SEGMENT = re.compile(r'^[a-z][a-z0-9_]*$')
+
+# Path segments that are followed by an identifier
+_COLLECTION_SEGMENTS = frozenset(['zones', 'records', 'rrsets'])
+
+# Path segments following a collection segment which are not identifiers
+_COLLECTION_ENDPOINTS = frozenset(['bulk'])
+
+
+def get_url_template(url):  # type: (str) -> str
+    """
+    Return the path of an URL with identifiers (IDs, zone names, record names and types)
+    replaced by ``{id}``, so that requests to the same endpoint can be grouped.
+    """
+    path = urlsplit(url).path
+    result = []
+    previous = None
+    for segment in path.split('/'):
+        if segment and (
+            not _LITERAL_SEGMENT.match(segment) or (previous in _COLLECTION_SEGMENTS and segment not in _COLLECTION_ENDPOINTS)
+        ):
+            segment = '{id}'
+        result.append(segment)
+        previous = segment
+    return '/'.join(result)
+
+
+class _EndpointStats(object):
+    def __init__(self, method, url):  # type: (str, str) -> None
+        self.method = method
+        self.url = url
+        self.requests = 0
+        self.time = 0.0
+        self.wait = 0.0
+        self.bytes = 0
+        self.statuses = {}  # type: dict[str, int]
+
+    def add(self, status, content_length, latency, wait):  # type: (int, int, float, float) -> None
+        self.requests += 1
+        self.time += latency
+        self.wait += wait
+        self.bytes += content_length
+        status_str = str(status)
+        self.statuses[status_str] = self.statuses.get(status_str, 0) + 1
+
+    def to_dict(self):  # type: (...) -> dict[str, typing.Any]
+        return {
+            'method': self.method,
+            'url': self.url,
+            'requests': self.requests,
+            'time': round(self.time, 6),
+            'wait': round(self.wait, 6),
+            'bytes': self.bytes,
+            'statuses': dict(self.statuses),
+        }
+
+
+class APIStats(object):
+    """
+    Collects statistics on the requests sent to an API.
+
+    Every request is recorded with its method, URL template, status, number of bytes received,
+    latency and the time spent waiting because of rate limiting. If ``trace_file`` is provided,
+    every request is also appended to that file as one JSON object per line.
+    """
+
+    def __init__(
+        self,
+        trace_file=None,  # type: str | None
+        clock=time.time,  # type: Callable[[], float]
+    ):  # type: (...) -> None
+        self.trace_file = trace_file
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._endpoints = {}  # type: dict[tuple[str, str], _EndpointStats]
+        self._order = []  # type: list[_EndpointStats]
+
+    def record(
+        self,
+        method,  # type: str
+        url,  # type: str
+        status,  # type: int
+        content_length,  # type: int
+        latency,  # type: float
+        wait=0.0,  # type: float
+        url_template=None,  # type: str | None
+    ):  # type: (...) -> None
+        """
+        Record one request.
+
+        @param method: The HTTP method
+        @param url: The requested URL
+        @param status: The HTTP status of the response
+        @param content_length: The number of bytes received
+        @param latency: The number of seconds between sending the request and receiving the response
+        @param wait: The number of seconds waited before or after the request because of rate limiting
+        @param url_template: The endpoint the request belongs to; by default derived from ``url``
+        """
+        if url_template is None:
+            url_template = get_url_template(url)
+        with self._lock:
+            key = (method, url_template)
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _EndpointStats(method, url_template)
+                self._order.append(endpoint)
+            endpoint.add(status, content_length, latency, wait)
+            if self.trace_file is not None:
+                line = json.dumps({
+                    'timestamp': self._clock(),
+                    'method': method,
+                    'url': url,
+                    'url_template': url_template,
+                    'status': status,
+                    'bytes': content_length,
+                    'latency': round(latency, 6),
+                    'wait': round(wait, 6),
+                }, sort_keys=True)
+                with open(self.trace_file, 'ab') as f:
+                    f.write(line.encode('utf-8') + b'\n')
+
+    def to_dict(self):  # type: (...) -> dict[str, typing.Any]
+        """
+        Return the aggregated statistics as a dictionary that can be returned by a module.
+        """
+        with self._lock:
+            endpoints = [endpoint.to_dict() for endpoint in self._order]
+        statuses = {}  # type: dict[str, int]
+        for endpoint in endpoints:
+            for status, count in endpoint['statuses'].items():
+                statuses[status] = statuses.get(status, 0) + count
+        return {
+            'requests': sum(endpoint['requests'] for endpoint in endpoints),
+            'time': round(sum(endpoint['time'] for endpoint in endpoints), 6),
+            'wait': round(sum(endpoint['wait'] for endpoint in endpoints), 6),
+            'bytes': sum(endpoint['bytes'] for endpoint in endpoints),
+            'statuses': statuses,
+            'endpoints': endpoints,
+        }
+
+
+def create_api_stats(
+    option_provider,  # type: typing.Any
+):  # type: (...) -> APIStats | None
+    """
+    Return the API statistics collector to use for the options provided by the user, if any.
+
+    @param option_provider: A object compatible with ModuleOptionProvider that gives access to the
+                            module/plugin options.
+    @return An APIStats instance, or None if no statistics should be collected.
+    """
+    trace_file = option_provider.get_option('api_trace_file')
+    if not option_provider.get_option('collect_api_stats') and trace_file is None:
+        return None
+    return APIStats(trace_file=trace_file)
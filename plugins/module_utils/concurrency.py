@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import sys
+import threading
+
+
+if sys.version_info >= (3, 6):
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from collections.abc import Callable, Sequence  # pragma: no cover
+
+
+def run_concurrently(
+    jobs,  # type: Sequence[Callable[[], typing.Any]]
+    max_workers=1,  # type: int
+):  # type: (...) -> list[typing.Any]
+    """
+    Run the given jobs with at most ``max_workers`` threads and return their results.
+
+    The results are returned in the order of the jobs, independent of the order in which
+    the jobs finished. If ``max_workers`` is at most 1, the jobs are run one after the other
+    in the current thread.
+
+    If one or more jobs raise an exception, no further jobs are started, and the exception
+    of the first failing job (in job order) is re-raised once all running jobs finished.
+
+    @param jobs: A sequence of callables without arguments
+    @param max_workers: The maximal number of jobs to run at the same time
+    @return A list with the results of the jobs.
+    """
+    if max_workers is None or max_workers <= 1 or len(jobs) <= 1:
+        return [job() for job in jobs]
+
+    results = [None] * len(jobs)  # type: list[typing.Any]
+    errors = {}  # type: dict[int, Exception]
+    lock = threading.Lock()
+    state = {'next': 0}
+
+    def worker():  # type: () -> None
+        while True:
+            with lock:
+                index = state['next']
+                if index >= len(jobs) or errors:
+                    return
+                state['next'] = index + 1
+            try:
+                results[index] = jobs[index]()
+            except Exception as exc:
+                with lock:
+                    errors[index] = exc
+
+    threads = [threading.Thread(target=worker) for dummy in range(min(max_workers, len(jobs)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[min(errors)]
+    return results
@@ -21,7 +21,32 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     decode_txt_value,
     encode_txt_value,
 )
-from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import DNSRecord
+
+
+_MEMOIZE_MAX_SIZE = 4096
+
+
+def _memoize(func, max_size=_MEMOIZE_MAX_SIZE):
+    """
+    Wrap a function of one hashable argument with a bounded memoization cache.
+
+    When the cache is full it is emptied, so memory usage stays bounded for zones
+    with many distinct values while repeated values remain cheap.
+    """
+    cache = {}
+
+    def wrapper(value):
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+        result = func(value)
+        if len(cache) >= max_size:
+            cache.clear()
+        cache[value] = result
+        return result
+
+    return wrapper
 
 
 class RecordConverter(object):
@@ -46,94 +71,126 @@ class RecordConverter(object):
         # Valid values: 'decimal', 'octal'
         self._txt_character_encoding = self._option_provider.get_option('txt_character_encoding')
 
-    def emit_deprecations(self, deprecator):
-        pass
+        self._create_transformation_plan()
 
-    def _handle_txt_api(self, to_api, record):
+    def _create_transformation_plan(self):
         """
-        Handle TXT records for sending to/from the API.
+        Determine once which TXT value transformations are needed for every direction.
+
+        Every transformation is either ``None`` (values are passed through unchanged)
+        or a memoized function converting one value.
         """
+        self._txt_from_api = None
+        self._txt_to_api = None
+        self._txt_from_user = None
+        self._txt_to_user = None
+        self._txt_from_api_to_user = None
+
         if self._txt_transformation == 'api':
             # Do not touch record values
             return
 
         # We assume that records internally use decoded values
         if self._txt_api_handling in ('encoded', 'encoded-no-octal', 'encoded-no-char-encoding'):
-            if to_api:
-                record.target = encode_txt_value(
-                    record.target,
-                    always_quote=self._txt_always_quote,
-                    use_character_encoding=self._txt_api_handling == 'encoded',
-                    character_encoding=self._txt_api_character_encoding)
-            else:
-                record.target = decode_txt_value(record.target, character_encoding=self._txt_api_character_encoding)
+            api_character_encoding = self._txt_api_character_encoding
+            always_quote = self._txt_always_quote
+            use_character_encoding = self._txt_api_handling == 'encoded'
+            self._txt_from_api = _memoize(
+                lambda value: decode_txt_value(value, character_encoding=api_character_encoding))
+            self._txt_to_api = _memoize(
+                lambda value: encode_txt_value(
+                    value,
+                    always_quote=always_quote,
+                    use_character_encoding=use_character_encoding,
+                    character_encoding=api_character_encoding))
+
+        if self._txt_transformation == 'quoted':
+            character_encoding = self._txt_character_encoding
+            self._txt_from_user = _memoize(
+                lambda value: decode_txt_value(value, character_encoding=character_encoding))
+            self._txt_to_user = _memoize(
+                lambda value: encode_txt_value(value, character_encoding=character_encoding))
+
+        # Round trip from the API to the user, used when records are only read
+        from_api = self._txt_from_api
+        to_user = self._txt_to_user
+        if from_api is not None and to_user is not None:
+            self._txt_from_api_to_user = _memoize(lambda value: to_user(from_api(value)))
+        else:
+            self._txt_from_api_to_user = from_api or to_user
 
-    def _handle_txt_user(self, to_user, record):
+    def emit_deprecations(self, deprecator):
+        pass
+
+    @staticmethod
+    def _process_records(records, transformation, convert_to_text, error_prefix):
         """
-        Handle TXT records for sending to/from the user.
+        Apply a transformation from the plan to the TXT records of an iterable of records.
+        Modifies the records in-place.
         """
-        if self._txt_transformation == 'api':
-            # Do not touch record values
+        if transformation is None:
+            if convert_to_text:
+                for record in records:
+                    record.target = to_text(record.target)
             return
-
-        # We assume that records internally use decoded values
-        if self._txt_transformation == 'quoted':
-            if to_user:
-                record.target = encode_txt_value(record.target, character_encoding=self._txt_character_encoding)
-            else:
-                record.target = decode_txt_value(record.target, character_encoding=self._txt_character_encoding)
+        for record in records:
+            target = record.target
+            if convert_to_text:
+                target = to_text(target)
+            if record.type == 'TXT':
+                try:
+                    target = transformation(target)
+                except DNSConversionError as e:
+                    raise_from(DNSConversionError(u'{0}: {1}'.format(error_prefix, e.error_message)), e)
+            record.target = target
+
+    @staticmethod
+    def _process_values(record_type, values, transformation, convert_to_text, error_prefix):
+        """
+        Apply a transformation from the plan to a list of values of the given record type.
+        """
+        if convert_to_text:
+            values = [to_text(value) for value in values]
+        else:
+            values = list(values)
+        if transformation is None or record_type != 'TXT':
+            return values
+        try:
+            return [transformation(value) for value in values]
+        except DNSConversionError as e:
+            raise_from(DNSConversionError(u'{0}: {1}'.format(error_prefix, e.error_message)), e)
 
     def process_from_api(self, record):
         """
         Process a record object (DNSRecord) after receiving from API.
         Modifies the record in-place.
         """
-        try:
-            record.target = to_text(record.target)
-            if record.type == 'TXT':
-                self._handle_txt_api(False, record)
-            return record
-        except DNSConversionError as e:
-            raise_from(DNSConversionError(u'While processing record from API: {0}'.format(e.error_message)), e)
+        self._process_records((record, ), self._txt_from_api, True, u'While processing record from API')
+        return record
 
     def process_to_api(self, record):
         """
         Process a record object (DNSRecord) for sending to API.
         Modifies the record in-place.
         """
-        try:
-            if record.type == 'TXT':
-                self._handle_txt_api(True, record)
-            return record
-        except DNSConversionError as e:  # pragma: no cover
-            # This can never happen
-            raise_from(DNSConversionError(u'While processing record for the API: {0}'.format(e.error_message)), e)  # pragma: no cover
+        self._process_records((record, ), self._txt_to_api, False, u'While processing record for the API')
+        return record
 
     def process_from_user(self, record):
         """
         Process a record object (DNSRecord) after receiving from the user.
         Modifies the record in-place.
         """
-        try:
-            record.target = to_text(record.target)
-            if record.type == 'TXT':
-                self._handle_txt_user(False, record)
-            return record
-        except DNSConversionError as e:
-            raise_from(DNSConversionError(u'While processing record from the user: {0}'.format(e.error_message)), e)
+        self._process_records((record, ), self._txt_from_user, True, u'While processing record from the user')
+        return record
 
     def process_to_user(self, record):
         """
         Process a record object (DNSRecord) for sending to the user.
         Modifies the record in-place.
         """
-        try:
-            if record.type == 'TXT':
-                self._handle_txt_user(True, record)
-            return record
-        except DNSConversionError as e:  # pragma: no cover
-            # This can never happen
-            raise_from(DNSConversionError(u'While processing record for the user: {0}'.format(e.error_message)), e)  # pragma: no cover
+        self._process_records((record, ), self._txt_to_user, False, u'While processing record for the user')
+        return record
 
     def clone_from_api(self, record):
         """
@@ -158,31 +215,29 @@ class RecordConverter(object):
         Process a list of record object (DNSRecord) after receiving from API.
         Return a list of modified clones of the records; the originals will not be modified.
         """
-        return [self.clone_from_api(record) for record in records]
+        return self.process_multiple_from_api([record.clone() for record in records])
 
     def clone_multiple_to_api(self, records):
         """
         Process a list of record objects (DNSRecord) for sending to API.
         Return a list of modified clones of the records; the originals will not be modified.
         """
-        return [self.clone_to_api(record) for record in records]
+        return self.process_multiple_to_api([record.clone() for record in records])
 
     def clone_set_to_api(self, record_set):
         """
         Process a record set object (DNSRecordSet) for sending to API.
         Return a modified clone of the record set; the original will not be modified.
         """
-        record_set = record_set.clone()
-        record_set.records = [self.clone_to_api(record) for record in record_set.records]
-        return record_set
+        # DNSRecordSet.clone() already clones the contained records
+        return self.process_set_to_api(record_set.clone())
 
     def process_multiple_from_api(self, records):
         """
         Process a list of record object (DNSRecord) after receiving from API.
         Modifies the records in-place.
         """
-        for record in records:
-            self.process_from_api(record)
+        self._process_records(records, self._txt_from_api, True, u'While processing record from API')
         return records
 
     def process_multiple_to_api(self, records):
@@ -190,8 +245,7 @@ class RecordConverter(object):
         Process a list of record objects (DNSRecord) for sending to API.
         Modifies the records in-place.
         """
-        for record in records:
-            self.process_to_api(record)
+        self._process_records(records, self._txt_to_api, False, u'While processing record for the API')
         return records
 
     def process_multiple_from_user(self, records):
@@ -199,8 +253,7 @@ class RecordConverter(object):
         Process a list of record object (DNSRecord) after receiving from the user.
         Modifies the records in-place.
         """
-        for record in records:
-            self.process_from_user(record)
+        self._process_records(records, self._txt_from_user, True, u'While processing record from the user')
         return records
 
     def process_multiple_to_user(self, records):
@@ -208,8 +261,17 @@ class RecordConverter(object):
         Process a list of record objects (DNSRecord) for sending to the user.
         Modifies the records in-place.
         """
-        for record in records:
-            self.process_to_user(record)
+        self._process_records(records, self._txt_to_user, False, u'While processing record for the user')
+        return records
+
+    def process_multiple_from_api_to_user(self, records):
+        """
+        Process a list of record objects (DNSRecord) received from the API for sending to the user.
+        This is equivalent to calling process_multiple_from_api() and process_multiple_to_user(),
+        but converts every record only once.
+        Modifies the records in-place.
+        """
+        self._process_records(records, self._txt_from_api_to_user, True, u'While processing record from API')
         return records
 
     def process_set_from_api(self, record_set):
@@ -217,8 +279,7 @@ class RecordConverter(object):
         Process a record set object (DNSRecordSet) after receiving from API.
         Modifies the records in-place.
         """
-        for record in record_set.records:
-            self.process_from_api(record)
+        self._process_records(record_set.records, self._txt_from_api, True, u'While processing record from API')
         return record_set
 
     def process_set_to_api(self, record_set):
@@ -226,8 +287,7 @@ class RecordConverter(object):
         Process a record set object (DNSRecordSet) for sending to API.
         Modifies the records in-place.
         """
-        for record in record_set.records:
-            self.process_to_api(record)
+        self._process_records(record_set.records, self._txt_to_api, False, u'While processing record for the API')
         return record_set
 
     def process_set_from_user(self, record_set):
@@ -235,8 +295,7 @@ class RecordConverter(object):
         Process a record set object (DNSRecordSet) after receiving from the user.
         Modifies the records in-place.
         """
-        for record in record_set.records:
-            self.process_from_user(record)
+        self._process_records(record_set.records, self._txt_from_user, True, u'While processing record from the user')
         return record_set
 
     def process_set_to_user(self, record_set):
@@ -244,38 +303,41 @@ class RecordConverter(object):
         Process a record set objects (DNSRecordSet) for sending to the user.
         Modifies the records in-place.
         """
-        for record in record_set.records:
-            self.process_to_user(record)
+        self._process_records(record_set.records, self._txt_to_user, False, u'While processing record for the user')
+        return record_set
+
+    def process_set_from_api_to_user(self, record_set):
+        """
+        Process a record set object (DNSRecordSet) received from the API for sending to the user.
+        This is equivalent to calling process_set_from_api() and process_set_to_user(),
+        but converts every record only once.
+        Modifies the records in-place.
+        """
+        self._process_records(record_set.records, self._txt_from_api_to_user, True, u'While processing record from API')
         return record_set
 
     def process_value_from_user(self, record_type, value):
         """
         Process a record value (string) after receiving from the user.
         """
-        record = DNSRecord()
-        record.type = record_type
-        record.target = value
-        self.process_from_user(record)
-        return record.target
+        return self.process_values_from_user(record_type, [value])[0]
 
     def process_values_from_user(self, record_type, values):
         """
         Process a list of record values (strings) after receiving from the user.
         """
-        return [self.process_value_from_user(record_type, value) for value in values]
+        return self._process_values(
+            record_type, values, self._txt_from_user, True, u'While processing record from the user')
 
     def process_value_to_user(self, record_type, value):
         """
         Process a record value (string) for sending to the user.
         """
-        record = DNSRecord()
-        record.type = record_type
-        record.target = value
-        self.process_to_user(record)
-        return record.target
+        return self.process_values_to_user(record_type, [value])[0]
 
     def process_values_to_user(self, record_type, values):
         """
         Process a list of record values (strings) for sending to the user.
         """
-        return [self.process_value_to_user(record_type, value) for value in values]
+        return self._process_values(
+            record_type, values, self._txt_to_user, False, u'While processing record for the user')
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import sys
+import threading
+import time
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.concurrency import run_concurrently
+
+
+if sys.version_info >= (3, 6):
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from collections.abc import Callable, Sequence  # pragma: no cover
+
+
+# The Hetzner Cloud API returns 25 actions per page by default
+MAX_ACTION_IDS_PER_REQUEST = 25
+
+
+class ActionTracker(object):
+    """
+    Waits for asynchronous Hetzner Cloud actions to finish.
+
+    All actions that are waited for, possibly from multiple threads, are kept in one shared
+    queue. Only one thread polls at a time; it queries the state of all pending actions in
+    batches of at most ``max_ids_per_request`` IDs. The delay between two polls starts at
+    ``initial_delay`` and is multiplied by ``backoff`` after every poll, up to ``max_delay``.
+    It is reset once the queue runs empty.
+
+    An action that the API does not return is polled again up to ``max_missing_polls`` times.
+    After that, its status is set to ``unknown``; callers must treat this as a failure.
+    """
+
+    def __init__(
+        self,
+        poll,  # type: Callable[[list[str]], list[dict[str, typing.Any]]]
+        initial_delay=0.2,  # type: float
+        max_delay=1.0,  # type: float
+        backoff=2.0,  # type: float
+        max_ids_per_request=MAX_ACTION_IDS_PER_REQUEST,  # type: int
+        max_workers=1,  # type: int
+        max_missing_polls=3,  # type: int
+    ):  # type: (...) -> None
+        """
+        @param poll: Callable that is given a list of action IDs and returns the current
+                     state of these actions
+        """
+        self._poll = poll
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.max_ids_per_request = max_ids_per_request
+        self.max_workers = max_workers
+        self.max_missing_polls = max_missing_polls
+        self._condition = threading.Condition(threading.Lock())
+        self._actions = {}  # type: dict[str, dict[str, typing.Any]]
+        self._waiters = {}  # type: dict[str, int]
+        self._missing = {}  # type: dict[str, int]
+        self._polling = False
+        self._delay = initial_delay
+
+    def _poll_pending(self, action_ids):  # type: (list[str]) -> list[dict[str, typing.Any]]
+        action_ids = sorted(action_ids)
+        chunks = [
+            action_ids[index:index + self.max_ids_per_request]
+            for index in range(0, len(action_ids), self.max_ids_per_request)
+        ]
+        results = run_concurrently([(lambda chunk=chunk: self._poll(chunk)) for chunk in chunks], max_workers=self.max_workers)
+        return [action for result in results for action in result]
+
+    def _poll_once(self):  # type: () -> None
+        # Must be called with the lock held; releases it while sleeping and polling, so that
+        # other threads can add their actions to the queue in the meantime
+        delay = self._delay
+        self._delay = min(self._delay * self.backoff, self.max_delay)
+        self._polling = True
+        try:
+            self._condition.release()
+            try:
+                time.sleep(delay)
+            finally:
+                self._condition.acquire()
+            pending = [action_id for action_id, action in self._actions.items() if action["status"] == "running"]
+            self._condition.release()
+            try:
+                actions = self._poll_pending(pending)
+            finally:
+                self._condition.acquire()
+            polled = set(pending)
+            for action in actions:
+                action_id = str(action["id"])
+                if action_id in self._actions:
+                    self._actions[action_id] = action
+                    self._missing.pop(action_id, None)
+                    polled.discard(action_id)
+            for action_id in polled:
+                if action_id not in self._actions:
+                    continue
+                # The API did not return this action; try again a few times before giving up
+                self._missing[action_id] = self._missing.get(action_id, 0) + 1
+                if self._missing[action_id] >= self.max_missing_polls:
+                    del self._missing[action_id]
+                    self._actions[action_id] = dict(self._actions[action_id], status="unknown")
+        finally:
+            self._polling = False
+            self._condition.notify_all()
+
+    def wait(
+        self,
+        actions,  # type: Sequence[dict[str, typing.Any]]
+        stop_on_first_error=False,  # type: bool
+        timeout=None,  # type: float | None
+    ):  # type: (...) -> list[dict[str, typing.Any]]
+        """
+        Wait until the given actions are no longer running.
+
+        @param actions: The actions as returned by the API
+        @param stop_on_first_error: Whether to stop waiting as soon as one action failed
+        @param timeout: The maximal number of seconds to wait, or ``None`` to wait indefinitely
+        @return The latest known state of the actions, in the same order. If
+                ``stop_on_first_error`` or ``timeout`` is set, some of them might still be running.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        action_ids = [str(action["id"]) for action in actions]
+        with self._condition:
+            if not any(action["status"] == "running" for action in self._actions.values()):
+                self._delay = self.initial_delay
+            for action_id, action in zip(action_ids, actions):
+                if action_id not in self._actions:
+                    self._actions[action_id] = action
+                self._waiters[action_id] = self._waiters.get(action_id, 0) + 1
+            try:
+                while True:
+                    current = [self._actions[action_id] for action_id in action_ids]
+                    if stop_on_first_error and any(action["status"] in ("error", "unknown") for action in current):
+                        break
+                    if not any(action["status"] == "running" for action in current):
+                        break
+                    if deadline is not None and time.time() >= deadline:
+                        break
+                    if self._polling:
+                        self._condition.wait(None if deadline is None else max(deadline - time.time(), 0))
+                    else:
+                        self._poll_once()
+            finally:
+                for action_id in action_ids:
+                    self._waiters[action_id] -= 1
+                    if not self._waiters[action_id]:
+                        del self._waiters[action_id]
+                        del self._actions[action_id]
+                        self._missing.pop(action_id, None)
+        return current
@@ -13,27 +13,39 @@ __metaclass__ = type
 
 
 import json
-import time
+import threading
+from functools import partial
 
 from ansible.module_utils.basic import env_fallback
 
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.api_stats import create_api_stats
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.argspec import ArgumentSpec
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.concurrency import run_concurrently
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hetzner.actions import ActionTracker
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import create_http_helper
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http_cache import create_response_cache
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.json_api_helper import (
     ERROR_CODES,
     UNKNOWN_ERROR,
     JSONAPIHelper,
+    consume_entries,
 )
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.options import create_http_client_argspec
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.provider import (
     ProviderInformation,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import DNSRecord
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_diff import RecordSetDiff
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_set import DNSRecordSet
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone import DNSZone
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_cache import create_zone_cache
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
     NOT_PROVIDED,
+    DNSAPIAuthenticationError,
     DNSAPIError,
     ZoneRecordAPI,
     filter_records,
+    run_bulk_changes,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_set_api import (
     ZoneRecordSetAPI,
@@ -47,6 +59,46 @@ except ImportError:
     from urllib import quote  # type: ignore
 
 
+# The maximal number of records, and the maximal size of their JSON encoding in bytes,
+# sent in one bulk request
+BULK_MAX_RECORDS = 100
+BULK_MAX_BYTES = 256 * 1024
+
+# The maximal number of requests used to refresh record sets with different prefixes and types
+# after changing them; if more are needed, all record sets of the zone are listed instead
+MAX_REFRESH_REQUESTS = 25
+
+# Estimated cost in bytes of an additional action request when comparing incremental record set
+# updates (add_records and remove_records) with set_records. This is a rough estimate, not a
+# measurement: about 250 bytes for the request line and headers of the POST request (including
+# the bearer token), and about 250 bytes for the response headers and the returned action.
+# Since remove_records is only started after add_records finished, it also costs at least one
+# additional round trip, which is not accounted for.
+ACTION_REQUEST_OVERHEAD = 512
+
+
+def _split_into_chunks(entries, max_records, max_bytes, get_json_record=lambda entry: entry):
+    """
+    Split a list of entries into chunks of at most ``max_records`` entries, whose JSON records
+    (as returned by ``get_json_record``) together take at most ``max_bytes`` bytes when encoded.
+    A single record larger than ``max_bytes`` gets its own chunk.
+    """
+    chunks = []
+    chunk = []
+    chunk_bytes = 0
+    for entry in entries:
+        entry_bytes = len(json.dumps(get_json_record(entry))) + 2
+        if chunk and (len(chunk) >= max_records or chunk_bytes + entry_bytes > max_bytes):
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(entry)
+        chunk_bytes += entry_bytes
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
 def _create_zone_from_json(source):
     zone = DNSZone(source['name'])
     zone.id = source['id']
@@ -72,7 +124,7 @@ def _create_record_from_json(source, record_type=None, has_id=True):
     result.prefix = name
     result.target = source.pop('value')
     source.pop('zone_id', None)
-    result.extra.update(source)
+    result.update_extra(source)
     return result
 
 
@@ -89,8 +141,14 @@ def _record_to_json(record, zone_id):
 
 
 class HetznerAPI(ZoneRecordAPI, JSONAPIHelper):
-    def __init__(self, http_helper, token, api='https://dns.hetzner.com/api/', debug=False):
-        JSONAPIHelper.__init__(self, http_helper, token, api=api, debug=debug)
+    def __init__(
+        self, http_helper, token, api='https://dns.hetzner.com/api/', debug=False, concurrency=1, response_cache=None, api_stats=None,
+        zone_cache=None,
+    ):
+        JSONAPIHelper.__init__(
+            self, http_helper, token, api=api, debug=debug, concurrency=concurrency, response_cache=response_cache, api_stats=api_stats)
+        self._zone_cache = zone_cache
+        self._bulk_update_unavailable = False
 
     def _create_headers(self):
         return {
@@ -135,22 +193,39 @@ class HetznerAPI(ZoneRecordAPI, JSONAPIHelper):
                 raise DNSAPIError(
                     '{0} {1} resulted in API error {2} ({3}){4}'.format(method, url, status, error_code, more))
 
-    def _list_pagination(self, url, data_key, query=None, block_size=100, accept_404=False):
-        result = []
-        page = 1
-        while True:
-            query_ = query.copy() if query else {}
-            query_['per_page'] = block_size
-            query_['page'] = page
-            res, info = self._get(url, query_, must_have_content=[200], expected=[200, 404] if accept_404 and page == 1 else [200])
-            if accept_404 and page == 1 and info['status'] == 404:
-                return None
-            result.extend(res[data_key])
-            if not isinstance(res.get('meta'), dict) and page == 1:
-                return result
-            if page >= res['meta']['pagination']['last_page']:
-                return result
-            page += 1
+    def _get_page(self, url, query, page, block_size, accept_404):
+        query_ = query.copy() if query else {}
+        query_['per_page'] = block_size
+        query_['page'] = page
+        return self._get(url, query_, must_have_content=[200], expected=[200, 404] if accept_404 and page == 1 else [200])
+
+    def _get_converted_page(self, url, query, page, block_size, data_key, converter):
+        res, dummy = self._get_page(url, query, page, block_size, False)
+        return converter(res[data_key])
+
+    def _list_pagination(self, url, data_key, query=None, block_size=100, accept_404=False, converter=list):
+        """
+        Return the entries of all pages of a list.
+
+        ``converter`` is called with the entries of every page right after it has been
+        received, and the returned lists are concatenated. Converting page by page means
+        that only the decoded JSON of the pages currently being fetched is kept in memory.
+        """
+        res, info = self._get_page(url, query, 1, block_size, accept_404)
+        if accept_404 and info['status'] == 404:
+            return None
+        result = list(converter(res[data_key]))
+        if not isinstance(res.get('meta'), dict):
+            return result
+        # The first page tells us how many pages there are, so fetch the others concurrently
+        last_page = res['meta']['pagination']['last_page']
+        pages = run_concurrently(
+            [partial(self._get_converted_page, url, query, page, block_size, data_key, converter) for page in range(2, last_page + 1)],
+            self._concurrency,
+        )
+        for entries in pages:
+            result.extend(entries)
+        return result
 
     def get_zone_by_name(self, name):
         """
@@ -187,13 +262,16 @@ class HetznerAPI(ZoneRecordAPI, JSONAPIHelper):
         @param record_type: The record type to filter for, if provided
         @return A list of DNSrecord objects, or None if zone was not found
         """
-        result = self._list_pagination('v1/records', data_key='records', query={'zone_id': zone_id}, accept_404=True)
-        if result is None:
-            return None
-        return filter_records(
-            [_create_record_from_json(record) for record in result],
-            prefix=prefix,
-            record_type=record_type,
+        return self._list_pagination(
+            'v1/records',
+            data_key='records',
+            query={'zone_id': zone_id},
+            accept_404=True,
+            converter=lambda entries: filter_records(
+                [_create_record_from_json(record) for record in consume_entries(entries)],
+                prefix=prefix,
+                record_type=record_type,
+            ),
         )
 
     def add_record(self, zone_id, record):
@@ -253,6 +331,17 @@ class HetznerAPI(ZoneRecordAPI, JSONAPIHelper):
         dummy, info = self._delete('v1/records/{id}'.format(id=record.id), must_have_content=False, expected=[200, 404])
         return info['status'] == 200
 
+    def import_zone_file(self, zone_id, zone_file):
+        """
+        Replace all records of a zone by the records of a zone file.
+
+        @param zone_id: The zone ID
+        @param zone_file: The zone file (string)
+        """
+        result, info = self._post_text('v1/zones/{0}/import'.format(zone_id), zone_file, expected=[200, 422])
+        if info['status'] == 422:
+            raise DNSAPIError('The zone file has not been accepted by the server{0}'.format(self._extract_only_error_message(result)))
+
     @staticmethod
     def _append(results_per_zone_id, zone_id, result):
         if zone_id not in results_per_zone_id:
@@ -273,14 +362,40 @@ class HetznerAPI(ZoneRecordAPI, JSONAPIHelper):
                 it was not created. It is possible that the API only creates records if all succeed,
                 in that case ``failed`` can be ``None`` even though ``created`` is ``False``.
         """
-        json_records = []
-        for zone_id, records in records_per_zone_id.items():
-            for record in records:
-                json_records.append(_record_to_json(record, zone_id=zone_id))
-        data = {'records': json_records}
-        # Error 422 means that at least one of the records was not valid
-        result, dummy = self._post('v1/records/bulk', data=data, expected=[200, 422])
+        json_records = [
+            _record_to_json(record, zone_id=zone_id)
+            for zone_id, records in records_per_zone_id.items()
+            for record in records
+        ]
+        lock = threading.Lock()
+        state = {'stop': False}
+
+        def add_chunk(chunk):
+            with lock:
+                if state['stop']:
+                    # The records of chunks skipped after an error are reported as not created
+                    return {'valid_records': chunk}
+            result = self._add_records_bulk(chunk)
+            if result.get('invalid_records') and stop_early_on_errors:
+                with lock:
+                    state['stop'] = True
+            return result
+
+        results = run_concurrently(
+            [partial(add_chunk, chunk) for chunk in _split_into_chunks(json_records, BULK_MAX_RECORDS, BULK_MAX_BYTES)],
+            self._concurrency,
+        )
         results_per_zone_id = {}
+        for result in results:
+            self._append_add_records_bulk_result(results_per_zone_id, result)
+        return results_per_zone_id
+
+    def _add_records_bulk(self, json_records):
+        # Error 422 means that at least one of the records was not valid
+        result, dummy = self._post('v1/records/bulk', data={'records': json_records}, expected=[200, 422])
+        return result
+
+    def _append_add_records_bulk_result(self, results_per_zone_id, result):
         # This is the list of invalid records that was detected before accepting the whole set
         for json_record in result.get('invalid_records') or []:
             record = _create_record_from_json(json_record, has_id=False)
@@ -301,7 +416,6 @@ class HetznerAPI(ZoneRecordAPI, JSONAPIHelper):
             record = _create_record_from_json(json_record)
             zone_id = json_record['zone_id']
             self._append(results_per_zone_id, zone_id, (record, True, None))
-        return results_per_zone_id
 
     def update_records(self, records_per_zone_id, stop_early_on_errors=True):
         """
@@ -317,35 +431,85 @@ class HetznerAPI(ZoneRecordAPI, JSONAPIHelper):
                 records if all succeed, in that case ``failed`` can be ``None`` even though
                 ``updated`` is ``False``.
         """
-        # Currently Hetzner's bulk update API seems to be broken, it always returns the error message
-        # "An invalid response was received from the upstream server". That's why for now, we always
-        # fall back to the default implementation.
-        if True:  # pylint: disable=using-constant-test
-            return super(HetznerAPI, self).update_records(records_per_zone_id, stop_early_on_errors=stop_early_on_errors)
-
-        json_records = []
+        results_per_zone_id = {}
+        entries = []
         for zone_id, records in records_per_zone_id.items():
             for record in records:
-                json_records.append(_record_to_json(record, zone_id=zone_id))
-        data = {'records': json_records}
-        result, dummy = self._put('v1/records/bulk', data=data, expected=[200])
-        results_per_zone_id = {}
-        for json_record in result.get('failed_records') or []:
-            record = _create_record_from_json(json_record)
-            zone_id = json_record['zone_id']
-            self._append(results_per_zone_id, zone_id, (record, False, DNSAPIError(
-                'Updating {type} record #{id} "{target}" with TTL {ttl} for zone {zoneID} failed with unknown reason'.format(
-                    type=record.type,
-                    id=record.id,
-                    target=record.target,
-                    ttl=record.ttl,
-                    zoneID=zone_id))))
-        for json_record in result.get('records') or []:
-            record = _create_record_from_json(json_record)
-            zone_id = json_record['zone_id']
-            self._append(results_per_zone_id, zone_id, (record, True, None))
+                if record.id is None:
+                    self._append(results_per_zone_id, zone_id, (record, False, DNSAPIError('Need record ID to update record!')))
+                    if stop_early_on_errors:
+                        return results_per_zone_id
+                    continue
+                json_record = _record_to_json(record, zone_id=zone_id)
+                json_record['id'] = record.id
+                entries.append((zone_id, record, json_record))
+        stop = False
+        for chunk in _split_into_chunks(entries, BULK_MAX_RECORDS, BULK_MAX_BYTES, get_json_record=lambda entry: entry[2]):
+            if stop:
+                # Records of chunks skipped because of an earlier error have not been updated
+                for zone_id, record, dummy in chunk:
+                    self._append(results_per_zone_id, zone_id, (record, False, None))
+                continue
+            bulk_result = None
+            if not self._bulk_update_unavailable:
+                bulk_result = self._update_records_bulk([json_record for dummy, dummy2, json_record in chunk])
+            if bulk_result is None:
+                # The bulk update API is not available, update all records of the chunk one by one
+                updated, failed_ids = {}, set(record.id for dummy, record, dummy2 in chunk)
+            else:
+                updated, failed_ids = bulk_result
+            # Retry the records that could not be updated one by one. Single updates report the
+            # reason of a failure, and records might be updated this time.
+            retry_per_zone_id = {}
+            for zone_id, record, dummy in chunk:
+                if record.id not in updated and record.id in failed_ids:
+                    retry_per_zone_id.setdefault(zone_id, []).append(record)
+            retried = {}
+            if retry_per_zone_id:
+                results = super(HetznerAPI, self).update_records(retry_per_zone_id, stop_early_on_errors=stop_early_on_errors)
+                for zone_results in results.values():
+                    for result in zone_results:
+                        retried[result[0].id] = result
+                        if result[2] is not None and stop_early_on_errors:
+                            stop = True
+            for zone_id, record, dummy in chunk:
+                if record.id in updated:
+                    self._append(results_per_zone_id, zone_id, (updated[record.id], True, None))
+                else:
+                    # Records not retried after an error have not been updated
+                    self._append(results_per_zone_id, zone_id, retried.get(record.id, (record, False, None)))
         return results_per_zone_id
 
+    def _update_records_bulk(self, json_records):
+        """
+        Update records with the bulk update API.
+
+        Return ``None`` if the bulk update API is not available. Otherwise, return a tuple
+        ``(updated, failed_ids)``, where ``updated`` maps record IDs to the updated records,
+        and ``failed_ids`` is the set of IDs of the records that could not be updated.
+        """
+        result, info = self._put('v1/records/bulk', data={'records': json_records}, must_have_content=[200], expected=[200, 502])
+        if info['status'] == 502:
+            # Hetzner's bulk update API has been seen failing as a whole with HTTP status 502 and the
+            # error message "An invalid response was received from the upstream server". In that case,
+            # do not try it again, and update the records one by one.
+            self._bulk_update_unavailable = True
+            return None
+        updated = dict(
+            (json_record['id'], _create_record_from_json(json_record))
+            for json_record in result.get('records') or []
+        )
+        failed_ids = set()
+        for failed_record in result.get('failed_records') or []:
+            if failed_record.get('id') is not None:
+                failed_ids.add(failed_record['id'])
+                continue
+            # Failed records do not necessarily contain the record ID, so find the record that was sent
+            for json_record in json_records:
+                if all(json_record.get(key) == failed_record.get(key) for key in ('zone_id', 'type', 'name', 'value')):
+                    failed_ids.add(json_record['id'])
+        return updated, failed_ids
+
 
 def _create_zone_from_new_json(source):
     zone = DNSZone(source['name'])
@@ -375,10 +539,10 @@ def _create_record_set_from_new_json(source, record_type=None):
         rec.ttl = result.ttl
         rec.target = record["value"]
         if record["comment"]:
-            rec.extra["comment"] = record["comment"]
+            rec.update_extra({"comment": record["comment"]})
         result.records.append(rec)
     source.pop('zone', None)
-    result.extra.update(source)
+    result.update_extra(source)
     return result
 
 
@@ -390,7 +554,7 @@ def _get_creation_json_data(record_set):
         "records": [
             {
                 "value": record.target,
-                "comment": record.extra.get("comment"),
+                "comment": record._get_extra().get("comment"),
             }
             for record in record_set.records
         ],
@@ -408,13 +572,51 @@ def _get_update_json_data_value(record_set):
         "records": [
             {
                 "value": record.target,
-                "comment": record.extra.get("comment"),
+                "comment": record._get_extra().get("comment"),
             }
             for record in record_set.records
         ],
     }
 
 
+def _get_update_json_data_records(record_set, updated_records):
+    """
+    Return a list of tuples ``(action, data)`` for updating the records of a record set.
+
+    If ``updated_records`` is a RecordSetDiff, use the ``add_records`` and ``remove_records``
+    actions instead of ``set_records`` if that sends less data.
+    """
+    set_records = [("set_records", _get_update_json_data_value(record_set))]
+    if not isinstance(updated_records, RecordSetDiff):
+        return set_records
+    # Add records first, so that the record set is never empty in between. The caller must
+    # wait for add_records to finish before starting remove_records.
+    requests = []
+    if updated_records.added:
+        requests.append(("add_records", {
+            "records": [
+                {
+                    "value": record.target,
+                    "comment": record._get_extra().get("comment"),
+                }
+                for record in updated_records.added
+            ],
+        }))
+    if updated_records.removed:
+        requests.append(("remove_records", {
+            "records": [
+                {
+                    "value": record.target,
+                }
+                for record in updated_records.removed
+            ],
+        }))
+    incremental_size = sum(len(json.dumps(data)) for dummy, data in requests) + (len(requests) - 1) * ACTION_REQUEST_OVERHEAD
+    if incremental_size >= len(json.dumps(set_records[0][1])):
+        return set_records
+    return requests
+
+
 def _q(value):
     return quote(str(value), safe="@*")
 
@@ -426,13 +628,27 @@ def _get_rrset_url(zone_id, prefix, record_type):
 def _format_action_error(action_with_error):
     error = action_with_error.get("error")
     if not error:
+        if action_with_error.get("status") == "unknown":
+            return "action {0} was not returned by the API".format(action_with_error["id"])
         return None
     return "{1} ({0})".format(error["code"], error["message"])
 
 
 class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
-    def __init__(self, http_helper, token, api='https://api.hetzner.cloud/', debug=False):
-        JSONAPIHelper.__init__(self, http_helper, token, api=api, debug=debug)
+    def __init__(
+        self, http_helper, token, api='https://api.hetzner.cloud/', debug=False, concurrency=1, response_cache=None, api_stats=None, wait=True,
+        zone_cache=None,
+    ):
+        """
+        If ``wait`` is ``False``, changes do not wait for their actions to finish. The IDs of
+        these actions are collected in ``started_action_ids`` instead.
+        """
+        JSONAPIHelper.__init__(
+            self, http_helper, token, api=api, debug=debug, concurrency=concurrency, response_cache=response_cache, api_stats=api_stats)
+        self._zone_cache = zone_cache
+        self._action_tracker = ActionTracker(self._poll_actions, max_workers=concurrency)
+        self.wait = wait
+        self.started_action_ids = []
 
     def _create_headers(self):
         return {
@@ -496,23 +712,44 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
         raise DNSAPIError(
             '{0} {1} resulted in API error {2}{3}'.format(method, url, status, more))
 
-    def _list_pagination(self, url, data_key, query=None, block_size=100, accept_404=False):
-        result = []
-        page = 1
-        while True:
-            query_ = query.copy() if query else {}
-            query_['per_page'] = block_size
-            query_['page'] = page
-            res, info = self._get(url, query_, must_have_content=[200], expected=[200, 404] if accept_404 and page == 1 else [200])
-            if accept_404 and page == 1 and info['status'] == 404:
-                return None
+    def _get_page(self, url, query, page, block_size, accept_404):
+        query_ = query.copy() if query else {}
+        query_['per_page'] = block_size
+        query_['page'] = page
+        res, info = self._get(url, query_, must_have_content=[200], expected=[200, 404] if accept_404 and page == 1 else [200])
+        if not (accept_404 and page == 1 and info['status'] == 404):
             self._check_error('GET', url, res, accepted=["not_found"] if accept_404 and page == 1 else [])
-            result.extend(res[data_key])
-            if not isinstance(res.get('meta'), dict) and page == 1:
-                return result
-            if page >= res['meta']['pagination']['last_page']:
-                return result
-            page += 1
+        return res, info
+
+    def _get_converted_page(self, url, query, page, block_size, data_key, converter):
+        res, dummy = self._get_page(url, query, page, block_size, False)
+        return converter(res[data_key])
+
+    def _list_pagination(self, url, data_key, query=None, block_size=100, accept_404=False, converter=list, max_workers=None):
+        """
+        Return the entries of all pages of a list.
+
+        ``converter`` is called with the entries of every page right after it has been
+        received, and the returned lists are concatenated. Converting page by page means
+        that only the decoded JSON of the pages currently being fetched is kept in memory.
+
+        At most ``max_workers`` pages are fetched at the same time; by default ``http_concurrency``.
+        """
+        res, info = self._get_page(url, query, 1, block_size, accept_404)
+        if accept_404 and info['status'] == 404:
+            return None
+        result = list(converter(res[data_key]))
+        if not isinstance(res.get('meta'), dict):
+            return result
+        # The first page tells us how many pages there are, so fetch the others concurrently
+        last_page = res['meta']['pagination']['last_page']
+        pages = run_concurrently(
+            [partial(self._get_converted_page, url, query, page, block_size, data_key, converter) for page in range(2, last_page + 1)],
+            self._concurrency if max_workers is None else max_workers,
+        )
+        for entries in pages:
+            result.extend(entries)
+        return result
 
     def get_zone_by_name(self, name):
         """
@@ -553,50 +790,51 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
         @param record_type: The record type to filter for, if provided
         @return A list of DNSrecordSet objects, or None if zone was not found
         """
+        return self._list_zone_record_sets(zone_id, prefix=prefix, record_type=record_type)
+
+    def _list_zone_record_sets(self, zone_id, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED, max_workers=None):
         query = {}
         if prefix is not NOT_PROVIDED:
             query["name"] = prefix or "@"
         if record_type is not NOT_PROVIDED:
             query["type"] = record_type
-        rrsets = self._list_pagination("v1/zones/{0}/rrsets".format(_q(zone_id)), "rrsets", query=query, accept_404=True)
-        if rrsets is None:
-            return None
-        return filter_record_sets(
-            [_create_record_set_from_new_json(rrset) for rrset in rrsets],
-            prefix=prefix,
-            record_type=record_type,
+        return self._list_pagination(
+            "v1/zones/{0}/rrsets".format(_q(zone_id)),
+            "rrsets",
+            query=query,
+            accept_404=True,
+            converter=lambda entries: filter_record_sets(
+                [_create_record_set_from_new_json(rrset) for rrset in consume_entries(entries)],
+                prefix=prefix,
+                record_type=record_type,
+            ),
+            max_workers=max_workers,
         )
 
+    def _poll_actions(self, action_ids):
+        # The action status changes while polling, and the responses have no validators,
+        # so they must not be served from the response cache
+        if len(action_ids) == 1:
+            url = "v1/actions/{0}".format(_q(action_ids[0]))
+            result, dummy = self._get(url, expected=[200], use_cache=False)
+            self._check_error('GET', url, result)
+            return [result["action"]]
+        url = "v1/actions"
+        result, dummy = self._get(url, query=[("id", action_id) for action_id in action_ids], expected=[200], use_cache=False)
+        self._check_error('GET', url, result)
+        return result["actions"]
+
     def _wait_for_actions(self, actions, what, fail_on_error=True, stop_on_first_error=False):
-        errors = []
-        other_actions = []
-        while True:
-            new_errors = [action for action in actions if action["status"] == "error"]
-            if new_errors:
-                errors.extend(new_errors)
-                if stop_on_first_error:
-                    break
-            other_actions.extend((action for action in actions if action["status"] != "running"))
-            actions = [action for action in actions if action["status"] == "running"]
-            if not actions:
-                break
-            time.sleep(1)
-            action_ids = [str(action["id"]) for action in actions]
-            if len(action_ids) == 1:
-                url = "v1/actions/{0}".format(_q(action_ids[0]))
-                result, dummy = self._get(url, expected=[200])
-                self._check_error('GET', url, result)
-                actions = [result["action"]]
-            else:
-                url = "v1/actions"
-                result, dummy = self._get(url, query=[("id", action_id) for action_id in sorted(action_ids)], expected=[200])
-                self._check_error('GET', url, result)
-                actions = result["actions"]
+        if self.wait:
+            actions = self._action_tracker.wait(actions, stop_on_first_error=stop_on_first_error)
+        else:
+            self.started_action_ids.extend(action["id"] for action in actions)
+        errors = [action for action in actions if action["status"] in ("error", "unknown")]
         if errors and fail_on_error:
             error_messages = [_format_action_error(error) for error in errors]
             raise DNSAPIError(
                 'Error while {0}: {1}'.format(what, ", ".join((msg for msg in error_messages if msg)) or "unknown"))
-        return errors, other_actions + actions
+        return errors, [action for action in actions if action["status"] not in ("error", "unknown")]
 
     def add_record_set(self, zone_id, record_set):
         """
@@ -619,11 +857,21 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
 
         @param zone_id: The zone ID
         @param record_set: The DNS record set (DNSRecordSet)
-        @param updated_records: Hint whether the values were updated.
+        @param updated_records: Hint whether the values were updated. If this is a
+                                RecordSetDiff, only the change is sent when that is smaller.
         @param updated_ttl: Hint whether the values were updated.
         @return The DNS record set (DNSRecordSet)
         """
+        actions = self._start_record_set_update(zone_id, record_set, updated_records, updated_ttl)
+        self._wait_for_actions(actions, "changing record set")
+        if not self.wait:
+            # The record set might not have been changed yet
+            return record_set
+        return self._get_record_set(zone_id, record_set.prefix, record_set.type)
+
+    def _start_record_set_update(self, zone_id, record_set, updated_records, updated_ttl):
         actions = []
+        previous_action = None
         base_url = _get_rrset_url(zone_id, record_set.prefix, record_set.type)
         if updated_ttl:
             data = _get_update_json_data_ttl(record_set)
@@ -631,14 +879,32 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
             ttl_result, dummy = self._post(url, data=data, expected=[201])
             self._check_error('POST', url, ttl_result)
             actions.append(ttl_result["action"])
+            previous_action = "change_ttl"
         if updated_records:
-            data = _get_update_json_data_value(record_set)
-            url = '{0}/actions/set_records'.format(base_url)
-            set_result, dummy = self._post(url, data=data, expected=[201])
-            self._check_error("POST", url, set_result)
-            actions.append(set_result["action"])
-        self._wait_for_actions(actions, "changing record set")
-        return self._get_record_set(zone_id, record_set.prefix, record_set.type)
+            for action, data in _get_update_json_data_records(record_set, updated_records):
+                if action == "remove_records" and previous_action == "add_records":
+                    # Only remove records once the new ones have been added, so that the record
+                    # set is never empty in between. This does not depend on self.wait.
+                    actions[-1] = self._action_tracker.wait([actions[-1]])[0]
+                    if actions[-1]["status"] in ("error", "unknown"):
+                        raise DNSAPIError('Error while adding records: {0}'.format(_format_action_error(actions[-1]) or "unknown"))
+                url = '{0}/actions/{1}'.format(base_url, action)
+                result, dummy = self._post(url, data=data, expected=[201])
+                self._check_error("POST", url, result)
+                actions.append(result["action"])
+                previous_action = action
+        return actions
+
+    def wait_for_actions(self, action_ids, timeout=None):
+        """
+        Wait until the given actions finished.
+
+        @param action_ids: A list of action IDs
+        @param timeout: The maximal number of seconds to wait, or ``None`` to wait indefinitely
+        @return A list with the latest state of the actions (dictionaries). If ``timeout``
+                is provided, some of them might still be running.
+        """
+        return self._action_tracker.wait([{"id": action_id, "status": "running"} for action_id in action_ids], timeout=timeout)
 
     def delete_record_set(self, zone_id, record_set):
         """
@@ -655,7 +921,19 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
         self._wait_for_actions([result["action"]], "deleting record set")
         return True
 
-    def _fetch_all_records(self, zone_id, prefixes_and_types):
+    def import_zone_file(self, zone_id, zone_file):
+        """
+        Replace all record sets of a zone by the records of a zone file.
+
+        @param zone_id: The zone ID
+        @param zone_file: The zone file (string)
+        """
+        url = 'v1/zones/{0}/actions/import_zonefile'.format(_q(zone_id))
+        result, dummy = self._post(url, data={'zonefile': zone_file}, expected=[201])
+        self._check_error('POST', url, result)
+        self._wait_for_actions([result["action"]], "importing zone file")
+
+    def _fetch_all_records(self, zone_id, prefixes_and_types, max_workers=None):
         if not prefixes_and_types:
             return []
         common_prefix, common_type = prefixes_and_types[0]
@@ -666,7 +944,61 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
             common_prefix = NOT_PROVIDED
         if any(common_type != r_type for _prefix, r_type in prefixes_and_types):
             common_type = NOT_PROVIDED
-        return self.get_zone_record_sets(zone_id, prefix=common_prefix, record_type=common_type)
+        if common_prefix is NOT_PROVIDED and common_type is NOT_PROVIDED:
+            # Fetch the record sets of every prefix on its own instead of listing the whole zone
+            prefixes = []
+            prefixes_and_types_per_prefix = {}
+            for prefix, r_type in prefixes_and_types:
+                if prefix not in prefixes_and_types_per_prefix:
+                    prefixes.append(prefix)
+                    prefixes_and_types_per_prefix[prefix] = []
+                prefixes_and_types_per_prefix[prefix].append((prefix, r_type))
+            if len(prefixes) <= MAX_REFRESH_REQUESTS:
+                # Every prefix fetches its pages one by one, so that no more than
+                # http_concurrency requests are running at the same time
+                results = run_concurrently(
+                    [partial(self._fetch_all_records, zone_id, prefixes_and_types_per_prefix[prefix], max_workers=1) for prefix in prefixes],
+                    max_workers=self._concurrency,
+                )
+                return [record_set for result in results for record_set in result]
+        return self._list_zone_record_sets(zone_id, prefix=common_prefix, record_type=common_type, max_workers=max_workers)
+
+    def _submit_record_set_changes(self, items_per_zone_id, submit, stop_early_on_errors, get_record_set=lambda item: item):
+        """
+        Call ``submit(zone_id, item)`` for every item, with at most ``http_concurrency`` calls
+        running at the same time. ``submit`` must return a tuple ``(record_set, actions)``, where
+        ``actions`` is a list of started actions or ``None``. If it fails, the record set
+        returned by ``get_record_set(item)`` is reported as failed.
+
+        Return a tuple ``(data_per_zone_id, actions, stop)`` for ``_collect_results()``, where
+        ``stop`` indicates that processing stopped because of an error.
+        """
+        def change(zone_id, item):
+            try:
+                record_set, item_actions = submit(zone_id, item)
+                return (record_set, item_actions, None), True, None
+            except DNSAPIError as e:
+                return (get_record_set(item), None, e), False, e
+
+        results_per_zone_id = run_bulk_changes(
+            items_per_zone_id, change, stop_early_on_errors=stop_early_on_errors, max_workers=self._concurrency)
+        actions = {}
+        data_per_zone_id = {}
+        stop = False
+        for zone_id, results in results_per_zone_id.items():
+            data = []
+            data_per_zone_id[zone_id] = data
+            for (record_set, item_actions, error), dummy, dummy2 in results:
+                if error is not None and stop_early_on_errors:
+                    stop = True
+                action_ids = None
+                if item_actions is not None:
+                    action_ids = []
+                    for action in item_actions:
+                        actions[action["id"]] = action
+                        action_ids.append(action["id"])
+                data.append((record_set, action_ids, error))
+        return data_per_zone_id, actions, stop
 
     def _collect_results(self, what, data_per_zone_id, actions, do_wait, stop_early_on_errors, refresh_rrsets=True):
         errors = {}
@@ -687,7 +1019,7 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
             for record_set, action_ids, error in datas:
                 if error is not None:
                     result.append((record_set, False, error))
-                error = None
+                    continue
                 rr_errors = [errors[action_id] for action_id in action_ids or [] if action_id in errors]
                 if rr_errors:
                     # If there are multiple ones, only use the first
@@ -696,7 +1028,7 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
                     # Need to refresh this record set
                     refresh[(record_set.prefix, record_set.type)] = len(result)
                     result.append((record_set, True, None))
-            if refresh_rrsets:
+            if refresh_rrsets and self.wait:
                 for record_set in self._fetch_all_records(zone_id, list(refresh.keys())):
                     index = refresh.get((record_set.prefix, record_set.type))
                     if index is not None:
@@ -717,28 +1049,13 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
                 it was not created. It is possible that the API only creates record sets if all succeed,
                 in that case ``failed`` can be ``None`` even though ``created`` is ``False``.
         """
-        actions = {}
-        data_per_zone_id = {}
-        stop = False
-        for zone_id, record_sets in record_sets_per_zone_id.items():
-            data = []
-            data_per_zone_id[zone_id] = data
-            for record_set in record_sets:
-                creation_data = _get_creation_json_data(record_set)
-                try:
-                    url = 'v1/zones/{0}/rrsets'.format(_q(zone_id))
-                    res, dummy = self._post(url, data=creation_data, expected=[201])
-                    self._check_error("POST", url, res)
-                    action = res["action"]
-                    actions[action["id"]] = action
-                    data.append((_create_record_set_from_new_json(res["rrset"]), [action["id"]], None))
-                except DNSAPIError as e:
-                    data.append((record_set, None, e))
-                    if stop_early_on_errors:
-                        stop = True
-                        break
-            if stop:
-                break
+        def submit(zone_id, record_set):
+            url = 'v1/zones/{0}/rrsets'.format(_q(zone_id))
+            res, dummy = self._post(url, data=_get_creation_json_data(record_set), expected=[201])
+            self._check_error("POST", url, res)
+            return _create_record_set_from_new_json(res["rrset"]), [res["action"]]
+
+        data_per_zone_id, actions, stop = self._submit_record_set_changes(record_sets_per_zone_id, submit, stop_early_on_errors)
         return self._collect_results(
             "adding record sets", data_per_zone_id, actions, do_wait=not stop, stop_early_on_errors=stop_early_on_errors, refresh_rrsets=False)
 
@@ -748,7 +1065,7 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
 
         @param record_sets_per_zone_id: Maps a zone ID to a list of tuples
                                         (record_set, updated_records, updated_ttl)
-                                        of type (DNSRecordSet, bool, bool).
+                                        of type (DNSRecordSet, bool | RecordSetDiff, bool).
         @param stop_early_on_errors: If set to ``True``, try to stop changes after the first error happens.
                                      This might only work on some APIs.
         @return A dictionary mapping zone IDs to lists of tuples ``(record_set, updated, failed)``.
@@ -758,42 +1075,12 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
                 record sets if all succeed, in that case ``failed`` can be ``None`` even though
                 ``updated`` is ``False``.
         """
-        actions = {}
-        data_per_zone_id = {}
-        stop = False
-        for zone_id, record_sets in record_sets_per_zone_id.items():
-            data = []
-            data_per_zone_id[zone_id] = data
-            for record_set, updated_records, updated_ttl in record_sets:
-                base_url = _get_rrset_url(zone_id, record_set.prefix, record_set.type)
-                try:
-                    action_ids = []
-                    if updated_ttl:
-                        ttl_data = _get_update_json_data_ttl(record_set)
-                        ttl_url = '{0}/actions/change_ttl'.format(base_url)
-                        ttl_result, dummy = self._post(ttl_url, data=ttl_data, expected=[201])
-                        self._check_error("POST", ttl_url, ttl_result)
-                        action = ttl_result["action"]
-                        action_id = action["id"]
-                        actions[action_id] = action
-                        action_ids.append(action_id)
-                    if updated_records:
-                        set_data = _get_update_json_data_value(record_set)
-                        set_url = '{0}/actions/set_records'.format(base_url)
-                        set_result, dummy = self._post(set_url, data=set_data, expected=[201])
-                        self._check_error("POST", set_url, set_result)
-                        action = set_result["action"]
-                        action_id = action["id"]
-                        actions[action_id] = action
-                        action_ids.append(action_id)
-                    data.append((record_set, action_ids, None))
-                except DNSAPIError as e:
-                    data.append((record_set, None, e))
-                    if stop_early_on_errors:
-                        stop = True
-                        break
-            if stop:
-                break
+        def submit(zone_id, item):
+            record_set, updated_records, updated_ttl = item
+            return record_set, self._start_record_set_update(zone_id, record_set, updated_records, updated_ttl)
+
+        data_per_zone_id, actions, stop = self._submit_record_set_changes(
+            record_sets_per_zone_id, submit, stop_early_on_errors, get_record_set=lambda item: item[0])
         return self._collect_results(
             "updating record sets", data_per_zone_id, actions, do_wait=not stop, stop_early_on_errors=stop_early_on_errors, refresh_rrsets=not stop)
 
@@ -810,29 +1097,14 @@ class _HetznerNewAPI(ZoneRecordSetAPI, JSONAPIHelper):
                 while deleting, ``deleted`` is ``False`` and ``failed`` is a ``DNSAPIError``
                 instance hopefully providing information on the error.
         """
-        actions = {}
-        data_per_zone_id = {}
-        stop = False
-        for zone_id, record_sets in record_sets_per_zone_id.items():
-            data = []
-            data_per_zone_id[zone_id] = data
-            for record_set in record_sets:
-                try:
-                    url = _get_rrset_url(zone_id, record_set.prefix, record_set.type)
-                    result, _info = self._delete(url, expected=[201, 404])
-                    if self._check_error("DELETE", url, result, accepted=["not_found"]) == "not_found":
-                        data.append((record_set, None, None))
-                    else:
-                        action = result["action"]
-                        actions[action["id"]] = action
-                        data.append((record_set, [action["id"]], None))
-                except DNSAPIError as e:
-                    data.append((record_set, None, e))
-                    if stop_early_on_errors:
-                        stop = True
-                        break
-            if stop:
-                break
+        def submit(zone_id, record_set):
+            url = _get_rrset_url(zone_id, record_set.prefix, record_set.type)
+            result, _info = self._delete(url, expected=[201, 404])
+            if self._check_error("DELETE", url, result, accepted=["not_found"]) == "not_found":
+                return record_set, None
+            return record_set, [result["action"]]
+
+        data_per_zone_id, actions, stop = self._submit_record_set_changes(record_sets_per_zone_id, submit, stop_early_on_errors)
         return self._collect_results(
             "deleting record sets", data_per_zone_id, actions, do_wait=not stop, stop_early_on_errors=stop_early_on_errors, refresh_rrsets=False)
 
@@ -899,6 +1171,12 @@ class HetznerProviderInformation(ProviderInformation):
         """
         return True
 
+    def supports_zone_file_import(self):
+        """
+        Return whether the API can replace all records of a zone by importing a zone file.
+        """
+        return True
+
     def txt_record_handling(self):
         """
         Return how the API handles TXT records.
@@ -942,14 +1220,33 @@ def create_hetzner_argument_spec():
         },
         mutually_exclusive=[["hetzner_token", "hetzner_api_token"]],
         required_one_of=[["hetzner_token", "hetzner_api_token"]],
+    ).merge(create_http_client_argspec())
+
+
+def create_hetzner_wait_argument_spec():
+    return ArgumentSpec(
+        argument_spec={
+            'wait': {
+                'type': 'bool',
+                'default': True,
+            },
+        },
     )
 
 
-def create_hetzner_api(option_provider, http_helper):
+def create_hetzner_api(option_provider, http_helper, wait=True):
     hetzner_token = option_provider.get_option('hetzner_token')
     hetzner_api_token = option_provider.get_option('hetzner_api_token')
+    http_helper = create_http_helper(option_provider, http_helper)
+    concurrency = option_provider.get_option('http_concurrency')
+    response_cache = create_response_cache(option_provider)
+    api_stats = create_api_stats(option_provider)
     if hetzner_token is not None:
-        return HetznerAPI(http_helper, hetzner_token)
+        return HetznerAPI(
+            http_helper, hetzner_token, concurrency=concurrency, response_cache=response_cache, api_stats=api_stats,
+            zone_cache=create_zone_cache(option_provider, 'hetzner-dns:{0}'.format(hetzner_token)))
     if hetzner_api_token is not None:
-        return _HetznerNewAPI(http_helper, hetzner_api_token)
+        return _HetznerNewAPI(
+            http_helper, hetzner_api_token, concurrency=concurrency, response_cache=response_cache, api_stats=api_stats, wait=wait,
+            zone_cache=create_zone_cache(option_provider, 'hetzner-cloud:{0}'.format(hetzner_api_token)))
     raise AssertionError("One of hetzner_token and hetzner_api_token must be provided")  # pragma: no cover
@@ -9,6 +9,7 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.api_stats import create_api_stats
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.argspec import ArgumentSpec
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hosttech.json_api import (
     HostTechJSONAPI,
@@ -16,10 +17,14 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hosttech.wsdl_api import (
     HostTechWSDLAPI,
 )
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import create_http_helper
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http_cache import create_response_cache
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.options import create_http_client_argspec
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.provider import (
     ProviderInformation,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.wsdl import HAS_LXML_ETREE
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_cache import create_zone_cache
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
     DNSAPIError,
 )
@@ -88,20 +93,28 @@ def create_hosttech_argument_spec():
         },
         required_together=[('hosttech_username', 'hosttech_password')],
         mutually_exclusive=[('hosttech_username', 'hosttech_token')],
-    )
+    ).merge(create_http_client_argspec())
 
 
 def create_hosttech_api(option_provider, http_helper):
+    http_helper = create_http_helper(option_provider, http_helper)
     username = option_provider.get_option('hosttech_username')
     password = option_provider.get_option('hosttech_password')
     if username is not None and password is not None:
         if not HAS_LXML_ETREE:
             raise DNSAPIError('Needs lxml Python module (pip install lxml)')
 
-        return HostTechWSDLAPI(http_helper, username, password, debug=False)
+        return HostTechWSDLAPI(http_helper, username, password, debug=False, api_stats=create_api_stats(option_provider))
 
     token = option_provider.get_option('hosttech_token')
     if token is not None:
-        return HostTechJSONAPI(http_helper, token)
+        return HostTechJSONAPI(
+            http_helper,
+            token,
+            concurrency=option_provider.get_option('http_concurrency'),
+            response_cache=create_response_cache(option_provider),
+            api_stats=create_api_stats(option_provider),
+            zone_cache=create_zone_cache(option_provider, 'hosttech-json:{0}'.format(token)),
+        )
 
     raise DNSAPIError('One of hosttech_token or both hosttech_username and hosttech_password must be provided!')
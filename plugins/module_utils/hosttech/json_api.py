@@ -11,8 +11,12 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+from functools import partial
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.concurrency import run_concurrently
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.json_api_helper import (
     JSONAPIHelper,
+    consume_entries,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import DNSRecord
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone import (
@@ -24,6 +28,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     DNSAPIError,
     ZoneRecordAPI,
     filter_records,
+    get_zone_with_entries,
 )
 
 
@@ -34,7 +39,7 @@ def _create_record_from_json(source, record_type=None):
     result.type = source.pop('type', record_type)
     ttl = source.pop('ttl')
     result.ttl = int(ttl) if ttl is not None else None
-    result.extra['comment'] = source.pop('comment')
+    result.update_extra({'comment': source.pop('comment')})
 
     name = source.pop('name', None)
     target = None
@@ -65,7 +70,7 @@ def _create_record_from_json(source, record_type=None):
 
     result.prefix = name or None  # API returns '', we want None
     result.target = target
-    result.extra.update(source)
+    result.update_extra(source)
     return result
 
 
@@ -86,7 +91,7 @@ def _create_zone_with_records_from_json(source, prefix=NOT_PROVIDED, record_type
     return DNSZoneWithRecords(
         _create_zone_from_json(source),
         filter_records(
-            [_create_record_from_json(record) for record in source['records']],
+            [_create_record_from_json(record) for record in consume_entries(source['records'])],
             prefix=prefix,
             record_type=record_type,
         ),
@@ -96,7 +101,7 @@ def _create_zone_with_records_from_json(source, prefix=NOT_PROVIDED, record_type
 def _record_to_json(record, include_id=False, include_type=True):
     result = {
         'ttl': record.ttl,
-        'comment': record.extra.get('comment') or '',
+        'comment': record._get_extra().get('comment') or '',
     }
     if include_type:
         result['type'] = record.type
@@ -169,11 +174,16 @@ def _record_to_json(record, include_id=False, include_type=True):
 
 
 class HostTechJSONAPI(ZoneRecordAPI, JSONAPIHelper):
-    def __init__(self, http_helper, token, api='https://api.ns1.hosttech.eu/api/', debug=False):
+    def __init__(
+        self, http_helper, token, api='https://api.ns1.hosttech.eu/api/', debug=False, concurrency=1, response_cache=None, api_stats=None,
+        zone_cache=None,
+    ):
         """
         Create a new HostTech API instance with given API token.
         """
-        JSONAPIHelper.__init__(self, http_helper, token, api=api, debug=debug)
+        JSONAPIHelper.__init__(
+            self, http_helper, token, api=api, debug=debug, concurrency=concurrency, response_cache=response_cache, api_stats=api_stats)
+        self._zone_cache = zone_cache
 
     def _extract_error_message(self, result):
         if result is None:
@@ -197,18 +207,41 @@ class HostTechJSONAPI(ZoneRecordAPI, JSONAPIHelper):
             'authorization': 'Bearer {token}'.format(token=self._token),
         }
 
+    def _get_page(self, url, query, offset, block_size):
+        query_ = query.copy() if query else {}
+        query_['limit'] = block_size
+        query_['offset'] = offset
+        res, dummy = self._get(url, query_, must_have_content=True, expected=[200])
+        return res['data']
+
+    def _get_page_or_error(self, url, query, offset, block_size):
+        try:
+            return self._get_page(url, query, offset, block_size), None
+        except DNSAPIError as exc:
+            return None, exc
+
     def _list_pagination(self, url, query=None, block_size=100):
-        result = []
-        offset = 0
+        result = self._get_page(url, query, 0, block_size)
+        if len(result) < block_size:
+            return result
+        # The API does not tell how many entries there are, so speculatively fetch the next
+        # pages concurrently. Errors are only raised for pages before the end of the list.
+        offset = block_size
         while True:
-            query_ = query.copy() if query else {}
-            query_['limit'] = block_size
-            query_['offset'] = offset
-            res, dummy = self._get(url, query_, must_have_content=True, expected=[200])
-            result.extend(res['data'])
-            if len(res['data']) < block_size:
-                return result
-            offset += block_size
+            pages = run_concurrently(
+                [
+                    partial(self._get_page_or_error, url, query, offset + index * block_size, block_size)
+                    for index in range(max(self._concurrency, 1))
+                ],
+                self._concurrency,
+            )
+            for data, error in pages:
+                if error is not None:
+                    raise error
+                result.extend(data)
+                if len(data) < block_size:
+                    return result
+                offset += block_size
 
     def get_zone_with_records_by_id(self, zone_id, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
         """
@@ -220,10 +253,29 @@ class HostTechJSONAPI(ZoneRecordAPI, JSONAPIHelper):
         @param record_type: The record type to filter for, if provided
         @return The zone information with records (DNSZoneWithRecords), or None if not found
         """
+        if record_type is not NOT_PROVIDED and self._zone_cache is not None:
+            # The zone always contains all records, so only fetch the records of this type
+            # if the zone is already known
+            zone = self._zone_cache.get_by_id(zone_id)
+            if zone is not None:
+                records = self.get_zone_records(zone.id, prefix=prefix, record_type=record_type)
+                if records is not None:
+                    return DNSZoneWithRecords(zone, records)
+                self._zone_cache.invalidate(zone)
         result, info = self._get('user/v1/zones/{0}'.format(zone_id), expected=[200, 404], must_have_content=[200])
         if info['status'] == 404:
             return None
-        return _create_zone_with_records_from_json(result['data'], prefix=prefix, record_type=record_type)
+        result = _create_zone_with_records_from_json(result['data'], prefix=prefix, record_type=record_type)
+        if self._zone_cache is not None:
+            self._zone_cache.put(result.zone)
+        return result
+
+    def _find_zone_by_name(self, name):
+        # The zone list contains less information than fetching the zone itself, but no records
+        for zone in self._list_pagination('user/v1/zones', query={'query': name}):
+            if zone['name'] == name:
+                return _create_zone_from_json(zone)
+        return None
 
     def get_zone_with_records_by_name(self, name, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
         """
@@ -235,11 +287,32 @@ class HostTechJSONAPI(ZoneRecordAPI, JSONAPIHelper):
         @param record_type: The record type to filter for, if provided
         @return The zone information with records (DNSZoneWithRecords), or None if not found
         """
+        if record_type is not NOT_PROVIDED:
+            # Only fetch the records of this type instead of the zone with all records
+            result = get_zone_with_entries(
+                self._zone_cache,
+                self._find_zone_by_name,
+                lambda zone: self.get_zone_records(zone.id, prefix=prefix, record_type=record_type),
+                name=name,
+            )
+            if result is None:
+                return None
+            return DNSZoneWithRecords(*result)
+        if self._zone_cache is not None:
+            zone = self._zone_cache.get_by_name(name)
+            if zone is not None:
+                result = self.get_zone_with_records_by_id(zone.id, prefix=prefix, record_type=record_type)
+                if result is not None:
+                    return result
+                self._zone_cache.invalidate(zone, name=name)
         result = self._list_pagination('user/v1/zones', query={'query': name})
         for zone in result:
             if zone['name'] == name:
                 result, dummy = self._get('user/v1/zones/{0}'.format(zone['id']), expected=[200])
-                return _create_zone_with_records_from_json(result['data'], prefix=prefix, record_type=record_type)
+                result = _create_zone_with_records_from_json(result['data'], prefix=prefix, record_type=record_type)
+                if self._zone_cache is not None:
+                    self._zone_cache.put(result.zone, name=name)
+                return result
         return None
 
     def get_zone_records(self, zone_id, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
@@ -259,7 +332,7 @@ class HostTechJSONAPI(ZoneRecordAPI, JSONAPIHelper):
         if info['status'] == 404:
             return None
         return filter_records(
-            [_create_record_from_json(record) for record in result['data']],
+            [_create_record_from_json(record) for record in consume_entries(result['data'])],
             prefix=prefix,
             record_type=record_type,
         )
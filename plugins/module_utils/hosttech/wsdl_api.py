@@ -46,8 +46,8 @@ def _create_record_from_encoding(source, record_type=None):
     else:
         result.target = target
     source.pop('zone', None)
-    result.extra['comment'] = source.pop('comment') or ''
-    result.extra.update(source)
+    result.update_extra({'comment': source.pop('comment') or ''})
+    result.update_extra(source)
     return result
 
 
@@ -105,11 +105,12 @@ def _encode_zone(zone):
 
 
 class HostTechWSDLAPI(ZoneRecordAPI):
-    def __init__(self, http_helper, username, password, api='https://ns1.hosttech.eu/public/api', debug=False):
+    def __init__(self, http_helper, username, password, api='https://ns1.hosttech.eu/public/api', debug=False, api_stats=None):
         """
         Create a new HostTech API instance with given username and password.
         """
         self._http_helper = http_helper
+        self.api_stats = api_stats
         self._api = api
         self._namespaces = {
             'ns1': 'https://ns1.hosttech.eu/soap',
@@ -119,7 +120,7 @@ class HostTechWSDLAPI(ZoneRecordAPI):
         self._debug = debug
 
     def _prepare(self):
-        command = Composer(self._http_helper, self._api, self._namespaces)
+        command = Composer(self._http_helper, self._api, self._namespaces, api_stats=self.api_stats)
         command.add_auth(self._username, self._password)
         return command
 
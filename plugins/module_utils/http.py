@@ -10,12 +10,19 @@ __metaclass__ = type
 
 
 import abc
+import socket
+import ssl
 import sys
+import threading
+import zlib
 
 from ansible.module_utils.common.text.converters import to_native
 from ansible.module_utils.urls import ConnectionError, NoSSLError, fetch_url, open_url  # noqa: A004
 
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils._six import add_metaclass
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.api_stats import RATE_LIMIT_WAIT_INFO_KEY
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.rate_limit import TokenBucketRateLimiter
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import DNSAPIError
 
 try:
     from urllib.error import HTTPError
@@ -23,6 +30,24 @@ except ImportError:
     # Python 2.x fallback:
     from urllib2 import HTTPError  # type: ignore
 
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2.x fallback:
+    from urlparse import urlsplit  # type: ignore
+
+try:
+    import http.client as http_client
+except ImportError:
+    # Python 2.x fallback:
+    import httplib as http_client  # type: ignore
+
+try:
+    from urllib.request import getproxies
+except ImportError:
+    # Python 2.x fallback:
+    from urllib import getproxies  # type: ignore
+
 
 if sys.version_info >= (3, 6):
     import typing
@@ -35,6 +60,107 @@ class NetworkError(Exception):
     pass
 
 
+# Content encodings which can be decoded by ContentDecoder
+SUPPORTED_CONTENT_ENCODINGS = ('gzip', 'deflate')
+
+_READ_CHUNK_SIZE = 65536
+
+
+class ContentDecoder(object):
+    """
+    Incrementally decodes a response body with ``gzip`` or ``deflate`` content encoding.
+
+    Data that does not look compressed is passed through unchanged. This happens for
+    example when ansible-core's URL functions already decompressed a gzip response,
+    but still report the original Content-Encoding header.
+    """
+
+    def __init__(self, encoding):  # type: (str) -> None
+        self.encoding = encoding
+        self._decompressor = None  # type: typing.Any
+        self._passthrough = False
+        self._start = b''
+
+    @classmethod
+    def create(cls, encoding):  # type: (str | None) -> ContentDecoder | None
+        """
+        Return a decoder for the given Content-Encoding header value, or None if no decoding is needed.
+        """
+        encoding = (encoding or '').strip().lower()
+        if encoding == 'x-gzip':
+            encoding = 'gzip'
+        if encoding not in SUPPORTED_CONTENT_ENCODINGS:
+            return None
+        return cls(encoding)
+
+    def _start_decoding(self, start):  # type: (bytes) -> None
+        first, second = bytearray(start[:2])
+        if self.encoding == 'gzip':
+            if (first, second) != (0x1f, 0x8b):
+                self._passthrough = True
+                return
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            # Some servers send raw deflate data instead of the zlib format required by RFC 9110
+            has_zlib_header = first & 0x0f == 8 and (first * 256 + second) % 31 == 0
+            if not has_zlib_header and first in (ord('{'), ord('['), ord('<')):
+                self._passthrough = True
+                return
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS if has_zlib_header else -zlib.MAX_WBITS)
+
+    def decode(self, chunk):  # type: (bytes) -> bytes
+        """
+        Decode the next chunk of the body. Raises zlib.error on invalid data.
+        """
+        if self._passthrough:
+            return chunk
+        if self._decompressor is None:
+            self._start += chunk
+            if len(self._start) < 2:
+                return b''
+            chunk, self._start = self._start, b''
+            self._start_decoding(chunk)
+            if self._passthrough:
+                return chunk
+        return self._decompressor.decompress(chunk)
+
+    def flush(self):  # type: (...) -> bytes
+        """
+        Return the remaining decoded data once the body has been completely read.
+        """
+        if self._passthrough:
+            return b''
+        if self._decompressor is None:
+            # Less than two bytes of body
+            result, self._start = self._start, b''
+            return result
+        return self._decompressor.flush()
+
+
+def decode_content(
+    content,  # type: bytes | None
+    info,  # type: dict[str, typing.Any]
+):  # type: (...) -> bytes | None
+    """
+    Decode a complete response body according to the Content-Encoding header in ``info``.
+
+    The Content-Encoding header is removed from ``info`` if the body has been decoded.
+    """
+    decoder = ContentDecoder.create(info.get('content-encoding'))
+    if decoder is None or content is None:
+        return content
+    chunks = []
+    try:
+        for index in range(0, len(content), _READ_CHUNK_SIZE):
+            chunks.append(decoder.decode(content[index:index + _READ_CHUNK_SIZE]))
+        chunks.append(decoder.flush())
+    except zlib.error as e:
+        raise NetworkError('Cannot decompress {0} encoded response: {1}'.format(decoder.encoding, to_native(e)))
+    info.pop('content-encoding', None)
+    info.pop('content-length', None)
+    return b''.join(chunks)
+
+
 @add_metaclass(abc.ABCMeta)
 class HTTPHelper(object):
     @abc.abstractmethod
@@ -52,6 +178,20 @@ class HTTPHelper(object):
         In case of errors, either raise NetworkError or terminate the program (for modules only!).
         """
 
+    def get_validate_certs(self):  # type: (...) -> bool
+        """
+        Return whether TLS certificates are validated.
+        """
+        return True
+
+    def get_default_timeout(self):  # type: (...) -> int | float
+        """
+        Return the timeout in seconds used for requests that do not specify one.
+
+        The default is the one of Ansible's URL functions.
+        """
+        return 10
+
 
 class ModuleHTTPHelper(HTTPHelper):
     def __init__(
@@ -60,6 +200,10 @@ class ModuleHTTPHelper(HTTPHelper):
     ):  # type: (...) -> None
         self.module = module  # type: AnsibleModule
 
+    def get_validate_certs(self):  # type: (...) -> bool
+        # fetch_url() uses the module's validate_certs option if it has one
+        return self.module.params.get('validate_certs', True)
+
     def fetch_url(
         self,
         url,  # type: str
@@ -113,3 +257,269 @@ class OpenURLHelper(HTTPHelper):
             raise NetworkError('Connection error: {0}'.format(to_native(e)))
 
         return result, info
+
+
+class PoolingHTTPHelper(HTTPHelper):
+    """
+    HTTP helper which keeps connections open and reuses them for further requests to the same host.
+
+    Compared to ModuleHTTPHelper and OpenURLHelper, this avoids a new TCP connection and TLS handshake
+    for every request. Proxies are not supported.
+    """
+
+    # Methods which can safely be sent again when a kept-alive connection turned out to be stale
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+    def __init__(
+        self,
+        max_connections=4,  # type: int
+        timeout=10,  # type: int | float
+        validate_certs=True,  # type: bool
+        user_agent='ansible-httpget',  # type: str
+    ):  # type: (...) -> None
+        """
+        @param max_connections: Maximal number of simultaneous connections per host
+        @param timeout: Default timeout in seconds for requests that do not specify one
+        @param validate_certs: Whether to validate TLS certificates
+        @param user_agent: The User-Agent header to send if the request does not provide one
+        """
+        self._max_connections = max(max_connections, 1)
+        self._timeout = timeout
+        self._validate_certs = validate_certs
+        self._user_agent = user_agent
+        self._lock = threading.Lock()
+        self._idle = {}  # type: dict[tuple[str, str, int], list[typing.Any]]
+        self._slots = {}  # type: dict[tuple[str, str, int], threading.BoundedSemaphore]
+        self._ssl_context = None  # type: ssl.SSLContext | None
+
+    def _get_ssl_context(self):  # type: (...) -> ssl.SSLContext
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+            if not self._validate_certs:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    def _get_slots(self, key):  # type: (tuple[str, str, int]) -> threading.BoundedSemaphore
+        with self._lock:
+            slots = self._slots.get(key)
+            if slots is None:
+                slots = self._slots[key] = threading.BoundedSemaphore(self._max_connections)
+            return slots
+
+    def _acquire_connection(
+        self,
+        key,  # type: tuple[str, str, int]
+        timeout,  # type: int | float
+    ):  # type: (...) -> tuple[typing.Any, bool]
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if scheme == 'https':
+            connection = http_client.HTTPSConnection(host, port, timeout=timeout, context=self._get_ssl_context())
+        else:
+            connection = http_client.HTTPConnection(host, port, timeout=timeout)
+        return connection, False
+
+    def _release_connection(
+        self,
+        key,  # type: tuple[str, str, int]
+        connection,  # type: typing.Any
+    ):  # type: (...) -> None
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_connections:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):  # type: (...) -> None
+        """
+        Close all idle connections.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def fetch_url(
+        self,
+        url,  # type: str
+        method='GET',  # type: str
+        headers=None,  # type: dict[str, str] | None
+        data=None,  # type: bytes | None
+        timeout=None,  # type: int | None
+    ):  # type: (...) -> tuple[bytes | None, dict[str, typing.Any]]
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise NetworkError('Connection error: cannot handle URL {0}'.format(url))
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        path = parts.path or '/'
+        if parts.query:
+            path = '{0}?{1}'.format(path, parts.query)
+        request_headers = {'User-Agent': self._user_agent}
+        request_headers.update(headers or {})
+        if timeout is None:
+            timeout = self._timeout
+
+        slots = self._get_slots(key)
+        slots.acquire()
+        try:
+            while True:
+                connection, reused = self._acquire_connection(key, timeout)
+                try:
+                    connection.timeout = timeout
+                    if connection.sock is not None:
+                        connection.sock.settimeout(timeout)
+                    connection.request(method, path, body=data, headers=request_headers)
+                    response = connection.getresponse()
+                    decoder = ContentDecoder.create(response.getheader('content-encoding'))
+                    if decoder is None:
+                        content = response.read()
+                    else:
+                        # Decompress while reading, so the compressed body is never kept in memory completely
+                        chunks = []
+                        while True:
+                            chunk = response.read(_READ_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            chunks.append(decoder.decode(chunk))
+                        chunks.append(decoder.flush())
+                        content = b''.join(chunks)
+                except ssl.SSLError as e:
+                    connection.close()
+                    raise NetworkError('Cannot connect via SSL: {0}'.format(to_native(e)))
+                except zlib.error as e:
+                    connection.close()
+                    raise NetworkError('Cannot decompress {0} encoded response: {1}'.format(decoder.encoding, to_native(e)))
+                except (socket.error, http_client.HTTPException) as e:
+                    connection.close()
+                    if reused and method in self.IDEMPOTENT_METHODS:
+                        # The server closed the kept-alive connection; try again with a new one
+                        continue
+                    raise NetworkError('Connection error: {0}'.format(to_native(e)))
+                break
+        finally:
+            slots.release()
+
+        info = {}  # type: dict[str, typing.Any]
+        for header_name, header_value in response.getheaders():
+            header_name = header_name.lower()
+            if header_name in info:
+                header_value = '{0}, {1}'.format(info[header_name], header_value)
+            info[header_name] = header_value
+        if decoder is not None:
+            info.pop('content-encoding', None)
+            info.pop('content-length', None)
+        info['status'] = response.status
+        info['url'] = url
+        if response.will_close:
+            connection.close()
+        else:
+            self._release_connection(key, connection)
+        return content, info
+
+
+class RateLimitedHTTPHelper(HTTPHelper):
+    """
+    HTTP helper which paces requests of another HTTP helper with a TokenBucketRateLimiter.
+
+    If a request had to wait, the number of seconds is stored in the returned info
+    dictionary under the key RATE_LIMIT_WAIT_INFO_KEY.
+    """
+
+    def __init__(
+        self,
+        http_helper,  # type: HTTPHelper
+        rate_limiter,  # type: TokenBucketRateLimiter
+    ):  # type: (...) -> None
+        self.http_helper = http_helper  # type: HTTPHelper
+        self.rate_limiter = rate_limiter  # type: TokenBucketRateLimiter
+
+    def fetch_url(
+        self,
+        url,  # type: str
+        method='GET',  # type: str
+        headers=None,  # type: dict[str, str] | None
+        data=None,  # type: bytes | None
+        timeout=None,  # type: int | None
+    ):  # type: (...) -> tuple[bytes | None, dict[str, typing.Any]]
+        waited = self.rate_limiter.acquire()
+        content, info = self.http_helper.fetch_url(url, method=method, headers=headers, data=data, timeout=timeout)
+        self.rate_limiter.update(info)
+        if waited:
+            info[RATE_LIMIT_WAIT_INFO_KEY] = waited
+        return content, info
+
+
+class CompressingHTTPHelper(HTTPHelper):
+    """
+    HTTP helper which asks the server for compressed responses and decompresses them.
+    """
+
+    def __init__(
+        self,
+        http_helper,  # type: HTTPHelper
+    ):  # type: (...) -> None
+        self.http_helper = http_helper  # type: HTTPHelper
+
+    def fetch_url(
+        self,
+        url,  # type: str
+        method='GET',  # type: str
+        headers=None,  # type: dict[str, str] | None
+        data=None,  # type: bytes | None
+        timeout=None,  # type: int | None
+    ):  # type: (...) -> tuple[bytes | None, dict[str, typing.Any]]
+        headers = dict(headers or {})
+        if not any(header.lower() == 'accept-encoding' for header in headers):
+            headers['Accept-Encoding'] = ', '.join(SUPPORTED_CONTENT_ENCODINGS)
+        content, info = self.http_helper.fetch_url(url, method=method, headers=headers, data=data, timeout=timeout)
+        return decode_content(content, info), info
+
+
+def _has_proxies():  # type: (...) -> bool
+    """
+    Return whether a HTTP or HTTPS proxy is configured, for example with the ``https_proxy``
+    environment variable. Ansible's URL functions use such proxies.
+    """
+    proxies = getproxies()
+    return bool(proxies.get('http') or proxies.get('https'))
+
+
+def create_http_helper(
+    option_provider,  # type: typing.Any
+    http_helper,  # type: HTTPHelper
+):  # type: (...) -> HTTPHelper
+    """
+    Return the HTTP helper to use for the API client options provided by the user.
+
+    @param option_provider: A object compatible with ModuleOptionProvider that gives access to the
+                            module/plugin options.
+    @param http_helper: The HTTP helper that would be used by default. Connection pooling uses
+                        its TLS certificate validation and timeout settings, and is not used
+                        when a proxy is configured, since it does not support proxies.
+    @return A HTTPHelper instance.
+    """
+    if option_provider.get_option('http_keepalive') and not _has_proxies():
+        http_helper = PoolingHTTPHelper(
+            max_connections=option_provider.get_option('http_max_connections'),
+            timeout=http_helper.get_default_timeout(),
+            validate_certs=http_helper.get_validate_certs(),
+        )
+    if option_provider.get_option('http_compression'):
+        http_helper = CompressingHTTPHelper(http_helper)
+    rate_limit = option_provider.get_option('http_rate_limit')
+    if rate_limit is not None:
+        if rate_limit <= 0:
+            raise DNSAPIError('http_rate_limit must be positive')
+        http_helper = RateLimitedHTTPHelper(http_helper, TokenBucketRateLimiter(
+            rate_limit,
+            burst=option_provider.get_option('http_rate_limit_burst'),
+            state_file=option_provider.get_option('http_rate_limit_file'),
+        ))
+    return http_helper
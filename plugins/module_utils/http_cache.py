@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import base64
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+from ansible.module_utils.common.text.converters import to_bytes
+
+
+if sys.version_info >= (3, 6):
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from collections.abc import Callable  # pragma: no cover
+
+
+class CachedResponse(object):
+    def __init__(
+        self,
+        content,  # type: bytes | None
+        info,  # type: dict[str, typing.Any]
+        stored,  # type: float
+    ):  # type: (...) -> None
+        self.content = content  # type: bytes | None
+        self.info = info  # type: dict[str, typing.Any]
+        self.stored = stored  # type: float
+
+    @property
+    def etag(self):  # type: (...) -> str | None
+        return self.info.get('etag')
+
+    @property
+    def last_modified(self):  # type: (...) -> str | None
+        return self.info.get('last-modified')
+
+    def has_validators(self):  # type: (...) -> bool
+        return self.etag is not None or self.last_modified is not None
+
+
+class ResponseCache(object):
+    """
+    On-disk store for responses of GET requests.
+
+    Responses are stored together with their validators (``ETag`` and ``Last-Modified``
+    headers), so that they can be revalidated with a conditional request. Responses
+    without validators are only used for ``max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        directory,  # type: str
+        max_age=10,  # type: float
+        clock=time.time,  # type: Callable[[], float]
+    ):  # type: (...) -> None
+        """
+        @param directory: The directory to store the responses in; will be created if needed
+        @param max_age: The number of seconds a response without validators can be used
+        @param clock: Function returning the current time in seconds
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self._clock = clock
+
+    def _get_path(self, key):  # type: (str) -> str
+        return os.path.join(self.directory, '{0}.json'.format(hashlib.sha256(to_bytes(key)).hexdigest()))
+
+    def get(self, key):  # type: (str) -> CachedResponse | None
+        """
+        Return the stored response for the given key, or None if there is none.
+
+        The key should identify the request, including everything that influences the result
+        (like credentials).
+        """
+        try:
+            with open(self._get_path(key), 'rb') as f:
+                data = json.loads(f.read().decode('utf-8'))
+            content = data['content']
+            if content is not None:
+                content = base64.b64decode(content)
+            return CachedResponse(content, data['info'], float(data['stored']))
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def is_fresh(self, response):  # type: (CachedResponse) -> bool
+        """
+        Whether a stored response without validators can be used without asking the server.
+        """
+        return not response.has_validators() and 0 <= self._clock() - response.stored < self.max_age
+
+    def put(
+        self,
+        key,  # type: str
+        content,  # type: bytes | None
+        info,  # type: dict[str, typing.Any]
+    ):  # type: (...) -> None
+        """
+        Store a response. Responses without validators are not stored if ``max_age`` is not positive.
+        """
+        response = CachedResponse(content, info, self._clock())
+        if not response.has_validators() and self.max_age <= 0:
+            return
+        data = {
+            'content': base64.b64encode(content).decode('ascii') if content is not None else None,
+            'info': info,
+            'stored': response.stored,
+        }
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, 0o700)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(data, default=str).encode('utf-8'))
+            os.rename(tmp_path, self._get_path(key))
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self):  # type: (...) -> None
+        """
+        Remove all stored responses.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.json'):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:  # pragma: no cover
+                    pass  # pragma: no cover
+
+
+def create_response_cache(
+    option_provider,  # type: typing.Any
+):  # type: (...) -> ResponseCache | None
+    """
+    Return the response cache to use for the API client options provided by the user, if any.
+
+    @param option_provider: A object compatible with ModuleOptionProvider that gives access to the
+                            module/plugin options.
+    @return A ResponseCache instance, or None if caching is not enabled.
+    """
+    directory = option_provider.get_option('http_cache_dir')
+    if directory is None:
+        return None
+    return ResponseCache(directory, max_age=option_provider.get_option('http_cache_max_age'))
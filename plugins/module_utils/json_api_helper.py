@@ -16,6 +16,7 @@ import time
 
 from ansible.module_utils.common.text.converters import to_native
 
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.api_stats import RATE_LIMIT_WAIT_INFO_KEY
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
     DNSAPIAuthenticationError,
     DNSAPIError,
@@ -34,7 +35,9 @@ if sys.version_info >= (3, 6):
     if typing.TYPE_CHECKING:
         from collections.abc import Collection  # pragma: no cover
 
+        from .api_stats import APIStats  # pragma: no cover
         from .http import HTTPHelper  # pragma: no cover
+        from .http_cache import ResponseCache  # pragma: no cover
         from .provider import ProviderInformation  # pragma: no cover
         from .record import DNSRecord  # pragma: no cover
         from .zone_record_api import ZoneRecordAPI  # pragma: no cover
@@ -65,6 +68,21 @@ def _get_header_value(
     return header_value
 
 
+def consume_entries(
+    entries,  # type: list[typing.Any]
+):  # type: (...) -> typing.Iterator[typing.Any]
+    """
+    Yield the entries of a list in order, removing every entry from the list before it is yielded.
+
+    When converting a large decoded JSON list into other objects, this allows every decoded
+    entry to be freed as soon as it has been converted, instead of keeping the whole decoded
+    list in memory until the conversion is complete. The list is empty afterwards.
+    """
+    entries.reverse()
+    while entries:
+        yield entries.pop()
+
+
 class JSONAPIHelper(object):
     def __init__(
         self,
@@ -72,14 +90,25 @@ class JSONAPIHelper(object):
         token,  # type: str
         api,  # type: str
         debug=False,  # type: bool
+        concurrency=1,  # type: int
+        response_cache=None,  # type: ResponseCache | None
+        api_stats=None,  # type: APIStats | None
     ):  # type: (...) -> None
         """
         Create a new JSON API helper instance with given API key.
+
+        ``concurrency`` is the maximal number of requests that are sent at the same time
+        when fetching multiple pages of a list. If ``response_cache`` is provided, GET
+        requests are answered from it when possible. If ``api_stats`` is provided, all
+        requests are recorded in it.
         """
         self._api = api  # type: str
         self._http_helper = http_helper  # type: HTTPHelper
         self._token = token  # type: str
         self._debug = debug  # type: bool
+        self._concurrency = concurrency  # type: int
+        self._response_cache = response_cache  # type: ResponseCache | None
+        self.api_stats = api_stats  # type: APIStats | None
 
     def _build_url(
         self,
@@ -190,19 +219,37 @@ class JSONAPIHelper(object):
         number_retries = 10
         countdown = number_retries + 1
         while True:
+            start = time.time()
             content, info = self._http_helper.fetch_url(url, **kwargs)
+            latency = time.time() - start
+            wait = info.pop(RATE_LIMIT_WAIT_INFO_KEY, 0)
+            latency -= wait
             countdown -= 1
             retry_after = self._is_rate_limiting_result(content, info)
-            if retry_after is not False:
-                if countdown <= 0:
-                    break
+            if retry_after is not False and countdown > 0:
                 if retry_after is True:
                     retry_after = 10
+                self._record_request(kwargs.get('method', 'GET'), url, content, info, latency, wait + retry_after)
                 time.sleep(retry_after)
                 continue
+            self._record_request(kwargs.get('method', 'GET'), url, content, info, latency, wait)
+            if retry_after is not False:
+                break
             return content, info
         raise DNSAPIError('Stopping after {0} failed retries with 429 Too Many Attempts'.format(number_retries))
 
+    def _record_request(
+        self,
+        method,  # type: str
+        url,  # type: str
+        content,  # type: bytes | None
+        info,  # type: dict[str, typing.Any]
+        latency,  # type: float
+        wait,  # type: float
+    ):  # type: (...) -> None
+        if self.api_stats is not None:
+            self.api_stats.record(method, url, info['status'], len(content or b''), latency, wait=wait)
+
     def _create_headers(self):  # type: (...) -> dict[str, str]
         return {
             'accept': 'application/json',
@@ -220,15 +267,57 @@ class JSONAPIHelper(object):
         query=None,  # type: dict[str, str] | None
         must_have_content=True,  # type: bool | list[int] | tuple[int, ...]
         expected=None,  # type: Collection[int] | None
+        use_cache=True,  # type: bool
     ):  # type: (...) -> tuple[dict[str, typing.Any] | list[typing.Any] | None, dict[str, typing.Any]]
+        """
+        Execute a GET request and return the JSON result.
+
+        Set ``use_cache`` to ``False`` for resources whose state changes without changes done
+        through the API, like the status of asynchronous actions. These must never be served from
+        the response cache.
+        """
         full_url = self._build_url(url, query)
         if self._debug:
             pass  # pragma: no cover
             # q.q('Request: GET {0}'.format(full_url))
         headers = self._create_headers()
-        content, info = self._request(full_url, headers=headers, method='GET')
+        if self._response_cache is not None and use_cache:
+            content, info = self._cached_request(full_url, headers)
+        else:
+            content, info = self._request(full_url, headers=headers, method='GET')
         return self._process_json_result(content, info, must_have_content=must_have_content, method='GET', expected=expected)
 
+    def _cached_request(
+        self,
+        full_url,  # type: str
+        headers,  # type: dict[str, str]
+    ):  # type: (...) -> tuple[bytes | None, dict[str, typing.Any]]
+        """Execute a GET request, using the response cache and conditional requests."""
+        cache = self._response_cache
+        # The credentials are part of the key, since different users can see different data
+        key = '{0}\n{1}'.format(self._token, full_url)
+        cached = cache.get(key)  # type: ignore
+        if cached is not None:
+            if cache.is_fresh(cached):  # type: ignore
+                return cached.content, dict(cached.info)
+            headers = dict(headers)
+            if cached.etag is not None:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified is not None:
+                headers['If-Modified-Since'] = cached.last_modified
+        content, info = self._request(full_url, headers=headers, method='GET')
+        if info['status'] == 304 and cached is not None:
+            result_info = dict(cached.info)
+            result_info['url'] = info.get('url', result_info.get('url'))
+            return cached.content, result_info
+        if info['status'] == 200:
+            cache.put(key, content, info)  # type: ignore
+        return content, info
+
+    def _invalidate_cache(self):  # type: (...) -> None
+        if self._response_cache is not None:
+            self._response_cache.clear()
+
     def _post(
         self,
         url,  # type: str
@@ -246,9 +335,26 @@ class JSONAPIHelper(object):
         if data is not None:
             headers['content-type'] = 'application/json'
             encoded_data = json.dumps(data).encode('utf-8')
+        self._invalidate_cache()
         content, info = self._request(full_url, headers=headers, method='POST', data=encoded_data)
         return self._process_json_result(content, info, must_have_content=must_have_content, method='POST', expected=expected)
 
+    def _post_text(
+        self,
+        url,  # type: str
+        text,  # type: str
+        query=None,  # type: dict[str, str] | None
+        must_have_content=True,  # type: bool | list[int] | tuple[int, ...]
+        expected=None,  # type: Collection[int] | None
+    ):  # type: (...) -> tuple[dict[str, typing.Any] | list[typing.Any] | None, dict[str, typing.Any]]
+        """Send plain text with a POST request and return the JSON result."""
+        full_url = self._build_url(url, query)
+        headers = self._create_post_headers()
+        headers['content-type'] = 'text/plain'
+        self._invalidate_cache()
+        content, info = self._request(full_url, headers=headers, method='POST', data=text.encode('utf-8'))
+        return self._process_json_result(content, info, must_have_content=must_have_content, method='POST', expected=expected)
+
     def _put(
         self,
         url,  # type: str
@@ -266,6 +372,7 @@ class JSONAPIHelper(object):
         if data is not None:
             headers['content-type'] = 'application/json'
             encoded_data = json.dumps(data).encode('utf-8')
+        self._invalidate_cache()
         content, info = self._request(full_url, headers=headers, method='PUT', data=encoded_data)
         return self._process_json_result(content, info, must_have_content=must_have_content, method='PUT', expected=expected)
 
@@ -281,5 +388,6 @@ class JSONAPIHelper(object):
             pass  # pragma: no cover
             # q.q('Request: DELETE {0}'.format(full_url))
         headers = self._create_headers()
+        self._invalidate_cache()
         content, info = self._request(full_url, headers=headers, method='DELETE')
         return self._process_json_result(content, info, must_have_content=must_have_content, method='DELETE', expected=expected)
@@ -40,3 +40,16 @@ def get_prefix(normalized_zone, provider_information, normalized_record=None, pr
     if normalized_record == normalized_zone:
         return normalized_record, None
     return normalized_record, normalized_record[:len(normalized_record) - len(normalized_zone) - 1]
+
+
+def get_api_stats_result(module, api):
+    """
+    Return the entries to add to the module's result for the statistics collected by the API.
+
+    This is ``api_stats`` if the module's ``collect_api_stats`` option is set, and nothing otherwise.
+    ``api`` can be ``None`` if the API could not be created.
+    """
+    api_stats = getattr(api, 'api_stats', None)
+    if api_stats is None or not module.params.get('collect_api_stats'):
+        return {}
+    return {'api_stats': api_stats.to_dict()}
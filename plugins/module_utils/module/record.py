@@ -32,6 +32,9 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     DNSRecord,
     format_record_for_output,
 )
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_diff import (
+    match_records,
+)
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_set import (
     DNSRecordSet,
 )
@@ -46,7 +49,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     filter_record_sets,
 )
 
-from ._utils import get_prefix, normalize_dns_name
+from ._utils import get_api_stats_result, get_prefix, normalize_dns_name
 
 
 def create_module_argument_spec(provider_information):
@@ -82,7 +85,7 @@ def _run_module_record_api(module, provider_information, record_converter, recor
         if zone is None:
             module.fail_json(msg='Zone not found')
         zone_id = zone.zone.id
-        records = zone.records
+        records = zone.find_records(prefix=prefix, record_type=type_in)
     elif record_in is not None:
         zone = api.get_zone_with_records_by_id(
             module.params.get('zone_id'),
@@ -95,7 +98,7 @@ def _run_module_record_api(module, provider_information, record_converter, recor
         record_in, prefix = get_prefix(
             normalized_zone=zone_in, normalized_record=record_in, prefix=prefix_in, provider_information=provider_information)
         zone_id = zone.zone.id
-        records = zone.records
+        records = zone.find_records(prefix=prefix, record_type=type_in)
     else:
         zone_id = module.params.get('zone_id')
         prefix = provider_information.normalize_prefix(prefix_in)
@@ -106,11 +109,11 @@ def _run_module_record_api(module, provider_information, record_converter, recor
         )
         if records is None:
             module.fail_json(msg='Zone not found')
+        records = filter_records(records, prefix=prefix, record_type=type_in)
         zone_in = None
         record_in = None
 
-    # Find matching records
-    records = filter_records(records, prefix=prefix, record_type=type_in)
+    # Convert records
     record_converter.process_multiple_from_api(records)
 
     # Parse records
@@ -121,11 +124,10 @@ def _run_module_record_api(module, provider_information, record_converter, recor
     existing_record = None
     exact_match = False
     ttl_in = module.params.get('ttl')
-    for record in records:
-        if record.target == value_in:
-            existing_record = record
-            exact_match = record.ttl == ttl_in
-            break
+    match = match_records(records, [value_in], compare_ttl=False)
+    if match.keep:
+        existing_record = match.keep[0]
+        exact_match = existing_record.ttl == ttl_in
 
     before = existing_record.clone() if existing_record else None
     after = before
@@ -175,6 +177,10 @@ def _run_module_record_api(module, provider_information, record_converter, recor
             'after': format_record_for_output(after, record_in, prefix, record_converter=record_converter) if after else {},
         }
 
+    if not module.params.get('wait', True):
+        # The old Hetzner DNS API applies changes immediately and does not use actions
+        result['action_ids'] = []
+    result.update(get_api_stats_result(module, api))
     module.exit_json(**result)
 
 
@@ -188,7 +194,7 @@ def _run_module_record_set_api(module, provider_information, record_converter, r
         if zone is None:
             module.fail_json(msg='Zone not found')
         zone_id = zone.zone.id
-        record_sets = zone.record_sets
+        record_sets = zone.find_record_sets(prefix=prefix, record_type=type_in)
     elif record_in is not None:
         zone = api.get_zone_with_record_sets_by_id(
             module.params.get('zone_id'),
@@ -201,7 +207,7 @@ def _run_module_record_set_api(module, provider_information, record_converter, r
         record_in, prefix = get_prefix(
             normalized_zone=zone_in, normalized_record=record_in, prefix=prefix_in, provider_information=provider_information)
         zone_id = zone.zone.id
-        record_sets = zone.record_sets
+        record_sets = zone.find_record_sets(prefix=prefix, record_type=type_in)
     else:
         zone_id = module.params.get('zone_id')
         prefix = provider_information.normalize_prefix(prefix_in)
@@ -212,11 +218,11 @@ def _run_module_record_set_api(module, provider_information, record_converter, r
         )
         if record_sets is None:
             module.fail_json(msg='Zone not found')
+        record_sets = filter_record_sets(record_sets, prefix=prefix, record_type=type_in)
         zone_in = None
         record_in = None
 
-    # Find matching records
-    record_sets = filter_record_sets(record_sets, prefix=prefix, record_type=type_in)
+    # Convert records
     for record_set in record_sets:
         record_converter.process_set_from_api(record_set)
     record_set = record_sets[0] if record_sets else None
@@ -230,11 +236,10 @@ def _run_module_record_set_api(module, provider_information, record_converter, r
     existing_record = None
     exact_match = False
     ttl_in = module.params.get('ttl')
-    for record in records:
-        if record.target == value_in:
-            existing_record = record
-            exact_match = record.ttl == ttl_in
-            break
+    match = match_records(records, [value_in], compare_ttl=False)
+    if match.keep:
+        existing_record = match.keep[0]
+        exact_match = existing_record.ttl == ttl_in
 
     before = existing_record.clone() if existing_record else None
     after = before
@@ -310,6 +315,9 @@ def _run_module_record_set_api(module, provider_information, record_converter, r
             'after': format_record_for_output(after, record_in, prefix, record_converter=record_converter) if after else {},
         }
 
+    if not module.params.get('wait', True):
+        result['action_ids'] = api.started_action_ids
+    result.update(get_api_stats_result(module, api))
     module.exit_json(**result)
 
 
@@ -323,6 +331,7 @@ def run_module(module, create_api, provider_information):
     type_in = module.params.get('type')
     if type_in and type_in not in provider_information.get_supported_record_types():
         module.fail_json(msg='Invalid record type {type}'.format(type=type_in))
+    api = None
     try:
         # Create API
         api = create_api()
@@ -333,8 +342,17 @@ def run_module(module, create_api, provider_information):
             _run_module_record_set_api(module, provider_information, record_converter, record_in, prefix_in, type_in, api)
 
     except DNSConversionError as e:
-        module.fail_json(msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIAuthenticationError as e:
-        module.fail_json(msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIError as e:
-        module.fail_json(msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
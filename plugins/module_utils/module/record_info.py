@@ -38,7 +38,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     ZoneRecordAPI,
 )
 
-from ._utils import get_prefix, normalize_dns_name
+from ._utils import get_api_stats_result, get_prefix, normalize_dns_name
 
 
 def create_module_argument_spec(provider_information):
@@ -92,9 +92,7 @@ def _run_module_record_api(module, provider_information, record_converter, filte
         prefix = None
 
     # Find matching records
-    for record in zone.records:
-        if check_prefix and record.prefix != prefix:
-            continue
+    for record in (zone.find_records(prefix=prefix) if check_prefix else zone.records):
         records.append((
             (record.prefix + '.' + zone_in) if record.prefix else zone_in,
             record,
@@ -102,8 +100,7 @@ def _run_module_record_api(module, provider_information, record_converter, filte
 
     # Convert records
     only_records = [record for record_name, record in records]
-    record_converter.process_multiple_from_api(only_records)
-    record_converter.process_multiple_to_user(only_records)
+    record_converter.process_multiple_from_api_to_user(only_records)
 
     # Format output
     data = [
@@ -114,6 +111,7 @@ def _run_module_record_api(module, provider_information, record_converter, filte
         changed=False,
         records=data,
         zone_id=zone.zone.id,
+        **get_api_stats_result(module, api)
     )
 
 
@@ -143,9 +141,7 @@ def _run_module_record_set_api(module, provider_information, record_converter, f
 
     # Find matching records
     records = []
-    for record_set in zone.record_sets:
-        if check_prefix and record_set.prefix != prefix:
-            continue
+    for record_set in (zone.find_record_sets(prefix=prefix) if check_prefix else zone.record_sets):
         records.extend([(
             (record.prefix + '.' + zone_in) if record.prefix else zone_in,
             record,
@@ -153,8 +149,7 @@ def _run_module_record_set_api(module, provider_information, record_converter, f
 
     # Convert records
     only_records = [record for record_name, record in records]
-    record_converter.process_multiple_from_api(only_records)
-    record_converter.process_multiple_to_user(only_records)
+    record_converter.process_multiple_from_api_to_user(only_records)
 
     # Format output
     data = [
@@ -165,6 +160,7 @@ def _run_module_record_set_api(module, provider_information, record_converter, f
         changed=False,
         records=data,
         zone_id=zone.zone.id,
+        **get_api_stats_result(module, api)
     )
 
 
@@ -185,6 +181,7 @@ def run_module(module, create_api, provider_information):
         if module.params.get('prefix') is not None:
             filter_prefix = provider_information.normalize_prefix(module.params.get('prefix'))
 
+    api = None
     try:
         # Create API
         api = create_api()
@@ -194,8 +191,17 @@ def run_module(module, create_api, provider_information):
         else:
             _run_module_record_set_api(module, provider_information, record_converter, filter_record_type, filter_prefix, api)
     except DNSConversionError as e:
-        module.fail_json(msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIAuthenticationError as e:
-        module.fail_json(msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIError as e:
-        module.fail_json(msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
@@ -30,9 +30,13 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     create_record_transformation_argspec,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import (
-    DNSRecord,
     format_records_for_output,
 )
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_diff import (
+    RecordSetDiff,
+    assign_targets,
+    match_records,
+)
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_set import (
     DNSRecordSet,
     format_record_set_for_output,
@@ -51,7 +55,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     filter_record_sets,
 )
 
-from ._utils import get_prefix, normalize_dns_name
+from ._utils import get_api_stats_result, get_prefix, normalize_dns_name
 
 
 def create_module_argument_spec(provider_information):
@@ -94,7 +98,7 @@ def _run_module_record_api(option_provider, module, provider_information, record
         if zone is None:
             module.fail_json(msg='Zone not found')
         zone_id = zone.zone.id
-        records = zone.records
+        records = zone.find_records(prefix=prefix)
     elif record_in is not None:
         zone = api.get_zone_with_records_by_id(
             module.params.get('zone_id'),
@@ -107,7 +111,7 @@ def _run_module_record_api(option_provider, module, provider_information, record
         record_in, prefix = get_prefix(
             normalized_zone=zone_in, normalized_record=record_in, prefix=prefix_in, provider_information=provider_information)
         zone_id = zone.zone.id
-        records = zone.records
+        records = zone.find_records(prefix=prefix)
     else:
         zone_id = module.params.get('zone_id')
         prefix = provider_information.normalize_prefix(prefix_in)
@@ -118,11 +122,11 @@ def _run_module_record_api(option_provider, module, provider_information, record
         )
         if records is None:
             module.fail_json(msg='Zone not found')
+        records = filter_records(records, prefix=prefix)
         zone_in = None
         record_in = None
 
-    # Find matching records
-    records = filter_records(records, prefix=prefix)
+    # Convert records
     record_converter.process_multiple_from_api(records)
 
     # Parse records
@@ -133,22 +137,11 @@ def _run_module_record_api(option_provider, module, provider_information, record
 
     # Compare records
     ttl_in = module.params.get('ttl')
-    mismatch = False
-    mismatch_records = []
-    keep_records = []
-    for record in records:
-        if record.ttl != ttl_in:
-            mismatch = True
-            mismatch_records.append(record)
-            continue
-        val = record.target
-        if val in values:
-            values.remove(val)
-            keep_records.append(record)
-        else:
-            mismatch = True
-            mismatch_records.append(record)
-            continue
+    match = match_records(records, values, ttl=ttl_in)
+    mismatch_records = match.mismatch
+    keep_records = match.keep
+    values = match.missing
+    mismatch = bool(mismatch_records)
     if values and module.params.get('state') == 'present':
         mismatch = True
 
@@ -176,20 +169,12 @@ def _run_module_record_api(option_provider, module, provider_information, record
         if no_mod:
             after = before[:]
         else:
-            for target in values:
-                if to_delete:
-                    # If there's a record to delete, change it to new record
-                    record = to_delete.pop()
-                    to_change.append(record)
-                else:
-                    # Otherwise create new record
-                    record = DNSRecord()
-                    to_create.append(record)
-                record.prefix = prefix
-                record.type = type_in
-                record.ttl = ttl_in
-                record.target = target
-                after.append(record)
+            # If there are records to delete, change them to new records
+            assignment = assign_targets(to_delete, values, prefix, type_in, ttl_in)
+            to_change.extend(assignment.to_change)
+            to_create.extend(assignment.to_create)
+            to_delete = assignment.unused
+            after.extend(assignment.records)
     if module.params.get('state') == 'absent':
         if mismatch:
             # Mismatch: user wants to overwrite?
@@ -237,6 +222,7 @@ def _run_module_record_api(option_provider, module, provider_information, record
                 module.fail_json(
                     msg='Errors: {0}'.format('; '.join([str(e) for e in errors])),
                     errors=[str(e) for e in errors],
+                    **get_api_stats_result(module, api)
                 )
 
     # Include diff information
@@ -252,6 +238,10 @@ def _run_module_record_api(option_provider, module, provider_information, record
             ),
         }
 
+    if not module.params.get('wait', True):
+        # The old Hetzner DNS API applies changes immediately and does not use actions
+        result['action_ids'] = []
+    result.update(get_api_stats_result(module, api))
     module.exit_json(**result)
 
 
@@ -265,7 +255,7 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
         if zone is None:
             module.fail_json(msg='Zone not found')
         zone_id = zone.zone.id
-        record_sets = zone.record_sets
+        record_sets = zone.find_record_sets(prefix=prefix)
     elif record_in is not None:
         zone = api.get_zone_with_record_sets_by_id(
             module.params.get('zone_id'),
@@ -278,7 +268,7 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
         record_in, prefix = get_prefix(
             normalized_zone=zone_in, normalized_record=record_in, prefix=prefix_in, provider_information=provider_information)
         zone_id = zone.zone.id
-        record_sets = zone.record_sets
+        record_sets = zone.find_record_sets(prefix=prefix)
     else:
         zone_id = module.params.get('zone_id')
         prefix = provider_information.normalize_prefix(prefix_in)
@@ -289,11 +279,11 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
         )
         if record_sets is None:
             module.fail_json(msg='Zone not found')
+        record_sets = filter_record_sets(record_sets, prefix=prefix)
         zone_in = None
         record_in = None
 
     # Find matching records
-    record_sets = filter_record_sets(record_sets, prefix=prefix)
     if len(record_sets) > 1:
         module.fail_json(msg='Internal error: should have at most one record set, but got {0}'.format(len(record_sets)))  # pragma: no cover
     record_set = None
@@ -313,13 +303,10 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
     keep_records = []
     if record_set:
         mismatch_ttl = record_set.ttl != ttl_in
-        for record in record_set.records:
-            val = record.target
-            if val in values:
-                values.remove(val)
-                keep_records.append(record)
-            else:
-                mismatch_records.append(record)
+        match = match_records(record_set.records, values, compare_ttl=False)
+        mismatch_records = match.mismatch
+        keep_records = match.keep
+        values = match.missing
     else:
         mismatch_ttl = False
         mismatch_records = []
@@ -357,14 +344,9 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
             after.records.extend(keep_records)
             if record_set:
                 after.id = record_set.id
-                after.extra = record_set.extra.copy()
-            for value in values:
-                rec = DNSRecord()
-                rec.type = type_in
-                rec.ttl = ttl_in
-                rec.prefix = prefix
-                rec.target = value
-                after.records.append(rec)
+                after.extra = dict(record_set._get_extra())
+            added_records = assign_targets([], values, prefix, type_in, ttl_in).records
+            after.records.extend(added_records)
             if not after.records:
                 after = None
                 if record_set:
@@ -377,7 +359,11 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
                     new_record_set = record_converter.clone_set_to_api(after)
                     if record_set:
                         new_record_set.id = record_set.id
-                        after = api.update_record_set(zone_id, new_record_set, updated_records=mismatch_values, updated_ttl=mismatch_ttl)
+                        records_diff = RecordSetDiff(
+                            added=record_converter.clone_multiple_to_api(added_records),
+                            removed=record_converter.clone_multiple_to_api(mismatch_records),
+                        )
+                        after = api.update_record_set(zone_id, new_record_set, updated_records=records_diff, updated_ttl=mismatch_ttl)
                     else:
                         after = api.add_record_set(zone_id, new_record_set)
                     after = record_converter.process_set_from_api(after)
@@ -414,6 +400,9 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
             ),
         }
 
+    if not module.params.get('wait', True):
+        result['action_ids'] = api.started_action_ids
+    result.update(get_api_stats_result(module, api))
     module.exit_json(**result)
 
 
@@ -428,6 +417,7 @@ def run_module(module, create_api, provider_information):
     if type_in and type_in not in provider_information.get_supported_record_types():
         module.fail_json(msg='Invalid record type {type}'.format(type=type_in))
 
+    api = None
     try:
         # Create API
         api = create_api()
@@ -438,8 +428,17 @@ def run_module(module, create_api, provider_information):
             _run_module_record_set_api(option_provider, module, provider_information, record_converter, record_in, prefix_in, type_in, api)
 
     except DNSConversionError as e:
-        module.fail_json(msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIAuthenticationError as e:
-        module.fail_json(msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIError as e:
-        module.fail_json(msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
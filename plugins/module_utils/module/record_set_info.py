@@ -41,7 +41,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     ZoneRecordAPI,
 )
 
-from ._utils import get_prefix, normalize_dns_name
+from ._utils import get_api_stats_result, get_prefix, normalize_dns_name
 
 
 def create_module_argument_spec(provider_information):
@@ -91,14 +91,10 @@ def _run_module_record_api(module, provider_information, record_converter, filte
             normalized_zone=zone_in, normalized_record=record_in, prefix=prefix_in, provider_information=provider_information)
 
         # Find matching records
-        records = []
-        for record in zone.records:
-            if record.prefix == prefix:
-                records.append(record)
+        records = zone.find_records(prefix=prefix)
 
         # Convert records
-        record_converter.process_multiple_from_api(records)
-        record_converter.process_multiple_to_user(records)
+        record_converter.process_multiple_from_api_to_user(records)
 
         # Format output
         data = format_records_for_output(records, record_in, prefix) if records else {}
@@ -106,6 +102,7 @@ def _run_module_record_api(module, provider_information, record_converter, filte
             changed=False,
             set=data,
             zone_id=zone.zone.id,
+            **get_api_stats_result(module, api)
         )
     else:
         # Extract prefix if necessary
@@ -121,19 +118,15 @@ def _run_module_record_api(module, provider_information, record_converter, filte
 
         # Find matching records
         records = {}
-        for record in zone.records:
-            if check_prefix and record.prefix != prefix:
+        for (record_prefix, record_type), record_list in zone.index.by_prefix_and_type.items():
+            if check_prefix and record_prefix != prefix:
                 continue
-            key = ((record.prefix + '.' + zone_in) if record.prefix else zone_in, record.type)
-            record_list = records.get(key)
-            if record_list is None:
-                record_list = records[key] = []
-            record_list.append(record)
+            key = ((record_prefix + '.' + zone_in) if record_prefix else zone_in, record_type)
+            records[key] = list(record_list)
 
         # Convert records
         for record_list in records.values():
-            record_converter.process_multiple_from_api(record_list)
-            record_converter.process_multiple_to_user(record_list)
+            record_converter.process_multiple_from_api_to_user(record_list)
 
         # Format output
         data = [
@@ -144,6 +137,7 @@ def _run_module_record_api(module, provider_information, record_converter, filte
             changed=False,
             sets=data,
             zone_id=zone.zone.id,
+            **get_api_stats_result(module, api)
         )
 
 
@@ -169,12 +163,11 @@ def _run_module_record_set_api(module, provider_information, record_converter, f
             normalized_zone=zone_in, normalized_record=record_in, prefix=prefix_in, provider_information=provider_information)
 
         # Find matching record set
-        record_set = next((candidate_record_set for candidate_record_set in zone.record_sets if candidate_record_set.prefix == prefix), None)
+        record_set = next(iter(zone.find_record_sets(prefix=prefix)), None)
 
         # Convert record set
         if record_set:
-            record_converter.process_set_from_api(record_set)
-            record_converter.process_set_to_user(record_set)
+            record_converter.process_set_from_api_to_user(record_set)
 
         # Format output
         data = format_record_set_for_output(record_set, record_in, prefix) if record_set else {}
@@ -182,6 +175,7 @@ def _run_module_record_set_api(module, provider_information, record_converter, f
             changed=False,
             set=data,
             zone_id=zone.zone.id,
+            **get_api_stats_result(module, api)
         )
     else:
         # Extract prefix if necessary
@@ -199,15 +193,12 @@ def _run_module_record_set_api(module, provider_information, record_converter, f
             return record_set.prefix + '.' + zone_in if record_set.prefix else zone_in
 
         # Find matching records
-        record_sets = list(zone.record_sets)
-        if check_prefix:
-            record_sets = [record_set for record_set in record_sets if record_set.prefix == prefix]
+        record_sets = zone.find_record_sets(prefix=prefix) if check_prefix else list(zone.record_sets)
         record_sets.sort(key=lambda record_set: (get_record_name(record_set), record_set.type))
 
         # Convert records
         for record_set in record_sets:
-            record_converter.process_set_from_api(record_set)
-            record_converter.process_set_to_user(record_set)
+            record_converter.process_set_from_api_to_user(record_set)
 
         # Format output
         data = [
@@ -218,6 +209,7 @@ def _run_module_record_set_api(module, provider_information, record_converter, f
             changed=False,
             sets=data,
             zone_id=zone.zone.id,
+            **get_api_stats_result(module, api)
         )
 
 
@@ -238,6 +230,7 @@ def run_module(module, create_api, provider_information):
         if module.params.get('prefix') is not None:
             filter_prefix = provider_information.normalize_prefix(module.params.get('prefix'))
 
+    api = None
     try:
         # Create API
         api = create_api()
@@ -248,8 +241,17 @@ def run_module(module, create_api, provider_information):
             _run_module_record_set_api(module, provider_information, record_converter, filter_record_type, filter_prefix, api)
 
     except DNSConversionError as e:
-        module.fail_json(msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIAuthenticationError as e:
-        module.fail_json(msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIError as e:
-        module.fail_json(msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
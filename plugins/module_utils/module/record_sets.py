@@ -12,7 +12,7 @@ __metaclass__ = type
 
 
 import traceback
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict
 
 from ansible.module_utils.common.text.converters import to_text
 
@@ -29,16 +29,24 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.options import (
     create_bulk_operations_argspec,
     create_record_transformation_argspec,
+    create_zone_file_import_argspec,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import (
-    DNSRecord,
     format_records_for_output,
     format_ttl,
 )
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_diff import (
+    RecordSetDiff,
+    assign_targets,
+    match_records,
+)
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_set import (
     DNSRecordSet,
     format_record_set_for_output,
 )
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_file import (
+    format_zone_file,
+)
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
     DNSAPIAuthenticationError,
     DNSAPIError,
@@ -51,7 +59,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     bulk_apply_changes as rrset_bulk_apply_changes,
 )
 
-from ._utils import get_prefix, normalize_dns_name
+from ._utils import get_api_stats_result, get_prefix, normalize_dns_name
 
 
 def create_module_argument_spec(provider_information):
@@ -60,6 +68,7 @@ def create_module_argument_spec(provider_information):
             'zone_name': {'type': 'str', 'aliases': ['zone']},
             'zone_id': {'type': provider_information.get_zone_id_type()},
             'prune': {'type': 'bool', 'default': False},
+            'diff_scope': {'type': 'str', 'choices': ['changed', 'full'], 'default': 'full'},
             'record_sets': {
                 'type': 'list',
                 'elements': 'dict',
@@ -84,7 +93,8 @@ def create_module_argument_spec(provider_information):
         mutually_exclusive=[
             ('zone_name', 'zone_id'),
         ],
-    ).merge(create_bulk_operations_argspec(provider_information)).merge(create_record_transformation_argspec())
+    ).merge(create_bulk_operations_argspec(provider_information)).merge(
+        create_zone_file_import_argspec(provider_information)).merge(create_record_transformation_argspec())
 
 
 def _get_record_sets_dict(module, provider_information, record_converter, zone_in):
@@ -117,6 +127,18 @@ def _get_record_sets_dict(module, provider_information, record_converter, zone_i
     return result
 
 
+def _use_zone_file_import(module):
+    return module.params.get('update_strategy') == 'zone_file_import'
+
+
+def _import_zone_file(module, api, zone, zone_in, records):
+    # The records must be in the API's format. The zone file replaces all records of the zone.
+    # The zone file is also rendered in check mode, since this fails for records with comments.
+    zone_file = format_zone_file(zone_in, records, default_ttl=(zone.zone.info or {}).get('ttl'))
+    if not module.check_mode:
+        api.import_zone_file(zone.zone.id, zone_file)
+
+
 def _run_module_record_api(option_provider, module, provider_information, record_converter, api):
     # Get zone information
     if module.params['zone_name'] is not None:
@@ -141,15 +163,12 @@ def _run_module_record_api(option_provider, module, provider_information, record
     record_sets_dict = _get_record_sets_dict(module, provider_information, record_converter, zone_in)
 
     # Group existing record sets
-    existing_record_sets = {}
-    for record in zone_records:
-        key = (record.prefix, record.type)
-        if key not in existing_record_sets:
-            existing_record_sets[key] = []
-        existing_record_sets[key].append(record)
-
-    # Data required for diff
-    old_record_sets = {k: [r.clone() for r in v] for k, v in existing_record_sets.items()}
+    existing_record_sets = {k: list(v) for k, v in zone.index.by_prefix_and_type.items()}
+
+    # Data required for diff. Only record sets whose records are modified in-place are copied,
+    # and only in diff mode.
+    old_record_sets = {}
+    changed_keys = set()
     new_record_sets = {k: list(v) for k, v in existing_record_sets.items()}
 
     # Create action lists
@@ -162,48 +181,29 @@ def _run_module_record_api(option_provider, module, provider_information, record
             new_record_sets[key] = []
         existing_recs = existing_record_sets.get(key, [])
         existing_record_sets[key] = []
-        new_recs = new_record_sets[key]
 
         if record_set['ignore']:
             continue
 
-        mismatch_recs = []
-        keep_record_sets = []
-        values = list(record_set['value'])
-        for record in existing_recs:
-            if record.ttl != record_set['ttl']:
-                mismatch_recs.append(record)
-                new_recs.remove(record)
-                continue
-            if record.target in values:
-                values.remove(record.target)
-                keep_record_sets.append(record)
-            else:
-                mismatch_recs.append(record)
-                new_recs.remove(record)
-
-        for target in values:
-            if mismatch_recs:
-                record = mismatch_recs.pop()
-                to_change.append(record)
-            else:
-                # Otherwise create new record
-                record = DNSRecord()
-                to_create.append(record)
-            record.prefix = prefix
-            record.type = record_type
-            record.ttl = record_set['ttl']
-            record.target = target
-            new_recs.append(record)
-
-        to_delete.extend(mismatch_recs)
+        # Keep matching records, and change mismatching records to missing values
+        match = match_records(existing_recs, record_set['value'], ttl=record_set['ttl'])
+        if match.mismatch or match.missing:
+            changed_keys.add(key)
+            if module._diff and match.mismatch:
+                old_record_sets[key] = [r.clone() for r in existing_recs]
+        assignment = assign_targets(match.mismatch, match.missing, prefix, record_type, record_set['ttl'])
+        to_change.extend(assignment.to_change)
+        to_create.extend(assignment.to_create)
+        to_delete.extend(assignment.unused)
+        new_record_sets[key] = match.keep + assignment.records
 
     # If pruning, remove superfluous record sets
     if prune:
         for key, record_set in existing_record_sets.items():
             to_delete.extend(record_set)
-            for record in record_set:
-                new_record_sets[key].remove(record)
+            if record_set:
+                changed_keys.add(key)
+                new_record_sets[key] = []
 
     # Compose result
     result = {
@@ -217,7 +217,10 @@ def _run_module_record_api(option_provider, module, provider_information, record
         records_to_change = record_converter.clone_multiple_to_api(to_change)
         records_to_create = record_converter.clone_multiple_to_api(to_create)
         result['changed'] = True
-        if not module.check_mode:
+        if _use_zone_file_import(module):
+            records = [record for record_set in new_record_sets.values() for record in record_set]
+            _import_zone_file(module, api, zone, zone_in, record_converter.clone_multiple_to_api(records))
+        elif not module.check_mode:
             dummy, errors, dummy2 = bulk_apply_changes(
                 api,
                 zone_id=zone_id,
@@ -233,14 +236,19 @@ def _run_module_record_api(option_provider, module, provider_information, record
                 module.fail_json(
                     msg='Errors: {0}'.format('; '.join([str(e) for e in errors])),
                     errors=[str(e) for e in errors],
+                    **get_api_stats_result(module, api)
                 )
 
     # Include diff information
     if module._diff:
+        include_all = module.params['diff_scope'] == 'full'
+        old_record_sets = {k: old_record_sets.get(k, v) for k, v in zone.index.by_prefix_and_type.items()}
+
         def sort_items(dictionary):
             items = [
                 (zone_in if prefix is None else (prefix + '.' + zone_in), record_type, prefix, record_set)
-                for (prefix, record_type), record_set in dictionary.items() if len(record_set) > 0
+                for (prefix, record_type), record_set in dictionary.items()
+                if len(record_set) > 0 and (include_all or (prefix, record_type) in changed_keys)
             ]
             return sorted(items)
 
@@ -259,6 +267,10 @@ def _run_module_record_api(option_provider, module, provider_information, record
             },
         }
 
+    if not module.params.get('wait', True):
+        # The old Hetzner DNS API applies changes immediately and does not use actions
+        result['action_ids'] = []
+    result.update(get_api_stats_result(module, api))
     module.exit_json(**result)
 
 
@@ -287,13 +299,12 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
     record_sets_dict = _get_record_sets_dict(module, provider_information, record_converter, zone_in)
 
     # Group existing record sets
-    existing_record_sets = OrderedDict()
-    for record_set in zone_record_sets:
-        key = (record_set.prefix, record_set.type)
-        existing_record_sets[key] = record_set
+    existing_record_sets = OrderedDict((k, v[-1]) for k, v in zone.index.by_prefix_and_type.items())
 
-    # Data required for diff
-    old_record_sets = {k: v.clone() for k, v in existing_record_sets.items()}
+    # Data required for diff. Only record sets which are modified in-place are copied,
+    # and only in diff mode.
+    old_record_sets = {}
+    changed_keys = set()
     new_record_sets = dict(existing_record_sets)
 
     # Create action lists
@@ -313,6 +324,7 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
         if not values:
             if new_rrset:
                 to_delete.append(new_rrset)
+                changed_keys.add(key)
                 new_record_sets.pop(key)
             continue
 
@@ -321,45 +333,32 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
             rrset.prefix = prefix
             rrset.type = record_type
             rrset.ttl = ttl
-            rrset.records = []
-            for value in values:
-                rec = DNSRecord()
-                rec.prefix = prefix
-                rec.type = record_type
-                rec.ttl = ttl
-                rec.target = value
-                rrset.records.append(rec)
+            rrset.records = assign_targets([], values, prefix, record_type, ttl).records
             to_create.append(rrset)
+            changed_keys.add(key)
             new_record_sets[key] = rrset
             continue
 
+        # The records of a record set share its TTL, so only their targets are compared
+        match = match_records(new_rrset.records, values, compare_ttl=False)
         mismatch_ttl = ttl != new_rrset.ttl
-        mismatch_values = values != sorted((rec.target for rec in new_rrset.records))
-        if not mismatch_ttl and not mismatch_values:
+        if not mismatch_ttl and not match.mismatch and not match.missing:
             continue
 
-        to_change.append((new_rrset, mismatch_values, mismatch_ttl))
-        existing_records = defaultdict(list)
-        for rec in new_rrset.records:
-            existing_records[rec.target].append(rec)
-
-        new_rrset.records[:] = []
+        # Records cannot be changed in-place; they are removed and added instead
+        added = assign_targets([], match.missing, prefix, record_type, ttl).records
+        to_change.append((new_rrset, RecordSetDiff(added=added, removed=match.mismatch), mismatch_ttl))
+        changed_keys.add(key)
+        if module._diff:
+            old_record_sets[key] = new_rrset.clone()
+        new_rrset.records[:] = sorted(match.keep + added, key=lambda rec: rec.target)
         new_rrset.ttl = ttl
-        for value in values:
-            recs = existing_records.get(value)
-            if recs:
-                new_rrset.records.append(recs.pop())
-                continue
-            rec = DNSRecord()
-            rec.prefix = prefix
-            rec.type = record_type
-            rec.target = value
-            new_rrset.records.append(rec)
 
     # If pruning, remove superfluous record sets
     if prune:
         for key, record_set in existing_record_sets.items():
             to_delete.append(record_set)
+            changed_keys.add(key)
             new_record_sets.pop(key)
 
     # Compose result
@@ -375,12 +374,29 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
     if to_create or to_delete or to_change:
         record_sets_to_delete = [record_converter.clone_set_to_api(rrset) for rrset in to_delete]
         record_sets_to_change = [
-            (record_converter.clone_set_to_api(rrset), mismatch_values, mismatch_ttl)
-            for rrset, mismatch_values, mismatch_ttl in to_change
+            (
+                record_converter.clone_set_to_api(rrset),
+                RecordSetDiff(
+                    added=record_converter.clone_multiple_to_api(records_diff.added),
+                    removed=record_converter.clone_multiple_to_api(records_diff.removed),
+                ),
+                mismatch_ttl,
+            )
+            for rrset, records_diff, mismatch_ttl in to_change
         ]
         record_sets_to_create = [record_converter.clone_set_to_api(rrset) for rrset in to_create]
         result['changed'] = True
-        if not module.check_mode:
+        if _use_zone_file_import(module):
+            records = []
+            for rrset in new_record_sets.values():
+                rrset = record_converter.clone_set_to_api(rrset)
+                for record in rrset.records:
+                    record.prefix = rrset.prefix
+                    record.type = rrset.type
+                    record.ttl = rrset.ttl
+                    records.append(record)
+            _import_zone_file(module, api, zone, zone_in, records)
+        elif not module.check_mode:
             dummy, errors, dummy2 = rrset_bulk_apply_changes(
                 api,
                 zone_id=zone_id,
@@ -402,17 +418,25 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
                     )
                     for what, record_set, e in errors
                 ]
+                error_result = get_api_stats_result(module, api)
+                if not module.params.get('wait', True):
+                    error_result['action_ids'] = api.started_action_ids
                 module.fail_json(
                     msg='Errors: {0}'.format('; '.join(messages)),
                     errors=[str(e) for dummy, dummy2, e in errors],
+                    **error_result
                 )
 
     # Include diff information
     if module._diff:
+        include_all = module.params['diff_scope'] == 'full'
+        old_record_sets = {k: old_record_sets.get(k, v[-1]) for k, v in zone.index.by_prefix_and_type.items()}
+
         def sort_items(dictionary):
             items = [
                 (_get_name(prefix), record_type, prefix, record_set)
                 for (prefix, record_type), record_set in dictionary.items()
+                if include_all or (prefix, record_type) in changed_keys
             ]
             return sorted(items)
 
@@ -431,6 +455,9 @@ def _run_module_record_set_api(option_provider, module, provider_information, re
             },
         }
 
+    if not module.params.get('wait', True):
+        result['action_ids'] = api.started_action_ids
+    result.update(get_api_stats_result(module, api))
     module.exit_json(**result)
 
 
@@ -439,6 +466,7 @@ def run_module(module, create_api, provider_information):
     record_converter = RecordConverter(provider_information, option_provider)
     record_converter.emit_deprecations(module.deprecate)
 
+    api = None
     try:
         # Create API
         api = create_api()
@@ -449,8 +477,17 @@ def run_module(module, create_api, provider_information):
             _run_module_record_set_api(option_provider, module, provider_information, record_converter, api)
 
     except DNSConversionError as e:
-        module.fail_json(msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error while converting DNS values: {0}'.format(e.error_message), error=e.error_message, exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIAuthenticationError as e:
-        module.fail_json(msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIError as e:
-        module.fail_json(msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
@@ -21,7 +21,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     DNSAPIError,
 )
 
-from ._utils import normalize_dns_name
+from ._utils import get_api_stats_result, normalize_dns_name
 
 
 def create_module_argument_spec(provider_information):
@@ -40,6 +40,7 @@ def create_module_argument_spec(provider_information):
 
 
 def run_module(module, create_api, provider_information):
+    api = None
     try:
         # Create API
         api = create_api()
@@ -60,8 +61,15 @@ def run_module(module, create_api, provider_information):
             zone_name=zone.name,
             zone_id=zone.id,
             zone_info=zone.info,
+            **get_api_stats_result(module, api)
         )
     except DNSAPIAuthenticationError as e:
-        module.fail_json(msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
     except DNSAPIError as e:
-        module.fail_json(msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc())
+        module.fail_json(
+            msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
@@ -27,6 +27,21 @@ def create_bulk_operations_argspec(provider_information):
     )
 
 
+def create_zone_file_import_argspec(provider_information):
+    """
+    If the provider supports importing zone files, return an ArgumentSpec object with
+    appropriate options. Otherwise return an empty one.
+    """
+    if not provider_information.supports_zone_file_import():
+        return ArgumentSpec()
+
+    return ArgumentSpec(
+        argument_spec={
+            'update_strategy': {'type': 'str', 'choices': ['changes', 'zone_file_import'], 'default': 'changes'},
+        },
+    )
+
+
 def create_record_transformation_argspec():
     return ArgumentSpec(
         argument_spec={
@@ -34,3 +49,23 @@ def create_record_transformation_argspec():
             'txt_character_encoding': {'type': 'str', 'default': 'decimal', 'choices': ['decimal', 'octal']},
         },
     )
+
+
+def create_http_client_argspec():
+    return ArgumentSpec(
+        argument_spec={
+            'api_trace_file': {'type': 'path'},
+            'collect_api_stats': {'type': 'bool', 'default': False},
+            'http_cache_dir': {'type': 'path'},
+            'http_cache_max_age': {'type': 'float', 'default': 10},
+            'http_compression': {'type': 'bool', 'default': True},
+            'http_concurrency': {'type': 'int', 'default': 1},
+            'http_keepalive': {'type': 'bool', 'default': False},
+            'http_max_connections': {'type': 'int', 'default': 4},
+            'http_rate_limit': {'type': 'float'},
+            'http_rate_limit_burst': {'type': 'int', 'default': 10},
+            'http_rate_limit_file': {'type': 'path'},
+            'zone_cache_dir': {'type': 'path'},
+            'zone_cache_max_age': {'type': 'float', 'default': 3600},
+        },
+    )
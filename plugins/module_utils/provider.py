@@ -86,6 +86,15 @@ class ProviderInformation(object):
         """
         return False
 
+    def supports_zone_file_import(self):
+        """
+        Return whether the API can replace all records of a zone by importing a zone file.
+
+        If this returns ``True``, the API object must provide a method
+        ``import_zone_file(zone_id, zone_file)``.
+        """
+        return False
+
     @abc.abstractmethod
     def txt_record_handling(self):
         """
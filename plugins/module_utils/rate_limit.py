@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # pragma: no cover
+    # Not available on Windows
+    HAS_FCNTL = False  # pragma: no cover
+
+
+if sys.version_info >= (3, 6):
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from collections.abc import Callable  # pragma: no cover
+
+
+# Never wait longer than this for a reset announced by the server
+MAX_BLOCK_TIME = 60
+
+
+def _get_header(info, *header_names):  # type: (dict[str, typing.Any], str) -> str | None
+    for header_name in header_names:
+        value = info.get(header_name)
+        if value is not None:
+            return value
+    return None
+
+
+def _parse_number(value):  # type: (typing.Any) -> float | None
+    if value is None:
+        return None
+    try:
+        # Some servers return a list of values for different windows; use the first one
+        return float(str(value).split(',')[0].split(';')[0].strip())
+    except ValueError:
+        return None
+
+
+class TokenBucketRateLimiter(object):
+    """
+    Client-side token bucket which paces requests before the server starts rejecting them.
+
+    The bucket holds up to ``burst`` tokens and is refilled with ``rate`` tokens per second.
+    Every request takes one token. Rate limit headers returned by the server (remaining
+    requests and reset time) are used to correct the bucket, so that several independent
+    clients do not exceed the server's budget.
+
+    If ``state_file`` is provided, the bucket is stored in that file and protected by a file
+    lock, so that all processes using the same file (for example all forks of one
+    ansible-playbook run) share one budget.
+    """
+
+    def __init__(
+        self,
+        rate,  # type: float
+        burst=1,  # type: int
+        state_file=None,  # type: str | None
+        clock=time.time,  # type: Callable[[], float]
+        sleep=time.sleep,  # type: Callable[[float], typing.Any]
+    ):  # type: (...) -> None
+        """
+        @param rate: The number of requests per second
+        @param burst: The maximal number of requests that can be sent without waiting
+        @param state_file: Optional path of a file to share the bucket with other processes
+        @param clock: Function returning the current time in seconds
+        @param sleep: Function to sleep for the given number of seconds
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self.state_file = state_file
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._state = {'tokens': float(self.burst), 'updated': clock(), 'blocked_until': 0.0}  # type: dict[str, float]
+
+    def _load(self, fd):  # type: (int | None) -> dict[str, float]
+        if fd is None:
+            return self._state
+        os.lseek(fd, 0, os.SEEK_SET)
+        chunks = []
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        try:
+            state = json.loads(b''.join(chunks).decode('utf-8'))
+            return {
+                'tokens': min(float(state['tokens']), self.burst),
+                'updated': float(state['updated']),
+                'blocked_until': float(state.get('blocked_until', 0)),
+            }
+        except (ValueError, KeyError, TypeError):
+            return {'tokens': float(self.burst), 'updated': self._clock(), 'blocked_until': 0.0}
+
+    def _store(self, fd, state):  # type: (int | None, dict[str, float]) -> None
+        if fd is None:
+            self._state = state
+            return
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, json.dumps(state, sort_keys=True).encode('utf-8'))
+
+    def _modify(self, callback):  # type: (Callable[[dict[str, float], float], typing.Any]) -> typing.Any
+        with self._lock:
+            fd = None
+            if self.state_file is not None:
+                fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fd is not None and HAS_FCNTL:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                state = self._load(fd)
+                now = self._clock()
+                elapsed = max(now - state['updated'], 0)
+                state['tokens'] = min(state['tokens'] + elapsed * self.rate, self.burst)
+                state['updated'] = now
+                result = callback(state, now)
+                self._store(fd, state)
+                return result
+            finally:
+                if fd is not None:
+                    os.close(fd)
+
+    def _try_take(self, state, now):  # type: (dict[str, float], float) -> float
+        if state['blocked_until'] > now:
+            return state['blocked_until'] - now
+        if state['tokens'] >= 1:
+            state['tokens'] -= 1
+            return 0
+        return (1 - state['tokens']) / self.rate
+
+    def acquire(self):  # type: (...) -> float
+        """
+        Wait until a request can be sent and take a token for it.
+
+        @return The number of seconds waited.
+        """
+        waited = 0.0
+        while True:
+            wait = self._modify(self._try_take)
+            if wait <= 0:
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+    def update(self, info):  # type: (dict[str, typing.Any]) -> None
+        """
+        Update the bucket from the rate limit headers of a response.
+
+        @param info: The info dictionary returned by a HTTPHelper, with lower-case header names
+        """
+        remaining = _parse_number(_get_header(info, 'ratelimit-remaining', 'x-ratelimit-remaining'))
+        reset = _parse_number(_get_header(info, 'ratelimit-reset', 'x-ratelimit-reset'))
+        retry_after = _parse_number(_get_header(info, 'retry-after')) if info.get('status') == 429 else None
+        if remaining is None and retry_after is None:
+            return
+
+        def callback(state, now):  # type: (dict[str, float], float) -> None
+            if remaining is not None:
+                # The server knows best how many requests are left
+                state['tokens'] = min(state['tokens'], remaining)
+            block_for = None
+            if retry_after is not None:
+                block_for = retry_after
+            elif remaining is not None and remaining < 1 and reset is not None:
+                # The reset header is either a UNIX timestamp or a number of seconds
+                block_for = reset - now if reset > 1000000000 else reset
+            if block_for is not None:
+                block_for = min(max(block_for, 0), MAX_BLOCK_TIME)
+                state['blocked_until'] = max(state['blocked_until'], now + block_for)
+
+        self._modify(callback)
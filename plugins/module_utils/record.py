@@ -27,23 +27,96 @@ def format_ttl(ttl):
     return ' '.join(result)
 
 
+_INTERNED_TYPES = {}
+_INTERNED_TYPES_MAX_SIZE = 1024
+
+
+def intern_record_type(record_type):
+    """
+    Return a canonical instance of the given record type string.
+
+    Records of the same type share the same type string object, which saves memory
+    for large zones. Non-string values are returned as-is.
+    """
+    if not isinstance(record_type, (type(u''), type(b''))):
+        return record_type
+    result = _INTERNED_TYPES.get(record_type)
+    if result is None:
+        if len(_INTERNED_TYPES) >= _INTERNED_TYPES_MAX_SIZE:
+            return record_type
+        _INTERNED_TYPES[record_type] = result = record_type
+    return result
+
+
 class DNSRecord(object):
+    # Records are created in large numbers for big zones, so avoid a per-instance dict.
+    # The extra dictionary is only created when accessed, and is shared between a record
+    # and its clones until one of them accesses extra or calls update_extra() (copy-on-write).
+    __slots__ = ('id', '_type', 'prefix', 'target', 'ttl', '_extra', '_extra_shared')
+
     def __init__(self):
         self.id = None
-        self.type = None
+        self._type = None
         self.prefix = None
         self.target = None
         self.ttl = 86400  # 24 * 60 * 60
-        self.extra = {}
+        self._extra = None
+        self._extra_shared = False
+
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._type = intern_record_type(value)
+
+    @property
+    def extra(self):
+        if self._extra is None:
+            self._extra = {}
+            self._extra_shared = False
+        elif self._extra_shared:
+            self._extra = dict(self._extra)
+            self._extra_shared = False
+        return self._extra
+
+    @extra.setter
+    def extra(self, value):
+        self._extra = value
+        self._extra_shared = False
+
+    def update_extra(self, values):
+        """
+        Add the given entries to ``extra``. A dictionary shared with a clone is copied first.
+        """
+        if self._extra is None:
+            self._extra = {}
+        elif self._extra_shared:
+            self._extra = dict(self._extra)
+        self._extra_shared = False
+        self._extra.update(values)
+
+    def _get_extra(self):
+        """
+        Return ``extra`` without copying a dictionary shared with a clone.
+        The result must not be modified.
+        """
+        return self._extra if self._extra is not None else {}
 
     def clone(self):
-        result = DNSRecord()
+        result = DNSRecord.__new__(DNSRecord)
         result.id = self.id
-        result.type = self.type
+        result._type = self._type
         result.prefix = self.prefix
         result.target = self.target
         result.ttl = self.ttl
-        result.extra = dict(self.extra)
+        if self._extra:
+            result._extra = self._extra
+            result._extra_shared = self._extra_shared = True
+        else:
+            result._extra = None
+            result._extra_shared = False
         return result
 
     def __str__(self):
@@ -57,8 +130,8 @@ class DNSRecord(object):
             data.append('prefix: (none)')
         data.append('target: "{0}"'.format(self.target))
         data.append('ttl: {0}'.format(format_ttl(self.ttl)))
-        if self.extra:
-            data.append('extra: {0}'.format(self.extra))
+        if self._extra:
+            data.append('extra: {0}'.format(self._extra))
         return 'DNSRecord(' + ', '.join(data) + ')'
 
     def __repr__(self):
@@ -92,7 +165,7 @@ def format_record_for_output(record, record_name, prefix=None, record_converter=
         'type': record.type,
         'ttl': record.ttl,
         'value': record.target,
-        'extra': record.extra,
+        'extra': record._get_extra(),
     }
     if record_converter:
         entry['value'] = record_converter.process_value_to_user(entry['type'], entry['value'])
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from .record import DNSRecord
+
+
+class RecordMatch(object):
+    """
+    Result of match_records().
+
+    ``keep`` contains the existing records which match one of the targets, ``mismatch``
+    the existing records which do not, both in the order of the existing records.
+    ``missing`` contains the targets for which no existing record was found, in the
+    order of the targets.
+    """
+
+    def __init__(self):  # type: (...) -> None
+        self.keep = []  # type: list[DNSRecord]
+        self.mismatch = []  # type: list[DNSRecord]
+        self.missing = []  # type: list[str]
+
+
+def match_records(
+    records,  # type: list[DNSRecord]
+    targets,  # type: list[str]
+    ttl=None,  # type: int | None
+    compare_ttl=True,  # type: bool
+):  # type: (...) -> RecordMatch
+    """
+    Match a list of existing records with a list of desired targets.
+
+    Targets are treated as a multiset: if a target appears twice, two existing records
+    with that target are kept. Every existing record is matched to the first unused
+    occurrence of its target. This runs in linear time.
+
+    @param records: The existing records (list of DNSRecord)
+    @param targets: The desired targets (list of strings)
+    @param ttl: The desired TTL
+    @param compare_ttl: Whether records whose TTL differs from ``ttl`` should be considered
+                        as mismatching, even if their target matches.
+    @return A RecordMatch object.
+    """
+    result = RecordMatch()
+    available = {}  # type: dict[str, int]
+    for target in targets:
+        available[target] = available.get(target, 0) + 1
+    consumed = {}  # type: dict[str, int]
+    for record in records:
+        if compare_ttl and record.ttl != ttl:
+            result.mismatch.append(record)
+            continue
+        count = available.get(record.target)
+        if count:
+            available[record.target] = count - 1
+            consumed[record.target] = consumed.get(record.target, 0) + 1
+            result.keep.append(record)
+        else:
+            result.mismatch.append(record)
+    # The first occurrences of every target have been used up by kept records
+    for target in targets:
+        count = consumed.get(target)
+        if count:
+            consumed[target] = count - 1
+        else:
+            result.missing.append(target)
+    return result
+
+
+class TargetAssignment(object):
+    """
+    Result of assign_targets().
+
+    ``to_change`` contains the reused records, ``to_create`` the newly created records,
+    and ``unused`` the reusable records that were not needed. ``records`` contains the
+    changed and created records in the order of the targets.
+    """
+
+    def __init__(self):  # type: (...) -> None
+        self.to_change = []  # type: list[DNSRecord]
+        self.to_create = []  # type: list[DNSRecord]
+        self.unused = []  # type: list[DNSRecord]
+        self.records = []  # type: list[DNSRecord]
+
+
+def assign_targets(
+    reusable_records,  # type: list[DNSRecord]
+    targets,  # type: list[str]
+    prefix,  # type: str | None
+    record_type,  # type: str
+    ttl,  # type: int | None
+):  # type: (...) -> TargetAssignment
+    """
+    Create records for the given targets, reusing existing records where possible.
+
+    Reusable records are taken from the end of ``reusable_records``. They are modified
+    in-place, while ``reusable_records`` itself is not modified.
+
+    @param reusable_records: Records which can be changed instead of creating new ones
+    @param targets: The targets to create records for
+    @param prefix: The prefix of the records
+    @param record_type: The type of the records
+    @param ttl: The TTL of the records
+    @return A TargetAssignment object.
+    """
+    result = TargetAssignment()
+    reuse_count = min(len(reusable_records), len(targets))
+    result.unused = reusable_records[:len(reusable_records) - reuse_count]
+    for index, target in enumerate(targets):
+        if index < reuse_count:
+            record = reusable_records[len(reusable_records) - 1 - index]
+            result.to_change.append(record)
+        else:
+            record = DNSRecord()
+            result.to_create.append(record)
+        record.prefix = prefix
+        record.type = record_type
+        record.ttl = ttl
+        record.target = target
+        result.records.append(record)
+    return result
+
+
+class RecordSetDiff(object):
+    """
+    The records added to and removed from a record set.
+
+    Can be passed as ``updated_records`` to ``ZoneRecordSetAPI.update_record_set()``, which
+    allows APIs to only send the change instead of all records of the record set. It is
+    considered ``True`` if at least one record was added or removed.
+    """
+
+    def __init__(
+        self,
+        added=None,  # type: list[DNSRecord] | None
+        removed=None,  # type: list[DNSRecord] | None
+    ):  # type: (...) -> None
+        self.added = added or []  # type: list[DNSRecord]
+        self.removed = removed or []  # type: list[DNSRecord]
+
+    def __bool__(self):  # type: () -> bool
+        return bool(self.added or self.removed)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):  # type: () -> str
+        return 'RecordSetDiff(added={0!r}, removed={1!r})'.format(self.added, self.removed)
@@ -9,25 +9,76 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 from .record import format_ttl as _format_ttl
+from .record import intern_record_type as _intern_record_type
 
 
 class DNSRecordSet(object):
+    # See DNSRecord for how type and extra are handled.
+    __slots__ = ('id', '_type', 'prefix', 'ttl', 'records', '_extra', '_extra_shared')
+
     def __init__(self):
         self.id = None
-        self.type = None
+        self._type = None
         self.prefix = None
         self.ttl = None
         self.records = []
-        self.extra = {}
+        self._extra = None
+        self._extra_shared = False
+
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._type = _intern_record_type(value)
+
+    @property
+    def extra(self):
+        if self._extra is None:
+            self._extra = {}
+            self._extra_shared = False
+        elif self._extra_shared:
+            self._extra = dict(self._extra)
+            self._extra_shared = False
+        return self._extra
+
+    @extra.setter
+    def extra(self, value):
+        self._extra = value
+        self._extra_shared = False
+
+    def update_extra(self, values):
+        """
+        Add the given entries to ``extra``. A dictionary shared with a clone is copied first.
+        """
+        if self._extra is None:
+            self._extra = {}
+        elif self._extra_shared:
+            self._extra = dict(self._extra)
+        self._extra_shared = False
+        self._extra.update(values)
+
+    def _get_extra(self):
+        """
+        Return ``extra`` without copying a dictionary shared with a clone.
+        The result must not be modified.
+        """
+        return self._extra if self._extra is not None else {}
 
     def clone(self):
-        result = DNSRecordSet()
+        result = DNSRecordSet.__new__(DNSRecordSet)
         result.id = self.id
-        result.type = self.type
+        result._type = self._type
         result.prefix = self.prefix
         result.records = [record.clone() for record in self.records]
         result.ttl = self.ttl
-        result.extra = dict(self.extra)
+        if self._extra:
+            result._extra = self._extra
+            result._extra_shared = self._extra_shared = True
+        else:
+            result._extra = None
+            result._extra_shared = False
         return result
 
     def __str__(self):
@@ -41,8 +92,8 @@ class DNSRecordSet(object):
             data.append('prefix: (none)')
         data.append('ttl: {0}'.format(_format_ttl(self.ttl)))
         data.append('records: [{0}]'.format(', '.join([str(record) for record in self.records])))
-        if self.extra:
-            data.append('extra: {0}'.format(self.extra))
+        if self._extra:
+            data.append('extra: {0}'.format(self._extra))
         return 'DNSRecordSet(' + ', '.join(data) + ')'
 
     def __repr__(self):
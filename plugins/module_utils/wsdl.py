@@ -9,6 +9,7 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import sys
+import time
 
 from ansible.module_utils.common.text.converters import to_native
 
@@ -23,6 +24,10 @@ try:
 except ImportError:
     HAS_LXML_ETREE = False
 
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.api_stats import (
+    RATE_LIMIT_WAIT_INFO_KEY,
+    get_url_template,
+)
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import NetworkError
 
 
@@ -248,10 +253,11 @@ class Composer(object):
     def _create_envelope(self, tag, **kwarg):
         return self._create(tag, self._main_ns, **kwarg)
 
-    def __init__(self, http_helper, api, namespaces=None):
+    def __init__(self, http_helper, api, namespaces=None, api_stats=None):
         self._http_helper = http_helper
         self._main_ns = _NAMESPACE_ENVELOPE
         self._api = api
+        self._api_stats = api_stats
         # Compose basic document
         all_namespaces = {
             'SOAP-ENV': _NAMESPACE_ENVELOPE,
@@ -298,8 +304,20 @@ class Composer(object):
             }
             if self._command:
                 headers['SOAPAction'] = '"{0}#{1}"'.format(self._api, self._command)
+            start = time.time()
             result, info = self._http_helper.fetch_url(self._api, data=payload, method='POST', timeout=300, headers=headers)
             code = info['status']
+            if self._api_stats is not None:
+                wait = info.pop(RATE_LIMIT_WAIT_INFO_KEY, 0)
+                self._api_stats.record(
+                    'POST',
+                    self._api,
+                    code,
+                    len(result or b''),
+                    time.time() - start - wait,
+                    wait=wait,
+                    url_template='{0}#{1}'.format(get_url_template(self._api), self._command or ''),
+                )
         except NetworkError as e:
             raise WSDLNetworkError(to_native(e))
         # if debug:
@@ -10,6 +10,8 @@ __metaclass__ = type
 
 import sys
 
+from collections import OrderedDict
+
 if sys.version_info >= (3, 6):
     import typing
 
@@ -18,6 +20,89 @@ if sys.version_info >= (3, 6):
         from .record_set import DNSRecordSet  # pragma: no cover
 
 
+class NotProvidedType(object):
+    pass
+
+
+NOT_PROVIDED = NotProvidedType()
+
+
+class DNSZoneIndex(object):
+    """
+    Hash indexes over the records or record sets of a zone.
+
+    The indexes are built in one pass over the entries. The lists stored in the indexes
+    keep the order of the original entries and must not be modified by the caller.
+    """
+
+    def __init__(
+        self,
+        entries,  # type: list[DNSRecord] | list[DNSRecordSet]
+    ):  # type: (...) -> None
+        self.entries = entries
+        self.by_prefix_and_type = OrderedDict()  # type: OrderedDict[tuple[str | None, str], list[typing.Any]]
+        self.by_prefix = OrderedDict()  # type: OrderedDict[str | None, list[typing.Any]]
+        self.by_type = OrderedDict()  # type: OrderedDict[str, list[typing.Any]]
+        self.by_id = {}  # type: dict[typing.Any, typing.Any]
+        for entry in entries:
+            key = (entry.prefix, entry.type)
+            bucket = self.by_prefix_and_type.get(key)
+            if bucket is None:
+                self.by_prefix_and_type[key] = bucket = []
+            bucket.append(entry)
+            bucket = self.by_prefix.get(entry.prefix)
+            if bucket is None:
+                self.by_prefix[entry.prefix] = bucket = []
+            bucket.append(entry)
+            bucket = self.by_type.get(entry.type)
+            if bucket is None:
+                self.by_type[entry.type] = bucket = []
+            bucket.append(entry)
+            if entry.id is not None:
+                self.by_id[entry.id] = entry
+
+    def find(
+        self,
+        prefix=NOT_PROVIDED,  # type: str | None | NotProvidedType
+        record_type=NOT_PROVIDED,  # type: str | NotProvidedType
+    ):  # type: (...) -> list[typing.Any]
+        """
+        Return the entries matching the provided filters, in their original order.
+
+        @param prefix: The prefix to filter for, if provided. Since None is a valid value,
+                       the special constant NOT_PROVIDED indicates that we are not filtering.
+        @param record_type: The record type to filter for, if provided
+        @return A new list of entries.
+        """
+        if prefix is not NOT_PROVIDED:
+            if record_type is not NOT_PROVIDED:
+                return list(self.by_prefix_and_type.get((prefix, record_type), ()))
+            return list(self.by_prefix.get(prefix, ()))
+        if record_type is not NOT_PROVIDED:
+            return list(self.by_type.get(record_type, ()))
+        return list(self.entries)
+
+    def find_by_types(
+        self,
+        record_types,  # type: typing.Iterable[str]
+    ):  # type: (...) -> list[typing.Any]
+        """
+        Return the entries whose type is one of the provided types, in their original order.
+
+        @param record_types: The record types to filter for
+        @return A new list of entries.
+        """
+        record_types = set(record_types)
+        buckets = [self.by_type[record_type] for record_type in record_types if record_type in self.by_type]
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            return list(buckets[0])
+        if sum(len(bucket) for bucket in buckets) == len(self.entries):
+            return list(self.entries)
+        return [entry for entry in self.entries if entry.type in record_types]
+
+
 class DNSZone(object):
     def __init__(
         self,
@@ -49,6 +134,48 @@ class DNSZoneWithRecords(object):
         self.zone = zone  # type: DNSZone
         self.records = records  # type: list[DNSRecord]
 
+    @property
+    def records(self):  # type: (...) -> list[DNSRecord]
+        return self._records
+
+    @records.setter
+    def records(self, value):  # type: (list[DNSRecord]) -> None
+        self._records = value
+        self._index = None  # type: DNSZoneIndex | None
+
+    @property
+    def index(self):  # type: (...) -> DNSZoneIndex
+        """
+        Indexes of the records by (prefix, type), prefix, type and record ID.
+
+        The indexes are built on first access. Call invalidate_index() after modifying
+        the record list in-place, or after changing prefixes, types or IDs of records.
+        """
+        if self._index is None:
+            self._index = DNSZoneIndex(self._records)
+        return self._index
+
+    def invalidate_index(self):  # type: (...) -> None
+        self._index = None
+
+    def find_records(
+        self,
+        prefix=NOT_PROVIDED,  # type: str | None | NotProvidedType
+        record_type=NOT_PROVIDED,  # type: str | NotProvidedType
+    ):  # type: (...) -> list[DNSRecord]
+        """
+        Return the records matching the provided filters.
+
+        @param prefix: The prefix to filter for, if provided. Since None is a valid value,
+                       the special constant NOT_PROVIDED indicates that we are not filtering.
+        @param record_type: The record type to filter for, if provided
+        @return A list of DNSRecord objects.
+        """
+        return self.index.find(prefix=prefix, record_type=record_type)
+
+    def get_record_by_id(self, record_id):  # type: (typing.Any) -> DNSRecord | None
+        return self.index.by_id.get(record_id)
+
     def __str__(self):  # type: (...) -> str
         return '({0}, {1})'.format(self.zone, self.records)
 
@@ -65,6 +192,52 @@ class DNSZoneWithRecordSets(object):
         self.zone = zone  # type: DNSZone
         self.record_sets = record_sets  # type: list[DNSRecordSet]
 
+    @property
+    def record_sets(self):  # type: (...) -> list[DNSRecordSet]
+        return self._record_sets
+
+    @record_sets.setter
+    def record_sets(self, value):  # type: (list[DNSRecordSet]) -> None
+        self._record_sets = value
+        self._index = None  # type: DNSZoneIndex | None
+
+    @property
+    def index(self):  # type: (...) -> DNSZoneIndex
+        """
+        Indexes of the record sets by (prefix, type), prefix, type and record set ID.
+
+        The indexes are built on first access. Call invalidate_index() after modifying
+        the record set list in-place, or after changing prefixes, types or IDs of record sets.
+        """
+        if self._index is None:
+            self._index = DNSZoneIndex(self._record_sets)
+        return self._index
+
+    def invalidate_index(self):  # type: (...) -> None
+        self._index = None
+
+    def find_record_sets(
+        self,
+        prefix=NOT_PROVIDED,  # type: str | None | NotProvidedType
+        record_type=NOT_PROVIDED,  # type: str | NotProvidedType
+    ):  # type: (...) -> list[DNSRecordSet]
+        """
+        Return the record sets matching the provided filters.
+
+        @param prefix: The prefix to filter for, if provided. Since None is a valid value,
+                       the special constant NOT_PROVIDED indicates that we are not filtering.
+        @param record_type: The record type to filter for, if provided
+        @return A list of DNSRecordSet objects.
+        """
+        return self.index.find(prefix=prefix, record_type=record_type)
+
+    def get_record_set(self, prefix, record_type):  # type: (str | None, str) -> DNSRecordSet | None
+        record_sets = self.index.by_prefix_and_type.get((prefix, record_type))
+        return record_sets[0] if record_sets else None
+
+    def get_record_set_by_id(self, record_set_id):  # type: (typing.Any) -> DNSRecordSet | None
+        return self.index.by_id.get(record_set_id)
+
     def __str__(self):  # type: (...) -> str
         return '({0}, {1})'.format(self.zone, self.record_sets)
 
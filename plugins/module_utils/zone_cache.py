@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+from ansible.module_utils.common.text.converters import to_bytes
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone import DNSZone
+
+
+if sys.version_info >= (3, 6):
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from collections.abc import Callable  # pragma: no cover
+
+
+class ZoneCache(object):
+    """
+    On-disk directory of zones, which allows to look up a zone by name or ID without asking the API.
+
+    Entries are used for ``max_age`` seconds. Since zone IDs can change when a zone is deleted
+    and created again, users of the cache should remove a zone with ``invalidate()`` when the API
+    claims that it does not exist.
+    """
+
+    def __init__(
+        self,
+        directory,  # type: str
+        namespace,  # type: str
+        max_age=3600,  # type: float
+        clock=time.time,  # type: Callable[[], float]
+    ):  # type: (...) -> None
+        """
+        @param directory: The directory to store the zones in; will be created if needed
+        @param namespace: Identifies the API and the account, so that different APIs and accounts
+                          can share the same directory
+        @param max_age: The number of seconds an entry can be used
+        @param clock: Function returning the current time in seconds
+        """
+        self.directory = directory
+        self.namespace = namespace
+        self.max_age = max_age
+        self._clock = clock
+
+    def _get_path(self, kind, key):  # type: (str, typing.Any) -> str
+        data = json.dumps([self.namespace, kind, key])
+        return os.path.join(self.directory, 'zone-{0}.json'.format(hashlib.sha256(to_bytes(data)).hexdigest()))
+
+    def _get(self, kind, key):  # type: (str, typing.Any) -> DNSZone | None
+        try:
+            with open(self._get_path(kind, key), 'rb') as f:
+                data = json.loads(f.read().decode('utf-8'))
+            if not 0 <= self._clock() - float(data['stored']) < self.max_age:
+                return None
+            zone = DNSZone(data['name'], info=data['info'])
+            zone.id = data['id']
+            return zone
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def get_by_name(self, name):  # type: (str) -> DNSZone | None
+        """
+        Return the stored zone with the given name, or None if there is none.
+        """
+        return self._get('name', name)
+
+    def get_by_id(self, zone_id):  # type: (typing.Any) -> DNSZone | None
+        """
+        Return the stored zone with the given ID, or None if there is none.
+        """
+        return self._get('id', zone_id)
+
+    def _write(self, path, data):  # type: (str, dict[str, typing.Any]) -> None
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(data, default=str).encode('utf-8'))
+            os.rename(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def put(self, zone, name=None):  # type: (DNSZone, str | None) -> None
+        """
+        Store a zone, so that it can be looked up by its ID and name. If ``name`` is provided,
+        the zone can also be looked up by that name.
+        """
+        if self.max_age <= 0:
+            return
+        data = {
+            'id': zone.id,
+            'name': zone.name,
+            'info': zone.info,
+            'stored': self._clock(),
+        }
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, 0o700)
+        self._write(self._get_path('id', zone.id), data)
+        for zone_name in set([zone.name, name or zone.name]):
+            self._write(self._get_path('name', zone_name), data)
+
+    def invalidate(self, zone, name=None):  # type: (DNSZone, str | None) -> None
+        """
+        Remove a zone stored by ``put()``.
+        """
+        paths = [self._get_path('id', zone.id)]
+        paths.extend(self._get_path('name', zone_name) for zone_name in set([zone.name, name or zone.name]))
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def create_zone_cache(
+    option_provider,  # type: typing.Any
+    namespace,  # type: str
+):  # type: (...) -> ZoneCache | None
+    """
+    Return the zone cache to use for the API client options provided by the user, if any.
+
+    @param option_provider: A object compatible with ModuleOptionProvider that gives access to the
+                            module/plugin options.
+    @param namespace: Identifies the API and the account
+    @return A ZoneCache instance, or None if caching is not enabled.
+    """
+    directory = option_provider.get_option('zone_cache_dir')
+    if directory is None:
+        return None
+    return ZoneCache(directory, namespace, max_age=option_provider.get_option('zone_cache_max_age'))
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import sys
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.conversion.base import (
+    DNSConversionError,
+)
+
+
+if sys.version_info >= (3, 6):
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from collections.abc import Iterable  # pragma: no cover
+
+        from .record import DNSRecord  # pragma: no cover
+
+
+def format_zone_file(
+    zone_name,  # type: str
+    records,  # type: Iterable[DNSRecord]
+    default_ttl=None,  # type: int | None
+):  # type: (...) -> str
+    """
+    Render records as a zone file in the master file format of RFC 1035, section 5.
+
+    The record values are written as they are, so they must be in the API's format, and
+    the API must use the presentation format of RFC 1035 for them. Owner names are written
+    relative to the zone, and SOA records are written first.
+
+    Zone files cannot contain comments of records, and an import would remove them.
+    Therefore a ``DNSConversionError`` is raised if a record has a comment.
+
+    @param zone_name: The zone's name, without trailing dot
+    @param records: The records (DNSRecord) to include
+    @param default_ttl: The TTL used for records without TTL, if provided
+    @return The zone file (string)
+    """
+    lines = ['$ORIGIN {0}.'.format(zone_name)]
+    if default_ttl is not None:
+        lines.append('$TTL {0}'.format(default_ttl))
+    for record in sorted(records, key=lambda record: record.type != 'SOA'):
+        if record._get_extra().get('comment'):
+            raise DNSConversionError(
+                u'Cannot write the comment of the {0} record of {1} to a zone file. Remove the comment, or do not import'
+                u' a zone file'.format(record.type, '@' if record.prefix is None else record.prefix)
+            )
+        fields = ['@' if record.prefix is None else record.prefix]
+        if record.ttl is not None:
+            fields.append(str(record.ttl))
+        fields.extend(['IN', record.type, record.target])
+        lines.append(' '.join(fields))
+    lines.append('')
+    return '\n'.join(lines)
@@ -10,12 +10,18 @@ __metaclass__ = type
 
 
 import abc
+import threading
 
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils._six import (
     add_metaclass,
 )
-from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone import (
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.concurrency import (
+    run_concurrently,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone import (  # pylint: disable=unused-import
+    NOT_PROVIDED,
     DNSZoneWithRecords,
+    NotProvidedType,
 )
 
 
@@ -27,15 +33,100 @@ class DNSAPIAuthenticationError(DNSAPIError):
     pass
 
 
-class NotProvidedType(object):
-    pass
-
-
-NOT_PROVIDED = NotProvidedType()
+def run_bulk_changes(items_per_zone_id, change, stop_early_on_errors=True, max_workers=1):
+    """
+    Apply a change to every item of every zone, and collect the results.
+
+    The changes are independent of each other and are run with at most ``max_workers``
+    threads. If ``stop_early_on_errors`` is ``True``, no further change is started once
+    one failed; changes which are already running are completed and reported.
+
+    @param items_per_zone_id: Maps a zone ID to a list of items
+    @param change: A function accepting a zone ID and an item. It must return a tuple
+                   ``(item, success, failed)``, where ``failed`` is ``None`` or a ``DNSAPIError``.
+    @param stop_early_on_errors: If set to ``True``, try to stop changes after the first error happens.
+    @param max_workers: The maximal number of changes to run at the same time
+    @return A dictionary mapping zone IDs to lists of results of ``change``, in the order of the items.
+            Zones for which no change has been made after an error stopped processing are omitted.
+    """
+    lock = threading.Lock()
+    state = {'stop': False}
+
+    def create_job(zone_id, item):
+        def job():
+            with lock:
+                if state['stop']:
+                    return None
+            result = change(zone_id, item)
+            if result[2] is not None and stop_early_on_errors:
+                with lock:
+                    state['stop'] = True
+            return result
+
+        return job
+
+    zones = list(items_per_zone_id.items())
+    jobs = []
+    for zone_id, items in zones:
+        for item in items:
+            jobs.append(create_job(zone_id, item))
+    results = run_concurrently(jobs, max_workers=max_workers)
+
+    results_per_zone_id = {}
+    index = 0
+    stopped = False
+    for zone_id, items in zones:
+        zone_results = [result for result in results[index:index + len(items)] if result is not None]
+        index += len(items)
+        if zone_results or not stopped:
+            results_per_zone_id[zone_id] = zone_results
+        if stop_early_on_errors and any(result[2] is not None for result in zone_results):
+            stopped = True
+    return results_per_zone_id
+
+
+def get_zone_with_entries(zone_cache, get_zone, get_entries, name=None, zone_id=None):
+    """
+    Look up a zone by name or ID, and fetch its records or record sets.
+
+    If ``zone_cache`` is provided, the zone is looked up there first. If the API does not
+    find the records or record sets of a cached zone, the zone is removed from the cache
+    and looked up again, since it might have been deleted or created again with another ID.
+
+    @param zone_cache: A ZoneCache instance, or ``None``
+    @param get_zone: Function accepting the zone name respectively ID, and returning the zone
+                     information (DNSZone), or ``None`` if it was not found
+    @param get_entries: Function accepting the zone information, and returning its records or
+                        record sets, or ``None`` if the zone was not found
+    @param name: The zone name. Exactly one of ``name`` and ``zone_id`` must be provided.
+    @param zone_id: The zone ID
+    @return A tuple ``(zone, entries)``, or ``None`` if the zone was not found
+    """
+    key = name if name is not None else zone_id
+    if zone_cache is not None:
+        zone = zone_cache.get_by_name(name) if name is not None else zone_cache.get_by_id(zone_id)
+        if zone is not None:
+            entries = get_entries(zone)
+            if entries is not None:
+                return zone, entries
+            zone_cache.invalidate(zone, name=name)
+    zone = get_zone(key)
+    if zone is None:
+        return None
+    if zone_cache is not None:
+        zone_cache.put(zone, name=name)
+    return zone, get_entries(zone)
 
 
 @add_metaclass(abc.ABCMeta)
 class ZoneRecordAPI(object):
+    # The maximal number of independent requests the default implementations of the bulk methods
+    # are allowed to send at the same time
+    _concurrency = 1
+
+    # An optional ZoneCache used to look up zones by name or ID
+    _zone_cache = None
+
     @abc.abstractmethod
     def get_zone_by_name(self, name):
         """
@@ -64,10 +155,15 @@ class ZoneRecordAPI(object):
         @param record_type: The record type to filter for, if provided
         @return The zone information with records (DNSZoneWithRecords), or None if not found
         """
-        zone = self.get_zone_by_name(name)
-        if zone is None:
+        result = get_zone_with_entries(
+            self._zone_cache,
+            self.get_zone_by_name,
+            lambda zone: self.get_zone_records(zone.id, prefix=prefix, record_type=record_type),
+            name=name,
+        )
+        if result is None:
             return None
-        return DNSZoneWithRecords(zone, self.get_zone_records(zone.id, prefix=prefix, record_type=record_type))
+        return DNSZoneWithRecords(*result)
 
     def get_zone_with_records_by_id(self, zone_id, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
         """
@@ -79,10 +175,15 @@ class ZoneRecordAPI(object):
         @param record_type: The record type to filter for, if provided
         @return The zone information with records (DNSZoneWithRecords), or None if not found
         """
-        zone = self.get_zone_by_id(zone_id)
-        if zone is None:
+        result = get_zone_with_entries(
+            self._zone_cache,
+            self.get_zone_by_id,
+            lambda zone: self.get_zone_records(zone.id, prefix=prefix, record_type=record_type),
+            zone_id=zone_id,
+        )
+        if result is None:
             return None
-        return DNSZoneWithRecords(zone, self.get_zone_records(zone.id, prefix=prefix, record_type=record_type))
+        return DNSZoneWithRecords(*result)
 
     @abc.abstractmethod
     def get_zone_records(self, zone_id, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
@@ -140,18 +241,13 @@ class ZoneRecordAPI(object):
                 it was not created. It is possible that the API only creates records if all succeed,
                 in that case ``failed`` can be ``None`` even though ``created`` is ``False``.
         """
-        results_per_zone_id = {}
-        for zone_id, records in records_per_zone_id.items():
-            result = []
-            results_per_zone_id[zone_id] = result
-            for record in records:
-                try:
-                    result.append((self.add_record(zone_id, record), True, None))
-                except DNSAPIError as e:
-                    result.append((record, False, e))
-                    if stop_early_on_errors:
-                        return results_per_zone_id
-        return results_per_zone_id
+        def change(zone_id, record):
+            try:
+                return self.add_record(zone_id, record), True, None
+            except DNSAPIError as e:
+                return record, False, e
+
+        return run_bulk_changes(records_per_zone_id, change, stop_early_on_errors=stop_early_on_errors, max_workers=self._concurrency)
 
     def update_records(self, records_per_zone_id, stop_early_on_errors=True):
         """
@@ -167,18 +263,13 @@ class ZoneRecordAPI(object):
                 records if all succeed, in that case ``failed`` can be ``None`` even though
                 ``updated`` is ``False``.
         """
-        results_per_zone_id = {}
-        for zone_id, records in records_per_zone_id.items():
-            result = []
-            results_per_zone_id[zone_id] = result
-            for record in records:
-                try:
-                    result.append((self.update_record(zone_id, record), True, None))
-                except DNSAPIError as e:
-                    result.append((record, False, e))
-                    if stop_early_on_errors:
-                        return results_per_zone_id
-        return results_per_zone_id
+        def change(zone_id, record):
+            try:
+                return self.update_record(zone_id, record), True, None
+            except DNSAPIError as e:
+                return record, False, e
+
+        return run_bulk_changes(records_per_zone_id, change, stop_early_on_errors=stop_early_on_errors, max_workers=self._concurrency)
 
     def delete_records(self, records_per_zone_id, stop_early_on_errors=True):
         """
@@ -193,18 +284,13 @@ class ZoneRecordAPI(object):
                 while deleting, ``deleted`` is ``False`` and ``failed`` is a ``DNSAPIError``
                 instance hopefully providing information on the error.
         """
-        results_per_zone_id = {}
-        for zone_id, records in records_per_zone_id.items():
-            result = []
-            results_per_zone_id[zone_id] = result
-            for record in records:
-                try:
-                    result.append((record, self.delete_record(zone_id, record), None))
-                except DNSAPIError as e:
-                    result.append((record, False, e))
-                    if stop_early_on_errors:
-                        return results_per_zone_id
-        return results_per_zone_id
+        def change(zone_id, record):
+            try:
+                return record, self.delete_record(zone_id, record), None
+            except DNSAPIError as e:
+                return record, False, e
+
+        return run_bulk_changes(records_per_zone_id, change, stop_early_on_errors=stop_early_on_errors, max_workers=self._concurrency)
 
 
 def filter_records(records, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
@@ -216,8 +302,10 @@ def filter_records(records, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
     @param record_type: The record type to filter for, if provided
     @return The list of records matching the provided filters.
     """
-    if prefix is not NOT_PROVIDED:
-        records = [record for record in records if record.prefix == prefix]
-    if record_type is not NOT_PROVIDED:
-        records = [record for record in records if record.type == record_type]
-    return records
+    if prefix is NOT_PROVIDED:
+        if record_type is NOT_PROVIDED:
+            return records
+        return [record for record in records if record.type == record_type]
+    if record_type is NOT_PROVIDED:
+        return [record for record in records if record.prefix == prefix]
+    return [record for record in records if record.prefix == prefix and record.type == record_type]
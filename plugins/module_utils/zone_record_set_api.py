@@ -22,11 +22,20 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     DNSAPIAuthenticationError,
     DNSAPIError,
     NotProvidedType,
+    get_zone_with_entries,
+    run_bulk_changes,
 )
 
 
 @add_metaclass(abc.ABCMeta)
 class ZoneRecordSetAPI(object):
+    # The maximal number of independent requests the default implementations of the bulk methods
+    # are allowed to send at the same time
+    _concurrency = 1
+
+    # An optional ZoneCache used to look up zones by name or ID
+    _zone_cache = None
+
     @abc.abstractmethod
     def get_zone_by_name(self, name):
         """
@@ -55,10 +64,15 @@ class ZoneRecordSetAPI(object):
         @param record_type: The record type to filter for, if provided
         @return The zone information with record sets (DNSZoneWithRecordSets), or None if not found
         """
-        zone = self.get_zone_by_name(name)
-        if zone is None:
+        result = get_zone_with_entries(
+            self._zone_cache,
+            self.get_zone_by_name,
+            lambda zone: self.get_zone_record_sets(zone.id, prefix=prefix, record_type=record_type),
+            name=name,
+        )
+        if result is None:
             return None
-        return DNSZoneWithRecordSets(zone, self.get_zone_record_sets(zone.id, prefix=prefix, record_type=record_type))
+        return DNSZoneWithRecordSets(*result)
 
     def get_zone_with_record_sets_by_id(self, zone_id, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
         """
@@ -70,10 +84,15 @@ class ZoneRecordSetAPI(object):
         @param record_type: The record type to filter for, if provided
         @return The zone information with record sets (DNSZoneWithRecordSets), or None if not found
         """
-        zone = self.get_zone_by_id(zone_id)
-        if zone is None:
+        result = get_zone_with_entries(
+            self._zone_cache,
+            self.get_zone_by_id,
+            lambda zone: self.get_zone_record_sets(zone.id, prefix=prefix, record_type=record_type),
+            zone_id=zone_id,
+        )
+        if result is None:
             return None
-        return DNSZoneWithRecordSets(zone, self.get_zone_record_sets(zone.id, prefix=prefix, record_type=record_type))
+        return DNSZoneWithRecordSets(*result)
 
     @abc.abstractmethod
     def get_zone_record_sets(self, zone_id, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
@@ -104,7 +123,9 @@ class ZoneRecordSetAPI(object):
 
         @param zone_id: The zone ID
         @param record_set: The DNS record set (DNSRecordSet)
-        @param updated_records: Hint whether the values were updated.
+        @param updated_records: Hint whether the values were updated. Can also be a RecordSetDiff
+                                describing which records were added and removed; it evaluates
+                                to ``False`` if no record was added or removed.
         @param updated_ttl: Hint whether the values were updated.
         @return The DNS record set (DNSRecordSet)
         """
@@ -133,18 +154,13 @@ class ZoneRecordSetAPI(object):
                 it was not created. It is possible that the API only creates record sets if all succeed,
                 in that case ``failed`` can be ``None`` even though ``created`` is ``False``.
         """
-        results_per_zone_id = {}
-        for zone_id, record_sets in record_sets_per_zone_id.items():
-            result = []
-            results_per_zone_id[zone_id] = result
-            for record_set in record_sets:
-                try:
-                    result.append((self.add_record_set(zone_id, record_set), True, None))
-                except DNSAPIError as e:
-                    result.append((record_set, False, e))
-                    if stop_early_on_errors:
-                        return results_per_zone_id
-        return results_per_zone_id
+        def change(zone_id, record_set):
+            try:
+                return self.add_record_set(zone_id, record_set), True, None
+            except DNSAPIError as e:
+                return record_set, False, e
+
+        return run_bulk_changes(record_sets_per_zone_id, change, stop_early_on_errors=stop_early_on_errors, max_workers=self._concurrency)
 
     def update_record_sets(self, record_sets_per_zone_id, stop_early_on_errors=True):
         """
@@ -152,7 +168,7 @@ class ZoneRecordSetAPI(object):
 
         @param record_sets_per_zone_id: Maps a zone ID to a list of tuples
                                         (record_set, updated_records, updated_ttl)
-                                        of type (DNSRecordSet, bool, bool).
+                                        of type (DNSRecordSet, bool | RecordSetDiff, bool).
         @param stop_early_on_errors: If set to ``True``, try to stop changes after the first error happens.
                                      This might only work on some APIs.
         @return A dictionary mapping zone IDs to lists of tuples ``(record_set, updated, failed)``.
@@ -162,18 +178,14 @@ class ZoneRecordSetAPI(object):
                 record sets if all succeed, in that case ``failed`` can be ``None`` even though
                 ``updated`` is ``False``.
         """
-        results_per_zone_id = {}
-        for zone_id, record_sets in record_sets_per_zone_id.items():
-            result = []
-            results_per_zone_id[zone_id] = result
-            for record_set, updated_records, updated_ttl in record_sets:
-                try:
-                    result.append((self.update_record_set(zone_id, record_set, updated_records=updated_records, updated_ttl=updated_ttl), True, None))
-                except DNSAPIError as e:
-                    result.append((record_set, False, e))
-                    if stop_early_on_errors:
-                        return results_per_zone_id
-        return results_per_zone_id
+        def change(zone_id, item):
+            record_set, updated_records, updated_ttl = item
+            try:
+                return self.update_record_set(zone_id, record_set, updated_records=updated_records, updated_ttl=updated_ttl), True, None
+            except DNSAPIError as e:
+                return record_set, False, e
+
+        return run_bulk_changes(record_sets_per_zone_id, change, stop_early_on_errors=stop_early_on_errors, max_workers=self._concurrency)
 
     def delete_record_sets(self, record_sets_per_zone_id, stop_early_on_errors=True):
         """
@@ -188,18 +200,13 @@ class ZoneRecordSetAPI(object):
                 while deleting, ``deleted`` is ``False`` and ``failed`` is a ``DNSAPIError``
                 instance hopefully providing information on the error.
         """
-        results_per_zone_id = {}
-        for zone_id, record_sets in record_sets_per_zone_id.items():
-            result = []
-            results_per_zone_id[zone_id] = result
-            for record_set in record_sets:
-                try:
-                    result.append((record_set, self.delete_record_set(zone_id, record_set), None))
-                except DNSAPIError as e:
-                    result.append((record_set, False, e))
-                    if stop_early_on_errors:
-                        return results_per_zone_id
-        return results_per_zone_id
+        def change(zone_id, record_set):
+            try:
+                return record_set, self.delete_record_set(zone_id, record_set), None
+            except DNSAPIError as e:
+                return record_set, False, e
+
+        return run_bulk_changes(record_sets_per_zone_id, change, stop_early_on_errors=stop_early_on_errors, max_workers=self._concurrency)
 
 
 def filter_record_sets(record_sets, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
@@ -211,8 +218,10 @@ def filter_record_sets(record_sets, prefix=NOT_PROVIDED, record_type=NOT_PROVIDE
     @param record_type: The record type to filter for, if provided
     @return The list of record sets matching the provided filters.
     """
-    if prefix is not NOT_PROVIDED:
-        record_sets = [record_set for record_set in record_sets if record_set.prefix == prefix]
-    if record_type is not NOT_PROVIDED:
-        record_sets = [record_set for record_set in record_sets if record_set.type == record_type]
-    return record_sets
+    if prefix is NOT_PROVIDED:
+        if record_type is NOT_PROVIDED:
+            return record_sets
+        return [record_set for record_set in record_sets if record_set.type == record_type]
+    if record_type is NOT_PROVIDED:
+        return [record_set for record_set in record_sets if record_set.prefix == prefix]
+    return [record_set for record_set in record_sets if record_set.prefix == prefix and record_set.type == record_type]
@@ -19,6 +19,7 @@ if sys.version_info >= (3, 6):
 
     if typing.TYPE_CHECKING:
         from .provider import ProviderInformation  # pragma: no cover
+        from .record_diff import RecordSetDiff  # pragma: no cover
         from .record_set import DNSRecordSet  # pragma: no cover
         from .zone_record_set_api import ZoneRecordSetAPI  # pragma: no cover
 
@@ -29,7 +30,7 @@ def bulk_apply_changes(
     options,  # TODO type
     zone_id,  # type: str
     record_sets_to_delete=None,  # type: list[DNSRecordSet] | None
-    record_sets_to_change=None,  # type: list[tuple[DNSRecordSet, bool, bool]] | None
+    record_sets_to_change=None,  # type: list[tuple[DNSRecordSet, bool | RecordSetDiff, bool]] | None
     record_sets_to_create=None,  # type: list[DNSRecordSet] | None
     stop_early_on_errors=True,  # type: bool
 ):  # type: (...) -> tuple[bool, list[tuple[typing.Literal["delete", "change", "create"], DNSRecordSet, DNSAPIError]], dict[str, list[DNSRecordSet]]]
@@ -43,7 +44,8 @@ def bulk_apply_changes(
     @param zone_id: Zone ID to apply changes to
     @param record_sets_to_delete: Optional list of DNS records to delete (DNSRecordSet)
     @param record_sets_to_change: Optional list of tuples (DNS records, value changed, TTL changed) to change
-                                  (tuple[DNSRecordSet, bool, bool])
+                                  (tuple[DNSRecordSet, bool | RecordSetDiff, bool]). Instead of a boolean,
+                                  value changed can be a RecordSetDiff.
     @param record_sets_to_create: Optional list of DNS records to create (DNSRecordSet)
     @param bulk_threshold: Minimum number of changes for using the bulk API instead of the regular API
     @param stop_early_on_errors: If set to ``True``, try to stop changes after the first error happens.
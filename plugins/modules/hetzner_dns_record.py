@@ -28,8 +28,10 @@ extends_documentation_fragment:
   - felixfontein.antsibull_nox_playground.hetzner.record_notes
   - felixfontein.antsibull_nox_playground.hetzner.record_type_choices
   - felixfontein.antsibull_nox_playground.hetzner.record_type_seealso
+  - felixfontein.antsibull_nox_playground.hetzner.wait
   - felixfontein.antsibull_nox_playground.hetzner.zone_id_type
   - felixfontein.antsibull_nox_playground.module_record
+  - felixfontein.antsibull_nox_playground.options.http_client
   - felixfontein.antsibull_nox_playground.options.record_transformation
   - felixfontein.antsibull_nox_playground.attributes
   - felixfontein.antsibull_nox_playground.attributes.actiongroup_hetzner
@@ -80,6 +82,26 @@ zone_id:
   type: str
   returned: success
   sample: 23
+
+action_ids:
+  description:
+    - The IDs of the actions started by the module.
+    - Pass them to M(felixfontein.antsibull_nox_playground.hetzner_dns_wait_for_actions) to wait for the changes to be applied.
+  type: list
+  elements: int
+  returned: when O(wait=false)
+  sample:
+    - 13
+    - 14
+  version_added: 3.6.0
+
+api_stats:
+  description:
+    - Statistics on the API requests sent by the module, aggregated by HTTP method and URL template.
+    - See O(collect_api_stats) for the contents.
+  type: dict
+  returned: when O(collect_api_stats=true)
+  version_added: 3.6.0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -91,6 +113,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     create_hetzner_api,
     create_hetzner_argument_spec,
     create_hetzner_provider_information,
+    create_hetzner_wait_argument_spec,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import ModuleHTTPHelper
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.module.record import (
@@ -103,11 +126,12 @@ def main():
     provider_information = create_hetzner_provider_information()
     argument_spec = create_hetzner_argument_spec()
     argument_spec.merge(create_module_argument_spec(provider_information=provider_information))
+    argument_spec.merge(create_hetzner_wait_argument_spec())
     module = AnsibleModule(supports_check_mode=True, **argument_spec.to_kwargs())
     option_provider = ModuleOptionProvider(module)
     run_module(
         module,
-        lambda: create_hetzner_api(option_provider, ModuleHTTPHelper(module)),
+        lambda: create_hetzner_api(option_provider, ModuleHTTPHelper(module), wait=module.params['wait']),
         provider_information=create_hetzner_provider_information(option_provider=option_provider),
     )
 
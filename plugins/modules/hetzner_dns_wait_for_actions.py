@@ -0,0 +1,195 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Felix Fontein
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+module: hetzner_dns_wait_for_actions
+
+short_description: Wait for changes in Hetzner DNS service to be applied
+
+version_added: 3.6.0
+
+description:
+  - Waits for actions started by the Hetzner DNS modules with O(felixfontein.antsibull_nox_playground.hetzner_dns_record_sets#module:wait=false)
+    to finish.
+  - The actions are polled together, no matter which zones and tasks they belong to.
+  - This module only works with the new API (O(hetzner_api_token)). The old API (O(hetzner_token)) applies all
+    changes immediately.
+extends_documentation_fragment:
+  - felixfontein.antsibull_nox_playground.hetzner
+  - felixfontein.antsibull_nox_playground.options.http_client
+  - felixfontein.antsibull_nox_playground.attributes
+  - felixfontein.antsibull_nox_playground.attributes.actiongroup_hetzner
+  - felixfontein.antsibull_nox_playground.attributes.info_module
+  - felixfontein.antsibull_nox_playground.attributes.idempotent_not_modify_state
+
+options:
+  action_ids:
+    description:
+      - The IDs of the actions to wait for.
+      - These are returned as RV(felixfontein.antsibull_nox_playground.hetzner_dns_record_sets#module:action_ids) by the
+        Hetzner DNS modules when O(felixfontein.antsibull_nox_playground.hetzner_dns_record_sets#module:wait=false).
+    type: list
+    elements: int
+    required: true
+  timeout:
+    description:
+      - The maximal number of seconds to wait for the actions.
+      - If not set, will wait indefinitely.
+    type: float
+
+author:
+  - Felix Fontein (@felixfontein)
+"""
+
+EXAMPLES = r"""
+- name: Update record sets of multiple zones without waiting
+  felixfontein.antsibull_nox_playground.hetzner_dns_record_sets:
+    zone_name: "{{ item.zone }}"
+    record_sets: "{{ item.record_sets }}"
+    wait: false
+    hetzner_api_token: access_token
+  loop: "{{ zones }}"
+  register: changes
+
+- name: Wait for all changes to be applied
+  felixfontein.antsibull_nox_playground.hetzner_dns_wait_for_actions:
+    action_ids: "{{ changes.results | map(attribute='action_ids') | flatten }}"
+    timeout: 300
+    hetzner_api_token: access_token
+"""
+
+RETURN = r"""
+actions:
+  description:
+    - The latest state of the actions, in the same order as O(action_ids).
+  type: list
+  elements: dict
+  returned: success or when waiting failed
+  contains:
+    id:
+      description: The ID of the action.
+      type: int
+    command:
+      description: The command of the action.
+      type: str
+      sample: set_records
+    status:
+      description:
+        - The status of the action.
+        - V(unknown) if the API did not return the action. This is treated as a failure.
+      type: str
+      sample: success
+    error:
+      description: The error, if the action failed.
+      type: dict
+  sample:
+    - id: 13
+      command: set_records
+      status: success
+      error: null
+
+api_stats:
+  description:
+    - Statistics on the API requests sent by the module, aggregated by HTTP method and URL template.
+    - See O(collect_api_stats) for the contents.
+  type: dict
+  returned: when O(collect_api_stats=true)
+"""
+
+import traceback
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_text
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.argspec import (
+    ArgumentSpec,
+    ModuleOptionProvider,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hetzner.api import (
+    _format_action_error,
+    create_hetzner_api,
+    create_hetzner_argument_spec,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import ModuleHTTPHelper
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.module._utils import get_api_stats_result
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
+    DNSAPIAuthenticationError,
+    DNSAPIError,
+)
+
+
+def _format_action(action):
+    return {
+        'id': action['id'],
+        'command': action.get('command'),
+        'status': action['status'],
+        'error': action.get('error'),
+    }
+
+
+def main():
+    argument_spec = create_hetzner_argument_spec()
+    argument_spec.merge(ArgumentSpec(
+        argument_spec={
+            'action_ids': {
+                'type': 'list',
+                'elements': 'int',
+                'required': True,
+            },
+            'timeout': {
+                'type': 'float',
+            },
+        },
+    ))
+    module = AnsibleModule(supports_check_mode=True, **argument_spec.to_kwargs())
+    option_provider = ModuleOptionProvider(module)
+    action_ids = module.params['action_ids']
+
+    api = None
+    try:
+        api = create_hetzner_api(option_provider, ModuleHTTPHelper(module))
+
+        if not hasattr(api, 'wait_for_actions'):
+            if action_ids:
+                module.fail_json(msg='The old API (hetzner_token) does not use actions. Use hetzner_api_token instead.')
+            module.exit_json(changed=False, actions=[], **get_api_stats_result(module, api))
+
+        actions = [_format_action(action) for action in api.wait_for_actions(action_ids, timeout=module.params['timeout'])]
+        errors = [action for action in actions if action['status'] in ('error', 'unknown')]
+        if errors:
+            error_messages = [_format_action_error(error) for error in errors]
+            module.fail_json(
+                msg='Error while waiting for actions: {0}'.format(", ".join((msg for msg in error_messages if msg)) or "unknown"),
+                actions=actions,
+                **get_api_stats_result(module, api)
+            )
+        running = [to_text(action['id']) for action in actions if action['status'] == 'running']
+        if running:
+            module.fail_json(
+                msg='Timeout while waiting for actions {0}'.format(', '.join(running)), actions=actions,
+                **get_api_stats_result(module, api)
+            )
+        module.exit_json(changed=False, actions=actions, **get_api_stats_result(module, api))
+    except DNSAPIAuthenticationError as e:
+        module.fail_json(
+            msg='Cannot authenticate: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
+    except DNSAPIError as e:
+        module.fail_json(
+            msg='Error: {0}'.format(e), error=to_text(e), exception=traceback.format_exc(),
+            **get_api_stats_result(module, api)
+        )
+
+
+if __name__ == '__main__':
+    main()
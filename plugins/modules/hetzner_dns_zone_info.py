@@ -23,6 +23,7 @@ extends_documentation_fragment:
   - felixfontein.antsibull_nox_playground.hetzner
   - felixfontein.antsibull_nox_playground.hetzner.zone_id_type
   - felixfontein.antsibull_nox_playground.module_zone_info
+  - felixfontein.antsibull_nox_playground.options.http_client
   - felixfontein.antsibull_nox_playground.attributes
   - felixfontein.antsibull_nox_playground.attributes.actiongroup_hetzner
   - felixfontein.antsibull_nox_playground.attributes.info_module
@@ -167,6 +168,14 @@ zone_info:
           description:
             - The TXT record's content.
           type: str
+
+api_stats:
+  description:
+    - Statistics on the API requests sent by the module, aggregated by HTTP method and URL template.
+    - See O(collect_api_stats) for the contents.
+  type: dict
+  returned: when O(collect_api_stats=true)
+  version_added: 3.6.0
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -31,6 +31,7 @@ extends_documentation_fragment:
   - felixfontein.antsibull_nox_playground.hosttech.record_type_seealso
   - felixfontein.antsibull_nox_playground.hosttech.zone_id_type
   - felixfontein.antsibull_nox_playground.module_record
+  - felixfontein.antsibull_nox_playground.options.http_client
   - felixfontein.antsibull_nox_playground.options.record_transformation
   - felixfontein.antsibull_nox_playground.attributes
   - felixfontein.antsibull_nox_playground.attributes.actiongroup_hosttech
@@ -71,6 +72,14 @@ zone_id:
   type: int
   returned: success
   sample: 23
+
+api_stats:
+  description:
+    - Statistics on the API requests sent by the module, aggregated by HTTP method and URL template.
+    - See O(collect_api_stats) for the contents.
+  type: dict
+  returned: when O(collect_api_stats=true)
+  version_added: 3.6.0
 """
 
 from ansible.module_utils.basic import AnsibleModule
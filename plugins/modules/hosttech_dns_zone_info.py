@@ -23,6 +23,7 @@ extends_documentation_fragment:
   - felixfontein.antsibull_nox_playground.hosttech
   - felixfontein.antsibull_nox_playground.hosttech.zone_id_type
   - felixfontein.antsibull_nox_playground.module_zone_info
+  - felixfontein.antsibull_nox_playground.options.http_client
   - felixfontein.antsibull_nox_playground.attributes
   - felixfontein.antsibull_nox_playground.attributes.actiongroup_hosttech
   - felixfontein.antsibull_nox_playground.attributes.info_module
@@ -150,6 +151,14 @@ zone_info:
       description:
         - The zone's TTL.
       type: int
+
+api_stats:
+  description:
+    - Statistics on the API requests sent by the module, aggregated by HTTP method and URL template.
+    - See O(collect_api_stats) for the contents.
+  type: dict
+  returned: when O(collect_api_stats=true)
+  version_added: 3.6.0
 """
 
 from ansible.module_utils.basic import AnsibleModule
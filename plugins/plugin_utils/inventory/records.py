@@ -75,6 +75,15 @@ class RecordsInventoryModule(BaseInventoryPlugin, metaclass=abc.ABCMeta):
 
         self.templar = Templar(loader=loader)
 
+        simple_filters = self.get_option("simple_filters")
+        filters = parse_filters(self.get_option("filters"))
+
+        filter_types = simple_filters.get("type") or ["A", "AAAA", "CNAME"]
+        if not isinstance(filter_types, Sequence) or isinstance(
+            filter_types, (str, bytes)
+        ):
+            filter_types = [filter_types]
+
         try:
             self.setup_api()
             assert self.provider_information is not None
@@ -116,7 +125,7 @@ class RecordsInventoryModule(BaseInventoryPlugin, metaclass=abc.ABCMeta):
                     raise AnsibleError("Zone does not exist")
 
                 zone = zone_with_records.zone
-                records = zone_with_records.records
+                records = zone_with_records.index.find_by_types(filter_types)
             else:
                 if zone_name is not None:
                     zone_with_record_sets = self.api.get_zone_with_record_sets_by_name(
@@ -136,11 +145,13 @@ class RecordsInventoryModule(BaseInventoryPlugin, metaclass=abc.ABCMeta):
 
                 zone = zone_with_record_sets.zone
                 records = []
-                for record_set in zone_with_record_sets.record_sets:
+                for record_set in zone_with_record_sets.index.find_by_types(
+                    filter_types
+                ):
                     records.extend(record_set.records)
 
-            record_converter.process_multiple_from_api(records)
-            record_converter.process_multiple_to_user(records)
+            # Only convert the records that can end up in the inventory
+            record_converter.process_multiple_from_api_to_user(records)
 
         except DNSConversionError as e:
             raise AnsibleError(f"Error while converting DNS values: {e.error_message}")
@@ -149,30 +160,20 @@ class RecordsInventoryModule(BaseInventoryPlugin, metaclass=abc.ABCMeta):
         except DNSAPIError as e:
             raise AnsibleError(f"Error: {e}")
 
-        simple_filters = self.get_option("simple_filters")
-        filters = parse_filters(self.get_option("filters"))
-
-        filter_types = simple_filters.get("type") or ["A", "AAAA", "CNAME"]
-        if not isinstance(filter_types, Sequence) or isinstance(
-            filter_types, (str, bytes)
-        ):
-            filter_types = [filter_types]
-
         if self.inventory is None:  # pragma: no cover
             raise AssertionError(  # pragma: no cover
                 "Inventory must not be None in parse()"
             )
         for record in records:
-            if record.type in filter_types:
-                name = zone.name
-                if record.prefix:
-                    name = f"{record.prefix}.{name}"
-                facts = {
-                    "ansible_host": make_unsafe(record.target),
-                }
-                if not filter_host(self, name, facts, filters):
-                    continue
-
-                self.inventory.add_host(name)
-                for key, value in facts.items():
-                    self.inventory.set_variable(name, key, value)
+            name = zone.name
+            if record.prefix:
+                name = f"{record.prefix}.{name}"
+            facts = {
+                "ansible_host": make_unsafe(record.target),
+            }
+            if not filter_host(self, name, facts, filters):
+                continue
+
+            self.inventory.add_host(name)
+            for key, value in facts.items():
+                self.inventory.set_variable(name, key, value)
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Benchmark for the DNS modules and inventory plugins of this collection.
+
+Runs the ``*_dns_record_info`` and ``*_dns_record_sets`` modules and the ``*_dns_records``
+inventory plugins in-process against the local stand-in server from ``provider_server``,
+for every provider and zone size, and reports the number of requests and the wall time.
+
+The collection must be located in an ``ansible_collections/felixfontein/antsibull_nox_playground``
+directory; collections it depends on are searched next to it and in the configured
+collection paths. Example::
+
+    python tests/benchmark/benchmark.py --sizes 10,1000,50000 --latency 0.02 --option http_concurrency=4
+
+The ``record_sets`` scenario keeps all existing record sets, changes the values of one
+percent of them, and adds the same number of new record sets.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+if __name__ == '__main__':
+    # Make this collection and the collections it depends on importable
+    from ansible import constants as C
+    from ansible.plugins.loader import init_plugin_loader
+
+    init_plugin_loader([os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', '..'))] + list(C.COLLECTIONS_PATHS))
+
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_bytes
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hetzner import (
+    api as hetzner_api,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hosttech import (
+    api as hosttech_api,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.tests.benchmark.provider_server import (
+    ProviderServer,
+    RedirectingHTTPHelper,
+    generate_records,
+)
+
+try:
+    from ansible.module_utils.testing import patch_module_args
+except ImportError:  # pragma: no cover
+    # ansible-core < 2.19
+    patch_module_args = None  # pragma: no cover
+
+
+COLLECTION = 'felixfontein.antsibull_nox_playground'
+
+ZONE_NAME = 'example.com'
+
+PROVIDERS = OrderedDict([
+    ('hetzner-old', {'plugin_prefix': 'hetzner', 'options': {'hetzner_token': 'benchmark'}}),
+    ('hetzner-new', {'plugin_prefix': 'hetzner', 'options': {'hetzner_api_token': 'benchmark'}}),
+    ('hosttech-json', {'plugin_prefix': 'hosttech', 'options': {'hosttech_token': 'benchmark'}}),
+    ('hosttech-wsdl', {'plugin_prefix': 'hosttech', 'options': {'hosttech_username': 'benchmark', 'hosttech_password': 'benchmark'}}),
+])
+
+SCENARIOS = ('record_info', 'inventory', 'record_sets')
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 50000)
+
+
+class _ModuleExit(Exception):
+    def __init__(self, result):
+        super(_ModuleExit, self).__init__()
+        self.result = result
+
+
+def _exit_json(self, **kwargs):
+    raise _ModuleExit(kwargs)
+
+
+def _fail_json(self, msg, **kwargs):
+    kwargs['failed'] = True
+    kwargs['msg'] = msg
+    raise _ModuleExit(kwargs)
+
+
+@contextmanager
+def _patch(obj, name, value):
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, original)
+
+
+@contextmanager
+def _module_args(args):
+    if patch_module_args is not None:
+        with patch_module_args(args):
+            yield
+        return
+    with _patch(basic, '_ANSIBLE_ARGS', to_bytes(json.dumps({'ANSIBLE_MODULE_ARGS': args}))):  # pragma: no cover
+        yield  # pragma: no cover
+
+
+@contextmanager
+def redirect_requests(url_map):
+    """
+    Send all requests of the Hetzner and Hosttech API clients to the given base URLs.
+    """
+    patches = []
+    for module in (hetzner_api, hosttech_api):
+        def create_http_helper(option_provider, http_helper, original=module.create_http_helper):
+            return RedirectingHTTPHelper(original(option_provider, http_helper), url_map)
+
+        patches.append((module, module.create_http_helper))
+        module.create_http_helper = create_http_helper
+    try:
+        yield
+    finally:
+        for module, original in patches:
+            module.create_http_helper = original
+
+
+def run_module(name, args):
+    """
+    Run a module of this collection in-process and return its result.
+    """
+    module = __import__('ansible_collections.felixfontein.antsibull_nox_playground.plugins.modules.{0}'.format(name), fromlist=['main'])
+    args = dict(args, _ansible_no_log=True)
+    with _module_args(args), _patch(basic.AnsibleModule, 'exit_json', _exit_json), _patch(basic.AnsibleModule, 'fail_json', _fail_json):
+        try:
+            module.main()
+        except _ModuleExit as exc:
+            return exc.result
+    raise AssertionError('Module {0} did not exit'.format(name))  # pragma: no cover
+
+
+def run_inventory(plugin_prefix, options, directory):
+    """
+    Parse an inventory source for an inventory plugin of this collection and return the
+    number of hosts.
+    """
+    from ansible import constants as C
+    from ansible.inventory.manager import InventoryManager
+    from ansible.parsing.dataloader import DataLoader
+
+    plugin = '{0}.{1}_dns_records'.format(COLLECTION, plugin_prefix)
+    path = os.path.join(directory, 'benchmark.{0}_dns.yaml'.format(plugin_prefix))
+    config = dict(options, plugin=plugin, zone_name=ZONE_NAME)
+    with open(path, 'w') as f:
+        # JSON is valid YAML
+        json.dump(config, f)
+    with _patch(C, 'INVENTORY_ENABLED', [plugin]), _patch(C, 'INVENTORY_ANY_UNPARSED_IS_FAILED', True):
+        manager = InventoryManager(loader=DataLoader(), sources=[path])
+    return len(manager.get_hosts())
+
+
+def create_record_sets_argument(count):
+    """
+    Return the ``record_sets`` option for a zone with ``count`` generated records that
+    changes one percent of the record sets and adds the same number of new ones.
+    """
+    record_sets = OrderedDict()
+    for prefix, record_type, target, ttl in generate_records(count):
+        record = '{0}.{1}'.format(prefix, ZONE_NAME) if prefix else ZONE_NAME
+        entry = record_sets.setdefault((record, record_type), {'record': record, 'type': record_type, 'ttl': ttl, 'value': []})
+        entry['value'].append(target)
+    result = list(record_sets.values())
+    changes = max(count // 100, 1)
+    changeable = [entry for entry in result if entry['type'] == 'A']
+    for index, entry in enumerate(changeable[:changes]):
+        entry['value'] = ['192.0.2.{0}'.format(index % 256)]
+    for index in range(changes):
+        result.append({'record': 'new{0}.{1}'.format(index, ZONE_NAME), 'type': 'A', 'ttl': 3600, 'value': ['198.51.100.{0}'.format(index % 256)]})
+    return result
+
+
+def run_scenario(provider, scenario, size, options, directory):
+    """
+    Run one scenario and return a short description of its outcome.
+    """
+    provider_options = dict(PROVIDERS[provider]['options'], **options)
+    plugin_prefix = PROVIDERS[provider]['plugin_prefix']
+    if scenario == 'record_info':
+        result = run_module('{0}_dns_record_info'.format(plugin_prefix), dict(provider_options, zone_name=ZONE_NAME, what='all_records'))
+        if result.get('failed'):
+            raise Exception(result['msg'])
+        return '{0} records'.format(len(result['records']))
+    if scenario == 'record_sets':
+        args = dict(provider_options, zone_name=ZONE_NAME, record_sets=create_record_sets_argument(size), prune=True)
+        result = run_module('{0}_dns_record_sets'.format(plugin_prefix), args)
+        if result.get('failed'):
+            raise Exception(result['msg'])
+        return 'changed' if result['changed'] else 'unchanged'
+    if scenario == 'inventory':
+        return '{0} hosts'.format(run_inventory(plugin_prefix, provider_options, directory))
+    raise ValueError('Unknown scenario {0}'.format(scenario))
+
+
+def run_benchmark(providers, scenarios, sizes, options, server_options, output=None):
+    """
+    Run all scenarios for all providers and zone sizes.
+
+    Every provider and zone size uses a new stand-in server, on which the scenarios are run
+    in the given order.
+
+    @return A list of dictionaries, one per run scenario.
+    """
+    results = []
+    directory = tempfile.mkdtemp(prefix='dns-benchmark-')
+    try:
+        for provider in providers:
+            for size in sizes:
+                with ProviderServer(**server_options) as server:
+                    server.populate(ZONE_NAME, size)
+                    with redirect_requests(server.get_url_map()):
+                        for scenario in scenarios:
+                            server.reset_stats()
+                            start = time.time()
+                            try:
+                                outcome = run_scenario(provider, scenario, size, options, directory)
+                            except Exception as exc:  # pylint: disable=broad-exception-caught
+                                outcome = 'error: {0}'.format(exc)
+                            result = OrderedDict([
+                                ('provider', provider),
+                                ('scenario', scenario),
+                                ('size', size),
+                                ('time', round(time.time() - start, 3)),
+                                ('outcome', outcome),
+                            ])
+                            result.update(server.get_stats())
+                            results.append(result)
+                            if output is not None:
+                                output(result)
+    finally:
+        shutil.rmtree(directory)
+    return results
+
+
+def format_result(result):
+    return '{provider:<14} {scenario:<12} {size:>7} {requests:>9} {rate_limited:>5} {max_in_flight:>6} {time:>9.3f}  {outcome}'.format(**result)
+
+
+def _parse_option(value):
+    name, sep, option_value = value.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError('Option must have the form NAME=VALUE')
+    try:
+        return name, json.loads(option_value)
+    except ValueError:
+        return name, option_value
+
+
+def _parse_list(choices):
+    def parse(value):
+        values = [entry.strip() for entry in value.split(',') if entry.strip()]
+        for entry in values:
+            if entry not in choices:
+                raise argparse.ArgumentTypeError('Unknown value {0!r}; choose from {1}'.format(entry, ', '.join(choices)))
+        return values
+
+    return parse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the DNS modules and inventory plugins against a local stand-in server.')
+    parser.add_argument('--providers', type=_parse_list(list(PROVIDERS)), default=list(PROVIDERS),
+                        help='Comma-separated list of providers (default: all)')
+    parser.add_argument('--scenarios', type=_parse_list(SCENARIOS), default=list(SCENARIOS),
+                        help='Comma-separated list of scenarios (default: all)')
+    parser.add_argument('--sizes', type=lambda value: [int(entry) for entry in value.split(',')], default=list(DEFAULT_SIZES),
+                        help='Comma-separated list of zone sizes (default: {0})'.format(','.join(str(size) for size in DEFAULT_SIZES)))
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds every request is delayed by the server')
+    parser.add_argument('--page-size', type=int, default=100, help='Maximal number of entries per page for the Hetzner APIs')
+    parser.add_argument('--rate-limit-every', type=int, default=0, metavar='N',
+                        help='Answer every N-th request to a JSON API with HTTP status 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After value of 429 responses')
+    parser.add_argument('--action-duration', type=float, default=0.0, help='Seconds Hetzner Cloud actions are reported as running')
+    parser.add_argument('--option', type=_parse_option, action='append', default=[], metavar='NAME=VALUE',
+                        help='Option passed to every module and inventory plugin, like http_concurrency=4; VALUE is parsed as JSON if possible')
+    parser.add_argument('--json', metavar='FILE', help='Also write the results including per-endpoint counts to this file')
+    args = parser.parse_args(argv)
+
+    server_options = {
+        'latency': args.latency,
+        'max_page_size': args.page_size,
+        'rate_limit_every': args.rate_limit_every,
+        'retry_after': args.retry_after,
+        'action_duration': args.action_duration,
+    }
+    print('{0:<14} {1:<12} {2:>7} {3:>9} {4:>5} {5:>6} {6:>9}  {7}'.format(
+        'provider', 'scenario', 'size', 'requests', '429s', 'max||', 'time [s]', 'outcome'))
+    results = run_benchmark(
+        args.providers, args.scenarios, args.sizes, dict(args.option), server_options,
+        output=lambda result: print(format_result(result)),
+    )
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'server': server_options, 'options': dict(args.option), 'results': results}, f, indent=2)
+    return 1 if any(result['outcome'].startswith('error:') for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
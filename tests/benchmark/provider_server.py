@@ -0,0 +1,1021 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+In-memory stand-in for the DNS provider APIs used by this collection.
+
+The server implements the parts of the Hetzner DNS API (``dns.hetzner.com``), the Hetzner
+Cloud DNS API (``api.hetzner.cloud``), and the Hosttech JSON and WSDL APIs that the
+collection uses. It can add latency to every request, limit the page size, and answer
+every n-th request with HTTP status 429, and counts the requests it receives.
+
+Use ``ProviderServer.get_url_map()`` together with ``RedirectingHTTPHelper`` to send the
+requests of the API clients to the server instead of the real APIs.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.api_stats import (
+    get_url_template,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import (
+    HTTPHelper,
+)
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, unquote, urlsplit
+except ImportError:
+    # Python 2.x fallback:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer  # type: ignore
+    from SocketServer import ThreadingMixIn  # type: ignore
+    from urllib import unquote  # type: ignore
+    from urlparse import parse_qs, urlsplit  # type: ignore
+
+try:
+    import lxml.etree
+
+    from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.wsdl import (
+        decode_wsdl,
+    )
+    HAS_LXML = True
+except ImportError:  # pragma: no cover
+    HAS_LXML = False  # pragma: no cover
+
+
+HETZNER_DNS_API = 'https://dns.hetzner.com/api/'
+HETZNER_CLOUD_API = 'https://api.hetzner.cloud/'
+HOSTTECH_JSON_API = 'https://api.ns1.hosttech.eu/api/'
+HOSTTECH_WSDL_API = 'https://ns1.hosttech.eu/public/api'
+
+_PATH_PREFIXES = OrderedDict([
+    (HETZNER_DNS_API, '/hetzner-dns/api/'),
+    (HETZNER_CLOUD_API, '/hetzner-cloud/'),
+    (HOSTTECH_JSON_API, '/hosttech/api/'),
+    (HOSTTECH_WSDL_API, '/hosttech/public/api'),
+])
+
+_NAMESPACE_ENVELOPE = 'http://schemas.xmlsoap.org/soap/envelope/'
+
+_TIMESTAMP = '2025-01-01T00:00:00Z'
+
+
+class RedirectingHTTPHelper(HTTPHelper):
+    """
+    HTTP helper which replaces the base URL of requests before passing them on.
+    """
+
+    def __init__(self, http_helper, url_map):
+        """
+        @param http_helper: The HTTP helper to pass the requests to
+        @param url_map: Maps base URLs to the base URLs they should be replaced with
+        """
+        self._http_helper = http_helper
+        # Try longer base URLs first
+        self._url_map = sorted(url_map.items(), key=lambda item: -len(item[0]))
+
+    def fetch_url(self, url, method='GET', headers=None, data=None, timeout=None):
+        for source, destination in self._url_map:
+            if url.startswith(source):
+                url = destination + url[len(source):]
+                break
+        return self._http_helper.fetch_url(url, method=method, headers=headers, data=data, timeout=timeout)
+
+
+class StandInRecord(object):
+    def __init__(self, record_id, prefix, record_type, target, ttl=None, comment=''):
+        self.id = record_id
+        self.prefix = prefix or None
+        self.type = record_type
+        self.target = target
+        self.ttl = ttl
+        self.comment = comment or ''
+
+
+class StandInZone(object):
+    def __init__(self, zone_id, name, ttl=3600):
+        self.id = zone_id
+        self.name = name
+        self.ttl = ttl
+        self.records = OrderedDict()
+        self._record_sets = None
+
+    def changed(self):
+        self._record_sets = None
+
+    def get_record_sets(self):
+        """
+        Return an ordered dictionary mapping (prefix, type) to the list of records.
+        """
+        if self._record_sets is None:
+            record_sets = OrderedDict()
+            for record in self.records.values():
+                record_sets.setdefault((record.prefix, record.type), []).append(record)
+            self._record_sets = record_sets
+        return self._record_sets
+
+
+class StandInBackend(object):
+    """
+    The zones of one provider.
+    """
+
+    def __init__(self, numeric_ids=False, first_id=1):
+        self._numeric_ids = numeric_ids
+        self._next_id = first_id
+        self.zones = OrderedDict()
+        self.record_zones = {}
+        self.actions = OrderedDict()
+
+    def next_id(self):
+        result = self._next_id
+        self._next_id += 1
+        return result if self._numeric_ids else str(result)
+
+    def add_zone(self, name, records=None, ttl=3600):
+        """
+        Add a zone with the given records.
+
+        @param name: The zone's name
+        @param records: A list of tuples ``(prefix, type, target, ttl)``
+        @return The new StandInZone.
+        """
+        zone = StandInZone(self.next_id(), name, ttl=ttl)
+        self.zones[zone.id] = zone
+        for prefix, record_type, target, record_ttl in records or []:
+            self.add_record(zone, prefix, record_type, target, record_ttl)
+        return zone
+
+    def find_zone(self, key):
+        for zone in self.zones.values():
+            if str(zone.id) == str(key) or zone.name == key:
+                return zone
+        return None
+
+    def add_record(self, zone, prefix, record_type, target, ttl=None, comment=''):
+        record = StandInRecord(self.next_id(), prefix, record_type, target, ttl=ttl, comment=comment)
+        zone.records[record.id] = record
+        self.record_zones[record.id] = zone
+        zone.changed()
+        return record
+
+    def find_record(self, record_id):
+        """
+        @return A tuple ``(zone, record)``, or ``(None, None)`` if the record does not exist.
+        """
+        if self._numeric_ids:
+            record_id = _to_int(record_id)
+        else:
+            record_id = str(record_id)
+        zone = self.record_zones.get(record_id)
+        if zone is None:
+            return None, None
+        return zone, zone.records[record_id]
+
+    def delete_record(self, zone, record):
+        del zone.records[record.id]
+        del self.record_zones[record.id]
+        zone.changed()
+
+    def replace_records(self, zone, records):
+        """
+        Replace all records of a zone.
+
+        @param records: A list of tuples ``(prefix, type, target, ttl)``
+        """
+        for record in list(zone.records.values()):
+            self.delete_record(zone, record)
+        for prefix, record_type, target, ttl in records:
+            self.add_record(zone, prefix, record_type, target, ttl)
+
+
+def generate_records(count):
+    """
+    Generate ``count`` records for a zone: up to three NS records for the apex,
+    and A and AAAA records with distinct prefixes.
+
+    @return A list of tuples ``(prefix, type, target, ttl)``.
+    """
+    result = [(None, 'NS', 'ns{0}.example.net'.format(index + 1), 3600) for index in range(min(count, 3))]
+    for index in range(count - len(result)):
+        if index % 4 == 3:
+            result.append(('host{0}'.format(index), 'AAAA', '2001:db8::{0:x}'.format(index + 1), 3600))
+        else:
+            result.append(('host{0}'.format(index), 'A', '10.{0}.{1}.{2}'.format(index // 65536 % 256, index // 256 % 256, index % 256), 3600))
+    return result
+
+
+class _Response(object):
+    def __init__(self, status, body=b'', content_type='application/json', headers=None):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers or {}
+
+
+def _json_response(status, data=None, headers=None):
+    if data is None:
+        return _Response(status, b'', content_type=None, headers=headers)
+    return _Response(status, json.dumps(data).encode('utf-8'), headers=headers)
+
+
+def _get_query_value(query, name, default=None):
+    values = query.get(name)
+    if not values:
+        return default
+    return values[0]
+
+
+def _to_int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _get_int(query, name, default):
+    return _to_int(_get_query_value(query, name, default), default)
+
+
+_ZONE_FILE_RECORD = re.compile(r'^(\S+)\s+(?:(\d+)\s+)?IN\s+(\S+)\s+(.*\S)\s*$')
+
+
+def _parse_zone_file(zone_name, text):
+    """
+    Parse the zone files created by the collection. ``$TTL`` applies to records without TTL.
+
+    @return A list of tuples ``(prefix, type, target, ttl)``.
+    @raise ValueError: If the zone file contains something unexpected
+    """
+    origin = zone_name + '.'
+    default_ttl = None
+    result = []
+    for line in text.splitlines():
+        if not line.strip() or line.startswith(';'):
+            continue
+        if line.startswith('$ORIGIN '):
+            origin = line.split()[1]
+            continue
+        if line.startswith('$TTL '):
+            default_ttl = int(line.split()[1])
+            continue
+        match = _ZONE_FILE_RECORD.match(line)
+        if match is None or origin != zone_name + '.':
+            raise ValueError('Cannot parse line {0!r}'.format(line))
+        owner, ttl, record_type, target = match.groups()
+        prefix = None if owner == '@' else owner
+        result.append((prefix, record_type, target, int(ttl) if ttl is not None else default_ttl))
+    return result
+
+
+def _get_pagination_meta(page, per_page, total_entries):
+    last_page = max((total_entries + per_page - 1) // per_page, 1)
+    return {
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'previous_page': page - 1 if page > 1 else None,
+            'next_page': page + 1 if page < last_page else None,
+            'last_page': last_page,
+            'total_entries': total_entries,
+        },
+    }
+
+
+#############################################################################################
+# Hetzner DNS API
+
+def _hetzner_dns_zone_to_json(zone):
+    return {
+        'id': zone.id,
+        'name': zone.name,
+        'ttl': zone.ttl,
+        'created': _TIMESTAMP,
+        'modified': _TIMESTAMP,
+        'legacy_dns_host': '',
+        'legacy_ns': [],
+        'ns': ['hydrogen.ns.hetzner.com', 'oxygen.ns.hetzner.com', 'helium.ns.hetzner.de'],
+        'owner': '',
+        'paused': False,
+        'permission': '',
+        'project': '',
+        'registrar': '',
+        'status': 'verified',
+        'verified': _TIMESTAMP,
+        'records_count': len(zone.records),
+        'is_secondary_dns': False,
+        'txt_verification': {'name': '', 'token': ''},
+    }
+
+
+def _hetzner_dns_record_to_json(zone, record):
+    result = {
+        'id': record.id,
+        'type': record.type,
+        'name': record.prefix or '@',
+        'value': record.target,
+        'zone_id': zone.id,
+        'created': _TIMESTAMP,
+        'modified': _TIMESTAMP,
+    }
+    if record.ttl is not None:
+        result['ttl'] = record.ttl
+    return result
+
+
+def _is_valid_record_data(data):
+    return bool(isinstance(data, dict) and data.get('type') and data.get('value') and data.get('name'))
+
+
+#############################################################################################
+# Hetzner Cloud DNS API
+
+def _hetzner_cloud_error(status, code, message):
+    return _json_response(status, {'error': {'code': code, 'message': message, 'details': {}}})
+
+
+def _hetzner_cloud_zone_to_json(zone):
+    return {
+        'id': zone.id,
+        'name': zone.name,
+        'mode': 'primary',
+        'ttl': zone.ttl,
+        'labels': {},
+        'primary_nameservers': [],
+        'created': _TIMESTAMP,
+        'protection': {'delete': False},
+        'status': 'ok',
+        'authoritative_nameservers': {
+            'assigned': ['hydrogen.ns.hetzner.com.', 'oxygen.ns.hetzner.com.', 'helium.ns.hetzner.de.'],
+            'delegated': ['hydrogen.ns.hetzner.com.', 'oxygen.ns.hetzner.com.', 'helium.ns.hetzner.de.'],
+            'delegation_last_check': _TIMESTAMP,
+            'delegation_status': 'valid',
+        },
+        'record_count': len(zone.records),
+        'registrar': 'other',
+    }
+
+
+def _hetzner_cloud_rrset_to_json(zone, prefix, record_type, records):
+    name = prefix or '@'
+    return {
+        'id': '{0}/{1}'.format(name, record_type),
+        'name': name,
+        'type': record_type,
+        'ttl': records[0].ttl if records else None,
+        'labels': {},
+        'protection': {'change': False},
+        'records': [{'value': record.target, 'comment': record.comment} for record in records],
+        'zone': zone.id,
+    }
+
+
+#############################################################################################
+# Hosttech JSON API
+
+_HOSTTECH_TARGET_FIELDS = {
+    'A': 'ipv4',
+    'AAAA': 'ipv6',
+    'CNAME': 'cname',
+    'TXT': 'text',
+    'TLSA': 'text',
+}
+
+
+def _hosttech_record_to_json(record):
+    result = {
+        'id': record.id,
+        'type': record.type,
+        'ttl': record.ttl,
+        'comment': record.comment,
+    }
+    if record.type in _HOSTTECH_TARGET_FIELDS:
+        result['name'] = record.prefix or ''
+        result[_HOSTTECH_TARGET_FIELDS[record.type]] = record.target
+    elif record.type == 'NS':
+        result['ownername'] = record.prefix or ''
+        result['targetname'] = record.target
+    elif record.type == 'MX':
+        pref, name = record.target.split(' ', 1)
+        result['ownername'] = record.prefix or ''
+        result['name'] = name
+        result['pref'] = int(pref)
+    else:
+        raise ValueError('Record type {0} is not supported by the stand-in'.format(record.type))
+    return result
+
+
+def _hosttech_record_from_json(data):
+    record_type = data['type']
+    if record_type in _HOSTTECH_TARGET_FIELDS:
+        return data.get('name'), record_type, data[_HOSTTECH_TARGET_FIELDS[record_type]]
+    if record_type == 'NS':
+        return data.get('ownername'), record_type, data['targetname']
+    if record_type == 'MX':
+        return data.get('ownername'), record_type, '{0} {1}'.format(data['pref'], data['name'])
+    raise ValueError('Record type {0} is not supported by the stand-in'.format(record_type))
+
+
+def _hosttech_zone_to_json(zone, with_records=True):
+    result = {
+        'id': zone.id,
+        'user': 23,
+        'name': zone.name,
+        'email': 'dns@example.com',
+        'ttl': zone.ttl,
+        'nameserver': 'ns1.example.net',
+        'dnssec': False,
+        'dnssec_email': None,
+        'ds_records': [],
+    }
+    if with_records:
+        result['records'] = [_hosttech_record_to_json(record) for record in zone.records.values()]
+    return result
+
+
+#############################################################################################
+# Hosttech WSDL API
+
+def _encode_wsdl_value(tag, value):
+    if value is None:
+        return '<{0} xsi:nil="true"/>'.format(tag)
+    if isinstance(value, bool):
+        return '<{0} xsi:type="xsd:boolean">{1}</{0}>'.format(tag, 'true' if value else 'false')
+    if isinstance(value, int):
+        return '<{0} xsi:type="xsd:int">{1}</{0}>'.format(tag, value)
+    if isinstance(value, dict):
+        items = [
+            '<item>{0}{1}</item>'.format(_encode_wsdl_value('key', key), _encode_wsdl_value('value', val))
+            for key, val in value.items()
+        ]
+        return '<{0} xsi:type="ns2:Map">{1}</{0}>'.format(tag, ''.join(items))
+    if isinstance(value, list):
+        items = [_encode_wsdl_value('item', val) for val in value]
+        return '<{0} SOAP-ENC:arrayType="ns2:Map[{1}]" xsi:type="SOAP-ENC:Array">{2}</{0}>'.format(tag, len(value), ''.join(items))
+    return '<{0} xsi:type="xsd:string">{1}</{0}>'.format(tag, escape(str(value)))
+
+
+def _wsdl_envelope(body):
+    return ''.join([
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/"',
+        ' xmlns:ns1="{0}"'.format(HOSTTECH_WSDL_API),
+        ' xmlns:xsd="http://www.w3.org/2001/XMLSchema"',
+        ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"',
+        ' xmlns:ns2="http://xml.apache.org/xml-soap"',
+        ' xmlns:SOAP-ENC="http://schemas.xmlsoap.org/soap/encoding/"',
+        ' SOAP-ENV:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/">',
+        '<SOAP-ENV:Header><ns1:authenticateResponse><return xsi:type="xsd:boolean">true</return></ns1:authenticateResponse></SOAP-ENV:Header>',
+        body,
+        '</SOAP-ENV:Envelope>',
+    ]).encode('utf-8')
+
+
+def _wsdl_response(command, value):
+    body = '<SOAP-ENV:Body><ns1:{0}Response>{1}</ns1:{0}Response></SOAP-ENV:Body>'.format(command, _encode_wsdl_value('return', value))
+    return _Response(200, _wsdl_envelope(body), content_type='text/xml; charset=utf-8')
+
+
+def _wsdl_fault(message):
+    body = '<SOAP-ENV:Fault><faultstring>{0}</faultstring></SOAP-ENV:Fault>'.format(escape(message))
+    return _Response(500, _wsdl_envelope(body), content_type='text/xml; charset=utf-8')
+
+
+def _wsdl_record_to_value(zone, record):
+    priority = None
+    target = record.target
+    if record.type in ('MX', 'PTR'):
+        priority, target = target.split(' ', 1)
+        priority = int(priority)
+    return OrderedDict([
+        ('id', record.id),
+        ('zone', zone.id),
+        ('type', record.type),
+        ('prefix', record.prefix or ''),
+        ('target', target),
+        ('ttl', record.ttl),
+        ('comment', record.comment or None),
+        ('priority', priority),
+    ])
+
+
+def _wsdl_zone_to_value(zone):
+    return OrderedDict([
+        ('id', zone.id),
+        ('user', 23),
+        ('name', zone.name),
+        ('email', 'dns@example.com'),
+        ('ttl', zone.ttl),
+        ('nameserver', 'ns1.example.net'),
+        ('serial', '12345'),
+        ('serialLastUpdate', 0),
+        ('refresh', 7200),
+        ('retry', 120),
+        ('expire', 1234567),
+        ('template', None),
+        ('ns3', 1),
+        ('records', [_wsdl_record_to_value(zone, record) for record in zone.records.values()]),
+    ])
+
+
+def _wsdl_record_from_value(value):
+    target = value.get('target')
+    if value.get('type') in ('MX', 'PTR'):
+        target = '{0} {1}'.format(value.get('priority'), target)
+    return value.get('prefix'), value.get('type'), target, value.get('ttl'), value.get('comment') or ''
+
+
+#############################################################################################
+# Server
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        response = self.server.provider_server.handle(self.command, self.path, self.headers, body)
+        self.send_response(response.status)
+        if response.content_type:
+            self.send_header('Content-Type', response.content_type)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(response.body)))
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ProviderServer(object):
+    """
+    Local HTTP server which serves all supported provider APIs from memory.
+
+    The zones of every provider are stored in ``hetzner_dns``, ``hetzner_cloud`` and
+    ``hosttech`` (StandInBackend instances); the Hosttech JSON and WSDL APIs share their
+    data. Request statistics are available with ``get_stats()``.
+    """
+
+    def __init__(self, latency=0.0, max_page_size=100, rate_limit_every=0, retry_after=1, action_duration=0.0):
+        """
+        @param latency: Number of seconds every request is delayed
+        @param max_page_size: The maximal number of entries the Hetzner APIs return per page
+        @param rate_limit_every: If positive, every n-th request to a JSON API is answered with HTTP status 429
+        @param retry_after: The value of the Retry-After header of 429 responses
+        @param action_duration: Number of seconds Hetzner Cloud actions are reported as running
+        """
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.action_duration = action_duration
+        self.hetzner_dns = StandInBackend()
+        self.hetzner_cloud = StandInBackend(numeric_ids=True)
+        self.hosttech = StandInBackend(numeric_ids=True)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.reset_stats()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), _RequestHandler)
+        self._server.provider_server = self
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05})
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return 'http://{0}:{1}'.format(host, port)
+
+    def get_url_map(self):
+        """
+        Return a dictionary mapping the base URLs of the real APIs to the ones of this server.
+        """
+        return dict((api, self.url + prefix) for api, prefix in _PATH_PREFIXES.items())
+
+    def populate(self, zone_name, count):
+        """
+        Create a zone with ``count`` generated records for every provider.
+        """
+        records = generate_records(count)
+        with self._lock:
+            for backend in (self.hetzner_dns, self.hetzner_cloud, self.hosttech):
+                backend.add_zone(zone_name, records)
+
+    def remove_zone(self, zone_name):
+        """
+        Remove the zone with the given name for every provider.
+        """
+        with self._lock:
+            for backend in (self.hetzner_dns, self.hetzner_cloud, self.hosttech):
+                for zone in list(backend.zones.values()):
+                    if zone.name == zone_name:
+                        del backend.zones[zone.id]
+
+    def reset_stats(self):
+        with self._lock:
+            self._requests = 0
+            self._in_flight = 0
+            self._max_in_flight = 0
+            self._rate_limited = 0
+            self._endpoints = OrderedDict()
+
+    def get_stats(self):
+        """
+        Return the number of requests per endpoint and status, the number of requests
+        answered with 429, and the maximal number of requests handled at the same time.
+        """
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'rate_limited': self._rate_limited,
+                'max_in_flight': self._max_in_flight,
+                'endpoints': [
+                    {'method': method, 'url': url, 'statuses': dict(statuses), 'requests': sum(statuses.values())}
+                    for (method, url), statuses in self._endpoints.items()
+                ],
+            }
+
+    def handle(self, method, path, headers, body):
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            inject_429 = self.rate_limit_every > 0 and self._requests % self.rate_limit_every == 0
+        try:
+            if self.latency > 0:
+                time.sleep(self.latency)
+            endpoint, response = self._dispatch(method, path, headers, body, inject_429)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        with self._lock:
+            statuses = self._endpoints.setdefault((method, endpoint), {})
+            statuses[str(response.status)] = statuses.get(str(response.status), 0) + 1
+            if response.status == 429:
+                self._rate_limited += 1
+        return response
+
+    def _dispatch(self, method, path, headers, body, inject_429):
+        parts = urlsplit(path)
+        query = parse_qs(parts.query, keep_blank_values=True)
+        for api, prefix in _PATH_PREFIXES.items():
+            if not parts.path.startswith(prefix):
+                continue
+            # Group the requests by the endpoint of the real API
+            real_url = urlsplit(api + parts.path[len(prefix):])
+            endpoint = real_url.netloc + get_url_template(real_url.path)
+            if api == HOSTTECH_WSDL_API:
+                return self._handle_hosttech_wsdl(endpoint, body)
+            if inject_429:
+                return endpoint, self._rate_limit_response(api)
+            segments = [unquote(segment) for segment in parts.path[len(prefix):].split('/')]
+            if (headers.get('Content-Type') or '').startswith('text/plain'):
+                data = body.decode('utf-8')
+            else:
+                data = json.loads(body.decode('utf-8')) if body else None
+            with self._lock:
+                if api == HETZNER_DNS_API:
+                    response = self._handle_hetzner_dns(method, segments, query, headers, data)
+                elif api == HETZNER_CLOUD_API:
+                    response = self._handle_hetzner_cloud(method, segments, query, headers, data)
+                else:
+                    response = self._handle_hosttech_json(method, segments, query, headers, data)
+            return endpoint, response
+        return parts.path, _json_response(404, {'message': 'Unknown API'})
+
+    def _rate_limit_response(self, api):
+        headers = {'Retry-After': str(self.retry_after)}
+        if api == HETZNER_CLOUD_API:
+            response = _hetzner_cloud_error(429, 'rate_limit_exceeded', 'limit of 3600 requests per hour reached')
+            response.headers = headers
+            return response
+        return _json_response(429, {'message': 'Too Many Attempts.'}, headers=headers)
+
+    def _paginate(self, entries, query):
+        per_page = min(max(_get_int(query, 'per_page', 100), 1), self.max_page_size)
+        page = max(_get_int(query, 'page', 1), 1)
+        return entries[(page - 1) * per_page:page * per_page], _get_pagination_meta(page, per_page, len(entries))
+
+    def _handle_hetzner_dns(self, method, segments, query, headers, data):
+        if not headers.get('Auth-API-Token'):
+            return _json_response(401, {'message': 'Invalid authentication credentials'})
+        backend = self.hetzner_dns
+        if segments[:2] == ['v1', 'zones'] and method == 'GET':
+            if len(segments) == 2:
+                name = _get_query_value(query, 'name')
+                zones = [_hetzner_dns_zone_to_json(zone) for zone in backend.zones.values() if name is None or zone.name == name]
+                return _json_response(200 if zones else 404, {'zones': zones, 'meta': _get_pagination_meta(1, 100, len(zones))})
+            zone = backend.zones.get(segments[2])
+            if zone is None:
+                return _json_response(404, {'error': {'message': 'zone not found', 'code': 404}})
+            return _json_response(200, {'zone': _hetzner_dns_zone_to_json(zone)})
+        if segments[:2] == ['v1', 'zones'] and segments[3:] == ['import'] and method == 'POST':
+            zone = backend.zones.get(segments[2])
+            if zone is None:
+                return _json_response(404, {'error': {'message': 'zone not found', 'code': 404}})
+            try:
+                backend.replace_records(zone, _parse_zone_file(zone.name, data or ''))
+            except ValueError as exc:
+                return _json_response(422, {'error': {'message': str(exc), 'code': 422}})
+            return _json_response(200, {'zone': _hetzner_dns_zone_to_json(zone)})
+        if segments[:2] != ['v1', 'records']:
+            return _json_response(404, {'error': {'message': 'not found', 'code': 404}})
+        if len(segments) == 2 and method == 'GET':
+            zone = backend.zones.get(_get_query_value(query, 'zone_id'))
+            if zone is None:
+                return _json_response(404, {'error': {'message': 'zone not found', 'code': 404}})
+            records, meta = self._paginate(list(zone.records.values()), query)
+            return _json_response(200, {'records': [_hetzner_dns_record_to_json(zone, record) for record in records], 'meta': meta})
+        if len(segments) == 2 and method == 'POST':
+            zone = backend.zones.get(data.get('zone_id'))
+            if zone is None or not _is_valid_record_data(data):
+                return _json_response(422, {'error': {'message': 'invalid record', 'code': 422}})
+            record = backend.add_record(zone, data['name'] if data['name'] != '@' else None, data['type'], data['value'], data.get('ttl'))
+            return _json_response(200, {'record': _hetzner_dns_record_to_json(zone, record)})
+        if segments[2:] == ['bulk'] and method == 'POST':
+            invalid = [entry for entry in data['records'] if not _is_valid_record_data(entry) or entry.get('zone_id') not in backend.zones]
+            if invalid:
+                valid = [entry for entry in data['records'] if entry not in invalid]
+                return _json_response(422, {'records': [], 'valid_records': valid, 'invalid_records': invalid})
+            created = []
+            for entry in data['records']:
+                zone = backend.zones[entry['zone_id']]
+                record = backend.add_record(zone, entry['name'] if entry['name'] != '@' else None, entry['type'], entry['value'], entry.get('ttl'))
+                created.append(_hetzner_dns_record_to_json(zone, record))
+            return _json_response(200, {'records': created, 'valid_records': [], 'invalid_records': []})
+        if segments[2:] == ['bulk'] and method == 'PUT':
+            updated = []
+            failed = []
+            for entry in data['records']:
+                zone, record = backend.find_record(entry.get('id'))
+                if record is None or not _is_valid_record_data(entry):
+                    failed.append(entry)
+                    continue
+                self._update_hetzner_dns_record(zone, record, entry)
+                updated.append(_hetzner_dns_record_to_json(zone, record))
+            return _json_response(200, {'records': updated, 'failed_records': failed})
+        if len(segments) != 3:
+            return _json_response(404, {'error': {'message': 'not found', 'code': 404}})
+        zone, record = backend.find_record(segments[2])
+        if record is None:
+            return _json_response(404, {'error': {'message': 'record not found', 'code': 404}})
+        if method == 'GET':
+            return _json_response(200, {'record': _hetzner_dns_record_to_json(zone, record)})
+        if method == 'PUT':
+            if not _is_valid_record_data(data):
+                return _json_response(422, {'error': {'message': 'invalid record', 'code': 422}})
+            self._update_hetzner_dns_record(zone, record, data)
+            return _json_response(200, {'record': _hetzner_dns_record_to_json(zone, record)})
+        if method == 'DELETE':
+            backend.delete_record(zone, record)
+            return _json_response(200, {})
+        return _json_response(405, {'error': {'message': 'method not allowed', 'code': 405}})
+
+    @staticmethod
+    def _update_hetzner_dns_record(zone, record, data):
+        record.prefix = data['name'] if data['name'] != '@' else None
+        record.type = data['type']
+        record.target = data['value']
+        record.ttl = data.get('ttl')
+        zone.changed()
+
+    def _create_action(self, command, zone):
+        backend = self.hetzner_cloud
+        action_id = backend.next_id()
+        backend.actions[action_id] = {
+            'id': action_id,
+            'command': command,
+            'started': time.time(),
+            'resources': [{'id': zone.id, 'type': 'zone'}],
+        }
+        return self._action_to_json(backend.actions[action_id])
+
+    def _action_to_json(self, action):
+        running = time.time() < action['started'] + self.action_duration
+        return {
+            'id': action['id'],
+            'command': action['command'],
+            'status': 'running' if running else 'success',
+            'progress': 0 if running else 100,
+            'started': _TIMESTAMP,
+            'finished': None if running else _TIMESTAMP,
+            'resources': action['resources'],
+            'error': None,
+        }
+
+    def _handle_hetzner_cloud(self, method, segments, query, headers, data):
+        if not (headers.get('Authorization') or '').startswith('Bearer '):
+            return _hetzner_cloud_error(401, 'unauthorized', 'unable to authenticate')
+        backend = self.hetzner_cloud
+        if segments[:2] == ['v1', 'actions'] and method == 'GET':
+            if len(segments) == 3:
+                action = backend.actions.get(_to_int(segments[2]))
+                if action is None:
+                    return _hetzner_cloud_error(404, 'not_found', 'action not found')
+                return _json_response(200, {'action': self._action_to_json(action)})
+            actions = [
+                self._action_to_json(backend.actions[action_id])
+                for action_id in (_to_int(value) for value in query.get('id', []))
+                if action_id in backend.actions
+            ]
+            return _json_response(200, {'actions': actions, 'meta': _get_pagination_meta(1, max(len(actions), 1), len(actions))})
+        if segments[:2] != ['v1', 'zones'] or len(segments) < 3:
+            return _hetzner_cloud_error(404, 'not_found', 'not found')
+        zone = backend.find_zone(segments[2])
+        if zone is None:
+            return _hetzner_cloud_error(404, 'not_found', 'zone not found')
+        if len(segments) == 3 and method == 'GET':
+            return _json_response(200, {'zone': _hetzner_cloud_zone_to_json(zone)})
+        if segments[3:] == ['actions', 'import_zonefile'] and method == 'POST':
+            try:
+                records = _parse_zone_file(zone.name, data['zonefile'])
+            except ValueError as exc:
+                return _hetzner_cloud_error(422, 'invalid_input', str(exc))
+            backend.replace_records(zone, records)
+            return _json_response(201, {'action': self._create_action('import_zonefile', zone)})
+        if segments[3:4] != ['rrsets']:
+            return _hetzner_cloud_error(404, 'not_found', 'not found')
+        record_sets = zone.get_record_sets()
+        if len(segments) == 4 and method == 'GET':
+            name = _get_query_value(query, 'name')
+            record_type = _get_query_value(query, 'type')
+            rrsets = [
+                (prefix, rrset_type, records)
+                for (prefix, rrset_type), records in record_sets.items()
+                if (name is None or (prefix or '@') == name) and (record_type is None or rrset_type == record_type)
+            ]
+            rrsets, meta = self._paginate(rrsets, query)
+            return _json_response(200, {
+                'rrsets': [_hetzner_cloud_rrset_to_json(zone, prefix, rrset_type, records) for prefix, rrset_type, records in rrsets],
+                'meta': meta,
+            })
+        if len(segments) == 4 and method == 'POST':
+            prefix = data['name'] if data['name'] != '@' else None
+            if (prefix, data['type']) in record_sets:
+                return _hetzner_cloud_error(409, 'uniqueness_error', 'rrset already exists')
+            records = [
+                backend.add_record(zone, prefix, data['type'], entry['value'], data.get('ttl'), entry.get('comment') or '')
+                for entry in data['records']
+            ]
+            action = self._create_action('create_rrset', zone)
+            return _json_response(201, {'rrset': _hetzner_cloud_rrset_to_json(zone, prefix, data['type'], records), 'action': action})
+        if len(segments) < 6:
+            return _hetzner_cloud_error(404, 'not_found', 'not found')
+        prefix = segments[4] if segments[4] != '@' else None
+        record_type = segments[5]
+        records = list(record_sets.get((prefix, record_type), []))
+        if not records and not (len(segments) == 8 and segments[7] in ('set_records', 'add_records')):
+            return _hetzner_cloud_error(404, 'not_found', 'rrset not found')
+        if len(segments) == 6 and method == 'GET':
+            return _json_response(200, {'rrset': _hetzner_cloud_rrset_to_json(zone, prefix, record_type, records)})
+        if len(segments) == 6 and method == 'DELETE':
+            for record in records:
+                backend.delete_record(zone, record)
+            return _json_response(201, {'action': self._create_action('delete_rrset', zone)})
+        if len(segments) != 8 or segments[6] != 'actions' or method != 'POST':
+            return _hetzner_cloud_error(404, 'not_found', 'not found')
+        command = segments[7]
+        ttl = records[0].ttl if records else None
+        if command == 'change_ttl':
+            for record in records:
+                record.ttl = data.get('ttl')
+            zone.changed()
+        elif command == 'set_records':
+            for record in records:
+                backend.delete_record(zone, record)
+            for entry in data['records']:
+                backend.add_record(zone, prefix, record_type, entry['value'], ttl, entry.get('comment') or '')
+        elif command == 'add_records':
+            ttl = data.get('ttl', ttl)
+            for entry in data['records']:
+                backend.add_record(zone, prefix, record_type, entry['value'], ttl, entry.get('comment') or '')
+        elif command == 'remove_records':
+            values = [entry['value'] for entry in data['records']]
+            for record in records:
+                if record.target in values:
+                    values.remove(record.target)
+                    backend.delete_record(zone, record)
+        else:
+            return _hetzner_cloud_error(404, 'not_found', 'unknown action')
+        return _json_response(201, {'action': self._create_action(command, zone)})
+
+    def _handle_hosttech_json(self, method, segments, query, headers, data):
+        if not (headers.get('Authorization') or '').startswith('Bearer '):
+            return _json_response(401, {'message': 'Unauthenticated.'})
+        backend = self.hosttech
+        if segments[:3] != ['user', 'v1', 'zones']:
+            return _json_response(404, {'message': 'Not found.'})
+        if len(segments) == 3 and method == 'GET':
+            name = _get_query_value(query, 'query')
+            zones = [_hosttech_zone_to_json(zone, with_records=False) for zone in backend.zones.values() if not name or name in zone.name]
+            offset = _get_int(query, 'offset', 0)
+            limit = _get_int(query, 'limit', 100)
+            return _json_response(200, {'data': zones[offset:offset + limit]})
+        zone = backend.find_zone(segments[3])
+        if zone is None:
+            return _json_response(404, {'message': 'Not found.'})
+        if len(segments) == 4 and method == 'GET':
+            return _json_response(200, {'data': _hosttech_zone_to_json(zone)})
+        if segments[4:5] != ['records']:
+            return _json_response(404, {'message': 'Not found.'})
+        if len(segments) == 5 and method == 'GET':
+            record_type = _get_query_value(query, 'type')
+            records = [record for record in zone.records.values() if record_type is None or record.type == record_type]
+            return _json_response(200, {'data': [_hosttech_record_to_json(record) for record in records]})
+        if len(segments) == 5 and method == 'POST':
+            prefix, record_type, target = _hosttech_record_from_json(data)
+            record = backend.add_record(zone, prefix, record_type, target, data.get('ttl'), data.get('comment') or '')
+            return _json_response(201, {'data': _hosttech_record_to_json(record)})
+        record = zone.records.get(_to_int(segments[5])) if len(segments) == 6 else None
+        if record is None:
+            return _json_response(404, {'message': 'Not found.'})
+        if method == 'PUT':
+            prefix, record_type, target = _hosttech_record_from_json(dict(data, type=record.type))
+            record.prefix = prefix or None
+            record.target = target
+            record.ttl = data.get('ttl')
+            record.comment = data.get('comment') or ''
+            zone.changed()
+            return _json_response(200, {'data': _hosttech_record_to_json(record)})
+        if method == 'DELETE':
+            backend.delete_record(zone, record)
+            return _json_response(204)
+        return _json_response(405, {'message': 'Method not allowed.'})
+
+    def _handle_hosttech_wsdl(self, endpoint, body):
+        if not HAS_LXML:  # pragma: no cover
+            return endpoint, _wsdl_fault('lxml is needed for the WSDL stand-in')  # pragma: no cover
+        root = lxml.etree.fromstring(body)
+        command = None
+        args = {}
+        for body_node in root.iter(lxml.etree.QName(_NAMESPACE_ENVELOPE, 'Body').text):
+            for command_node in body_node:
+                command = lxml.etree.QName(command_node.tag).localname
+                for arg in command_node:
+                    args[arg.tag] = decode_wsdl(arg, HOSTTECH_WSDL_API, {})
+        endpoint = '{0}#{1}'.format(endpoint, command or '')
+        backend = self.hosttech
+        with self._lock:
+            if command == 'getZone':
+                zone = backend.find_zone(args.get('sZoneName'))
+                if zone is None:
+                    return endpoint, _wsdl_fault('zone not found')
+                return endpoint, _wsdl_response(command, _wsdl_zone_to_value(zone))
+            if command == 'addRecord':
+                zone = backend.find_zone(args.get('search'))
+                if zone is None:
+                    return endpoint, _wsdl_fault('zone not found')
+                prefix, record_type, target, ttl, comment = _wsdl_record_from_value(args['recorddata'])
+                record = backend.add_record(zone, prefix, record_type, target, ttl, comment)
+                return endpoint, _wsdl_response(command, _wsdl_record_to_value(zone, record))
+            if command in ('updateRecord', 'deleteRecord'):
+                zone, record = backend.find_record(args.get('recordId'))
+                if record is None:
+                    return endpoint, _wsdl_fault('record not found')
+                if command == 'deleteRecord':
+                    backend.delete_record(zone, record)
+                    return endpoint, _wsdl_response(command, True)
+                record.prefix, dummy, record.target, record.ttl, record.comment = _wsdl_record_from_value(
+                    dict(args['recorddata'], type=record.type))
+                record.prefix = record.prefix or None
+                zone.changed()
+                return endpoint, _wsdl_response(command, _wsdl_record_to_value(zone, record))
+        return endpoint, _wsdl_fault('unknown command {0}'.format(command))
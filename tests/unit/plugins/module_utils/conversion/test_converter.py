@@ -16,6 +16,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.conversion.converter import (
     RecordConverter,
+    _memoize,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import DNSRecord
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_set import (
@@ -266,3 +267,90 @@ def test_api_encoded_no_octal():
     assert records[0].target == u'"xyz \\\\ö\\""'
     converter.process_multiple_to_api([record])
     assert record.target == u'"xyz \\\\ö\\""'
+
+
+def test_memoize():
+    calls = []
+
+    def func(value):
+        calls.append(value)
+        return value * 2
+
+    memoized = _memoize(func, max_size=2)
+    assert memoized(1) == 2
+    assert memoized(1) == 2
+    assert calls == [1]
+    assert memoized(2) == 4
+    assert calls == [1, 2]
+    # Cache is full, so it is flushed before storing the next result
+    assert memoized(3) == 6
+    assert memoized(3) == 6
+    assert memoized(1) == 2
+    assert calls == [1, 2, 3, 1]
+
+
+def test_batch_processing():
+    converter = RecordConverter(
+        CustomProviderInformation(txt_record_handling='encoded', txt_character_encoding='decimal'),
+        CustomProvideOptions({'txt_transformation': 'quoted', 'txt_character_encoding': 'decimal'}))
+    records = []
+    for index in range(10):
+        record = DNSRecord()
+        record.type = 'TXT' if index % 2 == 0 else 'A'
+        record.target = u'"a b" c' if index % 2 == 0 else b'1.2.3.4'
+        records.append(record)
+
+    converter.process_multiple_from_api(records)
+    assert [record.target for record in records] == [u'a bc', u'1.2.3.4'] * 5
+    converter.process_multiple_to_user(records)
+    assert [record.target for record in records] == [u'"a bc"', u'1.2.3.4'] * 5
+
+    assert converter.process_values_to_user('A', [u'1.2.3.4']) == [u'1.2.3.4']
+    assert converter.process_values_from_user('TXT', [u'"a b" c', u'"a b" c']) == [u'a bc', u'a bc']
+
+    record = DNSRecord()
+    record.type = 'TXT'
+    record.target = u'"a'
+    with pytest.raises(DNSConversionError) as exc:
+        converter.process_multiple_from_api(records + [record])
+    assert exc.value.error_message == (
+        u'While processing record from API: Missing double quotation mark at the end of value'
+    )
+    with pytest.raises(DNSConversionError) as exc:
+        converter.process_values_from_user('TXT', [u'"a'])
+    assert exc.value.error_message == (
+        u'While processing record from the user: Missing double quotation mark at the end of value'
+    )
+
+
+@pytest.mark.parametrize('txt_transformation, expected', [
+    ('api', u'"a b" c'),
+    ('quoted', u'"a bc"'),
+    ('unquoted', u'a bc'),
+])
+def test_from_api_to_user(txt_transformation, expected):
+    converter = RecordConverter(
+        CustomProviderInformation(txt_record_handling='encoded', txt_character_encoding='decimal'),
+        CustomProvideOptions({'txt_transformation': txt_transformation, 'txt_character_encoding': 'decimal'}))
+    records = []
+    for index in range(4):
+        record = DNSRecord()
+        record.type = 'TXT' if index % 2 == 0 else 'A'
+        record.target = u'"a b" c' if index % 2 == 0 else b'1.2.3.4'
+        records.append(record)
+    two_step = [record.clone() for record in records]
+
+    converter.process_multiple_from_api_to_user(records)
+    converter.process_multiple_from_api(two_step)
+    converter.process_multiple_to_user(two_step)
+    assert [record.target for record in records] == [expected, u'1.2.3.4'] * 2
+    assert [record.target for record in records] == [record.target for record in two_step]
+
+    record_set = DNSRecordSet()
+    record_set.type = 'TXT'
+    record = DNSRecord()
+    record.type = 'TXT'
+    record.target = u'"a b" c'
+    record_set.records.append(record)
+    converter.process_set_from_api_to_user(record_set)
+    assert record_set.records[0].target == expected
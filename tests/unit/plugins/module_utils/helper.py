@@ -9,6 +9,10 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+import threading
+import time
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import HTTPHelper
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.provider import (
     ProviderInformation,
 )
@@ -45,3 +49,47 @@ class CustomProvideOptions(object):
 
     def get_option(self, name):
         return self._option_dict.get(name)
+
+
+class FakeClock(object):
+    def __init__(self, now=1700000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeHTTPHelper(HTTPHelper):
+    """
+    Returns the given (content, info) tuples one after the other, and records the requests
+    as (method, url, headers, data) tuples in ``calls``.
+
+    For concurrent requests, whose order is not known, ``responses`` can also be a function
+    ``responses(method, url, data)`` returning the tuple. Every request takes ``latency``
+    seconds, and ``max_in_flight`` is the maximal number of requests handled at the same time.
+    """
+
+    def __init__(self, responses, latency=0):
+        self.responses = responses if callable(responses) else list(responses)
+        self.latency = latency
+        self.calls = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def fetch_url(self, url, method='GET', headers=None, data=None, timeout=None):
+        with self._lock:
+            self.calls.append((method, url, dict(headers or {}), data))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            if callable(self.responses):
+                content, info = self.responses(method, url, data)
+            else:
+                content, info = self.responses.pop(0)
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self._in_flight -= 1
+        info = dict(info)
+        info['url'] = url
+        return content, info
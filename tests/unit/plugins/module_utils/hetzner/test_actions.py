@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import threading
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hetzner import (
+    actions as actions_module,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hetzner.actions import (
+    ActionTracker,
+)
+
+
+def _action(action_id, status='running'):
+    return {'id': action_id, 'status': status}
+
+
+class _FakeAPI(object):
+    def __init__(self, polls_until_done=None, statuses=None):
+        self.lock = threading.Lock()
+        self.polls = []
+        self.counts = {}
+        self.polls_until_done = polls_until_done or {}
+        self.statuses = statuses or {}
+
+    def poll(self, action_ids):
+        with self.lock:
+            self.polls.append(list(action_ids))
+            result = []
+            for action_id in action_ids:
+                count = self.counts[action_id] = self.counts.get(action_id, 0) + 1
+                done = count >= self.polls_until_done.get(action_id, 1)
+                result.append(_action(int(action_id), self.statuses.get(action_id, 'success') if done else 'running'))
+            return result
+
+
+def test_wait_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(actions_module.time, 'sleep', sleeps.append)
+    api = _FakeAPI(polls_until_done={'1': 5, '2': 2})
+    tracker = ActionTracker(api.poll, initial_delay=0.1, max_delay=0.5, backoff=2.0)
+    result = tracker.wait([_action(1), _action(2), _action(3, 'success')])
+    assert result == [_action(1, 'success'), _action(2, 'success'), _action(3, 'success')]
+    assert sleeps == [0.1, 0.2, 0.4, 0.5, 0.5]
+    assert api.polls == [['1', '2'], ['1', '2'], ['1'], ['1'], ['1']]
+
+    # The delay is reset for new actions
+    sleeps[:] = []
+    tracker.wait([_action(4)])
+    assert sleeps == [0.1]
+
+
+def test_wait_nothing_running(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(actions_module.time, 'sleep', sleeps.append)
+    api = _FakeAPI()
+    tracker = ActionTracker(api.poll)
+    assert tracker.wait([_action(1, 'success'), _action(2, 'error')]) == [_action(1, 'success'), _action(2, 'error')]
+    assert sleeps == []
+    assert api.polls == []
+
+
+def test_wait_batches(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    api = _FakeAPI()
+    tracker = ActionTracker(api.poll, max_ids_per_request=2, max_workers=2)
+    result = tracker.wait([_action(index) for index in range(1, 6)])
+    assert [action['status'] for action in result] == ['success'] * 5
+    assert sorted(api.polls) == [['1', '2'], ['3', '4'], ['5']]
+
+
+def test_wait_stop_on_first_error(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    api = _FakeAPI(polls_until_done={'2': 3}, statuses={'1': 'error'})
+    tracker = ActionTracker(api.poll)
+    result = tracker.wait([_action(1), _action(2)], stop_on_first_error=True)
+    assert result == [_action(1, 'error'), _action(2)]
+    assert api.polls == [['1', '2']]
+    # Nothing is kept once nobody waits for the actions anymore
+    assert tracker._actions == {}
+
+
+def test_wait_missing_action(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    polls = []
+
+    def poll(action_ids):
+        polls.append(list(action_ids))
+        return []
+
+    tracker = ActionTracker(poll, max_missing_polls=3)
+    assert tracker.wait([_action(1)]) == [_action(1, 'unknown')]
+    assert polls == [['1'], ['1'], ['1']]
+    assert tracker._missing == {}
+
+
+def test_wait_missing_action_returned_later(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    polls = []
+
+    def poll(action_ids):
+        polls.append(list(action_ids))
+        if len(polls) < 3:
+            return []
+        return [_action(int(action_id), 'success') for action_id in action_ids]
+
+    tracker = ActionTracker(poll, max_missing_polls=3)
+    assert tracker.wait([_action(1)]) == [_action(1, 'success')]
+    assert polls == [['1'], ['1'], ['1']]
+    assert tracker._missing == {}
+
+
+def test_wait_missing_action_stop_on_first_error(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    api = _FakeAPI(polls_until_done={'2': 5})
+
+    def poll(action_ids):
+        return [action for action in api.poll(action_ids) if action['id'] != 1]
+
+    tracker = ActionTracker(poll, max_missing_polls=2)
+    result = tracker.wait([_action(1), _action(2)], stop_on_first_error=True)
+    assert result == [_action(1, 'unknown'), _action(2)]
+    assert api.polls == [['1', '2'], ['1', '2']]
+
+
+def test_wait_shared_queue(monkeypatch):
+    api = _FakeAPI(polls_until_done={'1': 2, '2': 2, '3': 2})
+    original_sleep = actions_module.time.sleep
+
+    def sleep(delay):
+        # Make sure that all waiters registered their actions before the first poll
+        original_sleep(0.05)
+
+    monkeypatch.setattr(actions_module.time, 'sleep', sleep)
+    tracker = ActionTracker(api.poll)
+    results = {}
+
+    def wait(action_id):
+        results[action_id] = tracker.wait([_action(action_id)])
+
+    threads = [threading.Thread(target=wait, args=(action_id, )) for action_id in (1, 2, 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {action_id: [_action(action_id, 'success')] for action_id in (1, 2, 3)}
+    # All three actions are polled together
+    assert api.polls == [['1', '2', '3'], ['1', '2', '3']]
+
+
+def test_wait_timeout(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    api = _FakeAPI(polls_until_done={'1': 1000})
+    tracker = ActionTracker(api.poll)
+    assert tracker.wait([_action(1)], timeout=0) == [_action(1)]
+    assert api.polls == []
@@ -9,21 +9,39 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+import json
+
 import pytest
 from ansible_collections.community.internal_test_tools.tests.unit.compat.mock import (
     MagicMock,
 )
 
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hetzner import (
+    actions as actions_module,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hetzner import (
+    api as hetzner_api,
+)
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hetzner.api import (
     HetznerAPI,
     _format_action_error,
+    _get_update_json_data_records,
     _HetznerNewAPI,
+    _split_into_chunks,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http_cache import (
+    ResponseCache,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import DNSRecord
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_diff import RecordSetDiff
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_set import DNSRecordSet
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_cache import ZoneCache
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
     DNSAPIError,
 )
 
+from ..helper import FakeClock, FakeHTTPHelper
+
 
 def test_list_pagination():
     def get_1(url, query=None, must_have_content=True, expected=None):
@@ -116,6 +134,83 @@ def test_list_pagination():
     assert result is None
 
 
+def test_list_pagination_concurrent():
+    requested = []
+
+    def get(url, query=None, must_have_content=True, expected=None):
+        assert url == 'https://example.com'
+        assert expected == ([200, 404] if query['page'] == 1 else [200])
+        requested.append(query['page'])
+        return {
+            'data': [query['page'] * 10, query['page'] * 10 + 1],
+            'meta': {
+                'pagination': {
+                    'page': query['page'],
+                    'per_page': 2,
+                    'last_page': 7,
+                    'total_entries': 14,
+                },
+            },
+        }, {'status': 200}
+
+    api = HetznerAPI(MagicMock(), '123', concurrency=3)
+    api._get = MagicMock(side_effect=get)
+    result = api._list_pagination('https://example.com', 'data', block_size=2, accept_404=True)
+    assert result == [page * 10 + index for page in range(1, 8) for index in range(2)]
+    assert requested[0] == 1
+    assert sorted(requested) == [1, 2, 3, 4, 5, 6, 7]
+
+    api = _HetznerNewAPI(MagicMock(), '123', concurrency=3)
+    api._get = MagicMock(side_effect=get)
+    result = api._list_pagination('https://example.com', 'data', block_size=2, accept_404=True)
+    assert result == [page * 10 + index for page in range(1, 8) for index in range(2)]
+
+
+def test_get_zone_records_converted_per_page():
+    pages = {
+        1: [
+            {'id': '1', 'type': 'A', 'name': '@', 'value': '1.2.3.4', 'zone_id': 'z'},
+            {'id': '2', 'type': 'TXT', 'name': 'foo', 'value': 'bar', 'ttl': 300, 'zone_id': 'z'},
+        ],
+        2: [
+            {'id': '3', 'type': 'A', 'name': 'foo', 'value': '1.2.3.5', 'zone_id': 'z'},
+        ],
+    }
+    returned = []
+
+    def get(url, query=None, must_have_content=True, expected=None):
+        assert url == 'v1/records'
+        assert query['zone_id'] == 'z'
+        result = {
+            'records': [dict(entry) for entry in pages[query['page']]],
+            'meta': {
+                'pagination': {
+                    'page': query['page'],
+                    'per_page': 100,
+                    'last_page': 2,
+                    'total_entries': 3,
+                },
+            },
+        }
+        returned.append(result)
+        return result, {'status': 200}
+
+    api = HetznerAPI(MagicMock(), '123')
+    api._get = MagicMock(side_effect=get)
+    result = api.get_zone_records('z')
+    assert [(record.id, record.prefix, record.type, record.target) for record in result] == [
+        ('1', None, 'A', '1.2.3.4'),
+        ('2', 'foo', 'TXT', 'bar'),
+        ('3', 'foo', 'A', '1.2.3.5'),
+    ]
+    # The decoded entries have been consumed while converting
+    assert [page['records'] for page in returned] == [[], []]
+
+    api._get = MagicMock(side_effect=get)
+    result = api.get_zone_records('z', prefix='foo', record_type='A')
+    assert [record.id for record in result] == ['3']
+
+
 def test_update_id_missing():
     api = HetznerAPI(MagicMock(), '123')
     with pytest.raises(DNSAPIError) as exc:
@@ -152,6 +247,7 @@ def test__format_action_error():
     assert _format_action_error({"error": False}) is None
     assert _format_action_error({"error": {}}) is None
     assert _format_action_error({"error": {"code": "foo", "message": "bar"}}) == "bar (foo)"
+    assert _format_action_error({"id": 1, "status": "unknown"}) == "action 1 was not returned by the API"
 
 
 def test_new_api__extract_only_error_message():
@@ -201,3 +297,613 @@ def test_new_api__check_error():
         api._check_error("GET", "https://example.com", {"error": {"code": "foo", "message": "bar", "details": None}})
 
     assert api._check_error("GET", "https://example.com", {"error": {"code": "foo", "message": "bar", "details": None}}, accepted=["foo"]) == "foo"
+
+
+@pytest.mark.parametrize('entries, max_records, max_bytes, expected', [
+    ([], 2, 100, []),
+    ([{'a': 1}, {'a': 2}, {'a': 3}], 2, 100, [[{'a': 1}, {'a': 2}], [{'a': 3}]]),
+    # Every record takes 8 bytes plus 2 bytes for the separator
+    ([{'a': 1}, {'a': 2}, {'a': 3}], 5, 20, [[{'a': 1}, {'a': 2}], [{'a': 3}]]),
+    ([{'a': 1}, {'a': 2}, {'a': 3}], 5, 19, [[{'a': 1}], [{'a': 2}], [{'a': 3}]]),
+    ([{'a': 1}, {'b': 'x' * 100}, {'a': 3}], 5, 50, [[{'a': 1}], [{'b': 'x' * 100}], [{'a': 3}]]),
+])
+def test_split_into_chunks(entries, max_records, max_bytes, expected):
+    assert _split_into_chunks(entries, max_records, max_bytes) == expected
+
+
+def _create_txt_record_set(values):
+    record_set = DNSRecordSet()
+    record_set.prefix = 'foo'
+    record_set.type = 'TXT'
+    for value in values:
+        record = DNSRecord()
+        record.prefix = 'foo'
+        record.type = 'TXT'
+        record.target = value
+        record_set.records.append(record)
+    return record_set
+
+
+def test_get_update_json_data_records():
+    values = ['"value {0}"'.format(index) for index in range(100)]
+    record_set = _create_txt_record_set(values)
+    added = _create_txt_record_set(['"new"']).records
+    removed = _create_txt_record_set(['"old"']).records
+
+    result = _get_update_json_data_records(record_set, True)
+    assert [action for action, data in result] == ['set_records']
+    assert len(result[0][1]['records']) == 100
+
+    result = _get_update_json_data_records(record_set, RecordSetDiff(added=added))
+    assert result == [('add_records', {'records': [{'value': '"new"', 'comment': None}]})]
+
+    result = _get_update_json_data_records(record_set, RecordSetDiff(removed=removed))
+    assert result == [('remove_records', {'records': [{'value': '"old"'}]})]
+
+    result = _get_update_json_data_records(record_set, RecordSetDiff(added=added, removed=removed))
+    assert result == [
+        ('add_records', {'records': [{'value': '"new"', 'comment': None}]}),
+        ('remove_records', {'records': [{'value': '"old"'}]}),
+    ]
+
+    # For small record sets, sending all records is cheaper
+    record_set = _create_txt_record_set(['"new"', '"other"'])
+    result = _get_update_json_data_records(record_set, RecordSetDiff(added=added, removed=removed))
+    assert [action for action, data in result] == ['set_records']
+
+
+def _json_response(data, status=200):
+    return json.dumps(data).encode('utf-8'), {'status': status, 'content-type': 'application/json'}
+
+
+def test_new_api_poll_actions_not_cached(tmpdir, monkeypatch):
+    sleeps = []
+
+    def sleep(delay):
+        sleeps.append(delay)
+        # A cached "running" status would make the tracker poll forever
+        assert len(sleeps) <= 10
+
+    monkeypatch.setattr(actions_module.time, 'sleep', sleep)
+    cache = ResponseCache(str(tmpdir), max_age=60, clock=FakeClock())
+    http_helper = FakeHTTPHelper([
+        _json_response({'action': {'id': 1, 'status': 'running'}}),
+        _json_response({'action': {'id': 1, 'status': 'success'}}),
+        _json_response({'actions': [{'id': 2, 'status': 'running'}, {'id': 3, 'status': 'success'}]}),
+        _json_response({'action': {'id': 2, 'status': 'success'}}),
+    ])
+    api = _HetznerNewAPI(http_helper, '123', response_cache=cache)
+    errors, actions = api._wait_for_actions([{'id': 1, 'status': 'running'}], 'testing')
+    assert errors == []
+    assert actions == [{'id': 1, 'status': 'success'}]
+    errors, actions = api._wait_for_actions([{'id': 2, 'status': 'running'}, {'id': 3, 'status': 'running'}], 'testing')
+    assert [action['status'] for action in actions] == ['success', 'success']
+    assert [url for method, url, headers, data in http_helper.calls] == [
+        'https://api.hetzner.cloud/v1/actions/1',
+        'https://api.hetzner.cloud/v1/actions/1',
+        'https://api.hetzner.cloud/v1/actions?id=2&id=3',
+        'https://api.hetzner.cloud/v1/actions/2',
+    ]
+
+
+def test_new_api_wait_for_actions_missing(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    http_helper = FakeHTTPHelper([
+        _json_response({'actions': [{'id': 2, 'status': 'running'}]}),
+        _json_response({'actions': [{'id': 2, 'status': 'running'}]}),
+        _json_response({'actions': [{'id': 2, 'status': 'running'}]}),
+        _json_response({'action': {'id': 2, 'status': 'success'}}),
+    ])
+    api = _HetznerNewAPI(http_helper, '123')
+    with pytest.raises(DNSAPIError) as exc:
+        api._wait_for_actions([{'id': 2, 'status': 'running'}, {'id': 3, 'status': 'running'}], 'testing')
+    assert exc.value.args[0] == 'Error while testing: action 3 was not returned by the API'
+    assert [url for method, url, headers, data in http_helper.calls] == [
+        'https://api.hetzner.cloud/v1/actions?id=2&id=3',
+        'https://api.hetzner.cloud/v1/actions?id=2&id=3',
+        'https://api.hetzner.cloud/v1/actions?id=2&id=3',
+        'https://api.hetzner.cloud/v1/actions/2',
+    ]
+    assert http_helper.responses == []
+
+
+def _create_records(count, zone_id='z'):
+    records = []
+    for index in range(count):
+        record = DNSRecord()
+        record.id = str(index + 1)
+        record.prefix = 'host{0}'.format(index)
+        record.type = 'A'
+        record.ttl = 600
+        record.target = '10.0.0.{0}'.format(index + 1)
+        records.append(record)
+    return records
+
+
+def _record_json(record, zone_id='z'):
+    return {'id': record.id, 'name': record.prefix, 'type': record.type, 'ttl': record.ttl, 'value': record.target, 'zone_id': zone_id}
+
+
+@pytest.mark.parametrize('stop_early_on_errors', [True, False])
+def test_update_records_bulk(monkeypatch, stop_early_on_errors):
+    monkeypatch.setattr(hetzner_api, 'BULK_MAX_RECORDS', 2)
+    records = _create_records(5)
+    failed_record = _record_json(records[3])
+    # The API does not always return the ID of failed records
+    del failed_record['id']
+    responses = [
+        _json_response({'records': [_record_json(records[0]), _record_json(records[1])], 'failed_records': []}),
+        _json_response({'records': [_record_json(records[2])], 'failed_records': [failed_record]}),
+        # The failed record is retried on its own
+        _json_response({'error': {'message': 'invalid value', 'code': 422}}, status=422),
+    ]
+    if not stop_early_on_errors:
+        responses.append(_json_response({'records': [_record_json(records[4])], 'failed_records': []}))
+    http_helper = FakeHTTPHelper(responses)
+    api = HetznerAPI(http_helper, '123')
+    results = api.update_records({'z': records}, stop_early_on_errors=stop_early_on_errors)['z']
+    assert [(record.id, updated) for record, updated, failed in results] == [
+        ('1', True), ('2', True), ('3', True), ('4', False), ('5', not stop_early_on_errors),
+    ]
+    assert results[3][0] is records[3]
+    assert isinstance(results[3][2], DNSAPIError)
+    assert str(results[3][2]) == (
+        'The updated A record with value "10.0.0.4" and TTL 600 has not been accepted by the server'
+        ' with error message "invalid value" (error code 422)'
+    )
+    # Records of skipped chunks are reported as not updated, without error
+    assert results[4][2] is None
+    assert [(method, url) for method, url, headers, data in http_helper.calls] == [
+        ('PUT', 'https://dns.hetzner.com/api/v1/records/bulk'),
+        ('PUT', 'https://dns.hetzner.com/api/v1/records/bulk'),
+        ('PUT', 'https://dns.hetzner.com/api/v1/records/4'),
+    ] + [('PUT', 'https://dns.hetzner.com/api/v1/records/bulk')] * (len(responses) - 3)
+    assert json.loads(http_helper.calls[0][3])['records'] == [_record_json(records[0]), _record_json(records[1])]
+
+
+def test_update_records_bulk_retry(monkeypatch):
+    monkeypatch.setattr(hetzner_api, 'BULK_MAX_RECORDS', 2)
+    records = _create_records(3)
+    http_helper = FakeHTTPHelper([
+        _json_response({'records': [_record_json(records[0])], 'failed_records': [_record_json(records[1])]}),
+        _json_response({'record': _record_json(records[1])}),
+        _json_response({'records': [_record_json(records[2])], 'failed_records': []}),
+    ])
+    results = HetznerAPI(http_helper, '123').update_records({'z': records})['z']
+    # The record updated by the retry does not stop processing
+    assert [(record.id, updated, failed) for record, updated, failed in results] == [
+        ('1', True, None), ('2', True, None), ('3', True, None),
+    ]
+    assert [url for method, url, headers, data in http_helper.calls] == [
+        'https://dns.hetzner.com/api/v1/records/bulk',
+        'https://dns.hetzner.com/api/v1/records/2',
+        'https://dns.hetzner.com/api/v1/records/bulk',
+    ]
+
+
+def test_update_records_bulk_unavailable(monkeypatch):
+    monkeypatch.setattr(hetzner_api, 'BULK_MAX_RECORDS', 2)
+    records = _create_records(3)
+    http_helper = FakeHTTPHelper([
+        (b'An invalid response was received from the upstream server', {'status': 502, 'content-type': 'text/plain'}),
+        _json_response({'record': _record_json(records[0])}),
+        _json_response({'record': _record_json(records[1])}),
+        _json_response({'record': _record_json(records[2])}),
+    ])
+    api = HetznerAPI(http_helper, '123')
+    results = api.update_records({'z': records})['z']
+    assert [(record.id, updated, failed) for record, updated, failed in results] == [
+        ('1', True, None), ('2', True, None), ('3', True, None),
+    ]
+    # After the bulk update API failed once, it is no longer used
+    assert [(method, url) for method, url, headers, data in http_helper.calls] == [
+        ('PUT', 'https://dns.hetzner.com/api/v1/records/bulk'),
+        ('PUT', 'https://dns.hetzner.com/api/v1/records/1'),
+        ('PUT', 'https://dns.hetzner.com/api/v1/records/2'),
+        ('PUT', 'https://dns.hetzner.com/api/v1/records/3'),
+    ]
+
+
+def test_update_records_bulk_error():
+    records = _create_records(2)
+    http_helper = FakeHTTPHelper([
+        _json_response({'error': {'message': 'internal error', 'code': 500}}, status=500),
+    ])
+    api = HetznerAPI(http_helper, '123')
+    with pytest.raises(DNSAPIError) as exc:
+        api.update_records({'z': records})
+    assert 'internal error' in str(exc.value)
+    assert len(http_helper.calls) == 1
+
+
+def _new_record_json(index, zone_id='z'):
+    return {'name': 'new{0}'.format(index), 'type': 'A', 'value': '192.0.2.{0}'.format(index), 'ttl': 3600, 'zone_id': zone_id}
+
+
+def _create_new_records(count):
+    records = []
+    for index in range(count):
+        record = DNSRecord()
+        record.prefix = 'new{0}'.format(index)
+        record.type = 'A'
+        record.ttl = 3600
+        record.target = '192.0.2.{0}'.format(index)
+        records.append(record)
+    return records
+
+
+@pytest.mark.parametrize('stop_early_on_errors', [True, False])
+def test_add_records_bulk(monkeypatch, stop_early_on_errors):
+    monkeypatch.setattr(hetzner_api, 'BULK_MAX_RECORDS', 2)
+    records = _create_new_records(5)
+    responses = [
+        _json_response({'records': [dict(_new_record_json(0), id='1'), dict(_new_record_json(1), id='2')]}),
+        # The second chunk is rejected as a whole
+        _json_response({'records': [], 'valid_records': [_new_record_json(3)], 'invalid_records': [_new_record_json(2)]}, status=422),
+    ]
+    if not stop_early_on_errors:
+        responses.append(_json_response({'records': [dict(_new_record_json(4), id='5')]}))
+    http_helper = FakeHTTPHelper(responses)
+    api = HetznerAPI(http_helper, '123')
+    results = api.add_records({'z': records}, stop_early_on_errors=stop_early_on_errors)['z']
+    # The records of all chunks are returned, including the ones skipped after the error
+    assert sorted((record.prefix, created, failed is not None) for record, created, failed in results) == [
+        ('new0', True, False),
+        ('new1', True, False),
+        ('new2', False, True),
+        ('new3', False, False),
+        ('new4', not stop_early_on_errors, False),
+    ]
+    assert len(http_helper.calls) == len(responses)
+
+
+def test_add_records_bulk_concurrently(monkeypatch):
+    monkeypatch.setattr(hetzner_api, 'BULK_MAX_RECORDS', 5)
+
+    def respond(method, url, data):
+        assert (method, url) == ('POST', 'https://dns.hetzner.com/api/v1/records/bulk')
+        return _json_response({'records': [dict(record, id=record['name']) for record in json.loads(data)['records']]})
+
+    http_helper = FakeHTTPHelper(respond, latency=0.05)
+    api = HetznerAPI(http_helper, '123', concurrency=4)
+    results = api.add_records({'z': _create_new_records(20)})['z']
+    # The results are in the order of the records, regardless of the order of the responses
+    assert [(record.id, created, failed) for record, created, failed in results] == [
+        ('new{0}'.format(index), True, None) for index in range(20)
+    ]
+    assert len(http_helper.calls) == 4
+    assert 1 < http_helper.max_in_flight <= 4
+
+
+def test_import_zone_file():
+    http_helper = FakeHTTPHelper([
+        _json_response({'zone': {'id': 'z', 'name': 'example.com'}}),
+        _json_response({'error': {'message': 'invalid zone file', 'code': 422}}, status=422),
+    ])
+    api = HetznerAPI(http_helper, '123')
+    api.import_zone_file('z', '$ORIGIN example.com.\n')
+    with pytest.raises(DNSAPIError) as exc:
+        api.import_zone_file('z', 'foo\n')
+    assert str(exc.value).startswith('The zone file has not been accepted by the server')
+    assert 'invalid zone file' in str(exc.value)
+    assert [(method, url, data) for method, url, headers, data in http_helper.calls] == [
+        ('POST', 'https://dns.hetzner.com/api/v1/zones/z/import', b'$ORIGIN example.com.\n'),
+        ('POST', 'https://dns.hetzner.com/api/v1/zones/z/import', b'foo\n'),
+    ]
+    assert http_helper.calls[0][2]['content-type'] == 'text/plain'
+
+
+def test_new_api_import_zone_file(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    http_helper = FakeHTTPHelper([
+        _json_response({'action': {'id': 1, 'status': 'running'}}, status=201),
+        _json_response({'action': {'id': 1, 'status': 'success'}}),
+        _json_response({'action': {'id': 2, 'status': 'running'}}, status=201),
+        _json_response({'action': {'id': 2, 'status': 'error', 'error': {'code': 'invalid_input', 'message': 'invalid zone file'}}}),
+    ])
+    api = _HetznerNewAPI(http_helper, '123')
+    api.import_zone_file('42', '$ORIGIN example.com.\n')
+    with pytest.raises(DNSAPIError) as exc:
+        api.import_zone_file('42', 'foo\n')
+    assert str(exc.value) == 'Error while importing zone file: invalid zone file (invalid_input)'
+    assert [(method, url) for method, url, headers, data in http_helper.calls] == [
+        ('POST', 'https://api.hetzner.cloud/v1/zones/42/actions/import_zonefile'),
+        ('GET', 'https://api.hetzner.cloud/v1/actions/1'),
+        ('POST', 'https://api.hetzner.cloud/v1/zones/42/actions/import_zonefile'),
+        ('GET', 'https://api.hetzner.cloud/v1/actions/2'),
+    ]
+    assert json.loads(http_helper.calls[0][3]) == {'zonefile': '$ORIGIN example.com.\n'}
+
+
+def _pagination(count):
+    return {'pagination': {'page': 1, 'per_page': 100, 'last_page': 1, 'total_entries': count}}
+
+
+def _rrset_json(prefix, record_type, values, ttl=None, zone_id=42):
+    name = prefix or '@'
+    return {
+        'id': '{0}/{1}'.format(name, record_type),
+        'name': name,
+        'type': record_type,
+        'ttl': ttl,
+        'zone': zone_id,
+        'records': [{'value': value, 'comment': ''} for value in values],
+    }
+
+
+def test_new_api_zone_cache(tmpdir):
+    zone = {'id': 42, 'name': 'example.com', 'ttl': 3600}
+    rrsets = [_rrset_json('www', 'A', ['192.0.2.1'])]
+    cache = ZoneCache(str(tmpdir), 'hetzner-cloud')
+    http_helper = FakeHTTPHelper([
+        _json_response({'zone': zone}),
+        _json_response({'rrsets': rrsets, 'meta': _pagination(1)}),
+        _json_response({'rrsets': rrsets, 'meta': _pagination(1)}),
+        # The zone has been deleted and created again with another ID
+        _json_response({'error': {'code': 'not_found', 'message': 'zone not found', 'details': {}}}, status=404),
+        _json_response({'zone': dict(zone, id=43)}),
+        _json_response({'rrsets': [], 'meta': _pagination(0)}),
+    ])
+    api = _HetznerNewAPI(http_helper, '123', zone_cache=cache)
+    assert len(api.get_zone_with_record_sets_by_name('example.com').record_sets) == 1
+    # The zone is not looked up again
+    assert len(api.get_zone_with_record_sets_by_name('example.com').record_sets) == 1
+    result = api.get_zone_with_record_sets_by_name('example.com')
+    assert (result.zone.id, result.record_sets) == ('43', [])
+    assert [url.split('?')[0] for method, url, headers, data in http_helper.calls] == [
+        'https://api.hetzner.cloud/v1/zones/example.com',
+        'https://api.hetzner.cloud/v1/zones/42/rrsets',
+        'https://api.hetzner.cloud/v1/zones/42/rrsets',
+        'https://api.hetzner.cloud/v1/zones/42/rrsets',
+        'https://api.hetzner.cloud/v1/zones/example.com',
+        'https://api.hetzner.cloud/v1/zones/43/rrsets',
+    ]
+    assert cache.get_by_id('42') is None
+
+
+def _create_record_set(prefix, record_type, values, ttl=300):
+    record_set = DNSRecordSet()
+    record_set.prefix = prefix
+    record_set.type = record_type
+    record_set.ttl = ttl
+    for value in values:
+        record = DNSRecord()
+        record.prefix = prefix
+        record.type = record_type
+        record.ttl = ttl
+        record.target = value
+        record_set.records.append(record)
+    return record_set
+
+
+def test_new_api_deferred_actions(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    http_helper = FakeHTTPHelper([
+        _json_response({'rrset': _rrset_json('new', 'A', ['192.0.2.1'], ttl=300), 'action': {'id': 1, 'status': 'running'}}, status=201),
+        _json_response({'action': {'id': 2, 'status': 'running'}}, status=201),
+        _json_response({'actions': [{'id': 1, 'status': 'success'}, {'id': 2, 'status': 'success'}]}),
+    ])
+    api = _HetznerNewAPI(http_helper, '123', wait=False)
+    api.add_record_set('42', _create_record_set('new', 'A', ['192.0.2.1']))
+    record_set = _create_record_set('www', 'A', ['192.0.2.2'], ttl=600)
+    assert api.update_record_set('42', record_set, updated_records=False) is record_set
+    # No action was polled so far
+    assert len(http_helper.calls) == 2
+    assert api.started_action_ids == [1, 2]
+
+    actions = api.wait_for_actions(api.started_action_ids)
+    assert [action['status'] for action in actions] == ['success', 'success']
+    assert http_helper.calls[-1][1] == 'https://api.hetzner.cloud/v1/actions?id=1&id=2'
+
+
+def test_new_api_add_record_sets_concurrently():
+    def respond(method, url, data):
+        assert (method, url) == ('POST', 'https://api.hetzner.cloud/v1/zones/42/rrsets')
+        data = json.loads(data)
+        rrset = _rrset_json(data['name'], data['type'], [record['value'] for record in data['records']], ttl=data['ttl'])
+        return _json_response({'rrset': rrset, 'action': {'id': int(data['name'][3:]) + 1, 'status': 'success'}}, status=201)
+
+    http_helper = FakeHTTPHelper(respond, latency=0.05)
+    api = _HetznerNewAPI(http_helper, '123', concurrency=4)
+    record_sets = [_create_record_set('new{0}'.format(index), 'A', ['192.0.2.{0}'.format(index)]) for index in range(8)]
+    results = api.add_record_sets({'42': record_sets})['42']
+    assert [(record_set.prefix, created, failed) for record_set, created, failed in results] == [
+        ('new{0}'.format(index), True, None) for index in range(8)
+    ]
+    assert len(http_helper.calls) == 8
+    assert 1 < http_helper.max_in_flight <= 4
+
+
+@pytest.mark.parametrize('stop_early_on_errors, expected', [
+    (True, [('new0', True), ('host0', False)]),
+    (False, [('new0', True), ('host0', False), ('new1', True)]),
+])
+def test_new_api_add_record_sets_errors(stop_early_on_errors, expected):
+    responses = [
+        _json_response({'rrset': _rrset_json('new0', 'A', ['192.0.2.1'], ttl=300), 'action': {'id': 1, 'status': 'success'}}, status=201),
+        # This record set already exists
+        _json_response({'error': {'code': 'uniqueness_error', 'message': 'rrset already exists', 'details': {}}}, status=409),
+    ]
+    if not stop_early_on_errors:
+        responses.append(
+            _json_response({'rrset': _rrset_json('new1', 'A', ['192.0.2.3'], ttl=300), 'action': {'id': 2, 'status': 'success'}}, status=201))
+    http_helper = FakeHTTPHelper(responses)
+    api = _HetznerNewAPI(http_helper, '123')
+    record_sets = [
+        _create_record_set('new0', 'A', ['192.0.2.1']),
+        _create_record_set('host0', 'A', ['192.0.2.2']),
+        _create_record_set('new1', 'A', ['192.0.2.3']),
+    ]
+    results = api.add_record_sets({'42': record_sets}, stop_early_on_errors=stop_early_on_errors)['42']
+    assert [(record_set.prefix, created) for record_set, created, failed in results] == expected
+    assert results[1][0] is record_sets[1]
+    assert 'rrset already exists' in str(results[1][2])
+    assert http_helper.responses == []
+
+
+def _refreshing_responder(rrsets):
+    def respond(method, url, data):
+        if method == 'POST':
+            assert url.endswith('/actions/change_ttl')
+            return _json_response({'action': {'id': 1, 'status': 'success'}}, status=201)
+        assert method == 'GET'
+        if url.startswith('https://api.hetzner.cloud/v1/zones/42/rrsets?'):
+            return _json_response({'rrsets': list(rrsets.values()), 'meta': _pagination(len(rrsets))})
+        rrset = rrsets.get(url[len('https://api.hetzner.cloud/v1/zones/42/rrsets/'):])
+        if rrset is None:
+            return _json_response({'error': {'code': 'not_found', 'message': 'rrset not found', 'details': {}}}, status=404)
+        return _json_response({'rrset': rrset})
+
+    return respond
+
+
+def _get_requests(http_helper):
+    return sorted((method, url.split('?')[0]) for method, url, headers, data in http_helper.calls)
+
+
+def test_new_api_update_record_sets_refresh(monkeypatch):
+    rrsets = {}
+    for rrset in (
+        _rrset_json(None, 'NS', ['ns1.example.net.'], ttl=600),
+        _rrset_json('host1', 'A', ['192.0.2.1'], ttl=600),
+        _rrset_json('host3', 'AAAA', ['2001:db8::3'], ttl=600),
+        _rrset_json('host4', 'A', ['192.0.2.4'], ttl=600),
+    ):
+        rrsets[rrset['id']] = rrset
+    record_sets = [
+        _create_record_set(None, 'NS', ['ns1.example.net.'], ttl=600),
+        _create_record_set('host1', 'A', ['192.0.2.1'], ttl=600),
+        _create_record_set('host3', 'AAAA', ['2001:db8::3'], ttl=600),
+    ]
+    http_helper = FakeHTTPHelper(_refreshing_responder(rrsets))
+    api = _HetznerNewAPI(http_helper, '123', concurrency=4)
+    results = api.update_record_sets({'42': [(record_set, False, True) for record_set in record_sets]})['42']
+    assert [(record_set.prefix, record_set.type, updated) for record_set, updated, failed in results] == [
+        (None, 'NS', True),
+        ('host1', 'A', True),
+        ('host3', 'AAAA', True),
+    ]
+    # The record sets are refreshed from the API
+    assert all(record_set is not original for (record_set, dummy, dummy2), original in zip(results, record_sets))
+    # Every record set is fetched on its own instead of listing the zone
+    assert _get_requests(http_helper) == [
+        ('GET', 'https://api.hetzner.cloud/v1/zones/42/rrsets/@/NS'),
+        ('GET', 'https://api.hetzner.cloud/v1/zones/42/rrsets/host1/A'),
+        ('GET', 'https://api.hetzner.cloud/v1/zones/42/rrsets/host3/AAAA'),
+        ('POST', 'https://api.hetzner.cloud/v1/zones/42/rrsets/@/NS/actions/change_ttl'),
+        ('POST', 'https://api.hetzner.cloud/v1/zones/42/rrsets/host1/A/actions/change_ttl'),
+        ('POST', 'https://api.hetzner.cloud/v1/zones/42/rrsets/host3/AAAA/actions/change_ttl'),
+    ]
+
+    # With too many different prefixes, the zone is listed
+    monkeypatch.setattr(hetzner_api, 'MAX_REFRESH_REQUESTS', 2)
+    http_helper = FakeHTTPHelper(_refreshing_responder(rrsets))
+    api = _HetznerNewAPI(http_helper, '123', concurrency=4)
+    results = api.update_record_sets({'42': [(record_set, False, True) for record_set in record_sets]})['42']
+    assert [updated for dummy, updated, dummy2 in results] == [True] * 3
+    assert [method for method, url in _get_requests(http_helper)] == ['GET', 'POST', 'POST', 'POST']
+    assert _get_requests(http_helper)[0] == ('GET', 'https://api.hetzner.cloud/v1/zones/42/rrsets')
+
+
+def test_new_api_update_record_sets_refresh_concurrency():
+    def respond(method, url, data):
+        if method == 'POST':
+            return _json_response({'action': {'id': 1, 'status': 'success'}}, status=201)
+        url, query = url.split('?')
+        query = dict(part.split('=') for part in query.split('&'))
+        assert url == 'https://api.hetzner.cloud/v1/zones/42/rrsets'
+        # Every prefix has three pages with one record set of every type
+        page = int(query['page'])
+        rrsets = [
+            _rrset_json(query['name'], record_type, ['192.0.2.{0}'.format(page)], ttl=600)
+            for record_type in ('A', 'AAAA')
+        ]
+        meta = {'pagination': {'page': page, 'per_page': 2, 'last_page': 3, 'total_entries': 6}}
+        return _json_response({'rrsets': rrsets, 'meta': meta})
+
+    record_sets = [
+        _create_record_set('host{0}'.format(index), record_type, ['192.0.2.1'], ttl=600)
+        for index in range(3)
+        for record_type in ('A', 'AAAA')
+    ]
+    http_helper = FakeHTTPHelper(respond, latency=0.05)
+    api = _HetznerNewAPI(http_helper, '123', concurrency=2)
+    results = api.update_record_sets({'42': [(record_set, False, True) for record_set in record_sets]})['42']
+    assert [updated for dummy, updated, dummy2 in results] == [True] * 6
+    # Every prefix is listed on its own, and its pages are not fetched concurrently on top of that
+    assert len([call for call in http_helper.calls if call[0] == 'GET']) == 9
+    assert http_helper.max_in_flight == 2
+
+
+def test_new_api_update_record_sets_refresh_errors():
+    rrset = _rrset_json('host1', 'A', ['192.0.2.1'], ttl=600)
+    record_sets = [
+        _create_record_set('host1', 'A', ['192.0.2.1'], ttl=600),
+        _create_record_set('host2', 'AAAA', ['2001:db8::2'], ttl=600),
+    ]
+
+    # A record set deleted in the meantime keeps the submitted values
+    http_helper = FakeHTTPHelper(_refreshing_responder({rrset['id']: rrset}))
+    api = _HetznerNewAPI(http_helper, '123')
+    results = api.update_record_sets({'42': [(record_set, False, True) for record_set in record_sets]})['42']
+    assert [(updated, failed) for dummy, updated, failed in results] == [(True, None), (True, None)]
+    assert results[0][0] is not record_sets[0]
+    assert results[1][0] is record_sets[1]
+    assert ('GET', 'https://api.hetzner.cloud/v1/zones/42/rrsets/host2/AAAA') in _get_requests(http_helper)
+
+    # Nothing is refreshed when stopping after an error
+    http_helper = FakeHTTPHelper([
+        _json_response({'action': {'id': 1, 'status': 'success'}}, status=201),
+        _json_response({'error': {'code': 'invalid_input', 'message': 'invalid TTL', 'details': {}}}, status=422),
+    ])
+    api = _HetznerNewAPI(http_helper, '123')
+    results = api.update_record_sets({'42': [(record_set, False, True) for record_set in record_sets]})['42']
+    assert [(record_set, updated) for record_set, updated, dummy in results] == [(record_sets[0], True), (record_sets[1], False)]
+    assert 'invalid TTL' in str(results[1][2])
+    assert [method for method, url in _get_requests(http_helper)] == ['POST', 'POST']
+
+
+@pytest.mark.parametrize('wait', [True, False])
+def test_new_api_update_record_set_add_before_remove(monkeypatch, wait):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    values = ['"value {0}"'.format(index) for index in range(100)]
+    record_set = _create_txt_record_set(values)
+    diff = RecordSetDiff(added=_create_txt_record_set(['"new"']).records, removed=_create_txt_record_set(['"old"']).records)
+    rrset = {'id': 'foo/TXT', 'name': 'foo', 'type': 'TXT', 'ttl': None, 'zone': 42, 'records': [{'value': value, 'comment': ''} for value in values]}
+    responses = [
+        _json_response({'action': {'id': 1, 'status': 'running'}}, status=201),
+        _json_response({'action': {'id': 1, 'status': 'success'}}),
+        _json_response({'action': {'id': 2, 'status': 'running'}}, status=201),
+    ]
+    if wait:
+        responses.extend([
+            _json_response({'action': {'id': 2, 'status': 'success'}}),
+            _json_response({'rrset': rrset}),
+        ])
+    http_helper = FakeHTTPHelper(responses)
+    api = _HetznerNewAPI(http_helper, '123', wait=wait)
+    api.update_record_set('42', record_set, updated_records=diff, updated_ttl=False)
+    # remove_records is only sent after add_records finished, also when not waiting for the changes
+    assert [(method, url) for method, url, headers, data in http_helper.calls][:3] == [
+        ('POST', 'https://api.hetzner.cloud/v1/zones/42/rrsets/foo/TXT/actions/add_records'),
+        ('GET', 'https://api.hetzner.cloud/v1/actions/1'),
+        ('POST', 'https://api.hetzner.cloud/v1/zones/42/rrsets/foo/TXT/actions/remove_records'),
+    ]
+    assert http_helper.responses == []
+    assert api.started_action_ids == ([] if wait else [1, 2])
+
+
+def test_new_api_update_record_set_add_error(monkeypatch):
+    monkeypatch.setattr(actions_module.time, 'sleep', lambda delay: None)
+    record_set = _create_txt_record_set(['"value {0}"'.format(index) for index in range(100)])
+    diff = RecordSetDiff(added=_create_txt_record_set(['"new"']).records, removed=_create_txt_record_set(['"old"']).records)
+    http_helper = FakeHTTPHelper([
+        _json_response({'action': {'id': 1, 'status': 'running'}}, status=201),
+        _json_response({'action': {'id': 1, 'status': 'error', 'error': {'code': 'invalid_input', 'message': 'invalid value'}}}),
+    ])
+    api = _HetznerNewAPI(http_helper, '123')
+    with pytest.raises(DNSAPIError) as exc:
+        api.update_record_set('42', record_set, updated_records=diff, updated_ttl=False)
+    assert str(exc.value) == 'Error while adding records: invalid value (invalid_input)'
+    # The records are not removed if adding the new ones failed
+    assert len(http_helper.calls) == 2
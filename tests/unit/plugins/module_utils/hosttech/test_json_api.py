@@ -9,6 +9,8 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+import json
+
 import pytest
 from ansible_collections.community.internal_test_tools.tests.unit.compat.mock import (
     MagicMock,
@@ -17,13 +19,17 @@ from ansible_collections.community.internal_test_tools.tests.unit.compat.mock im
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.hosttech.json_api import (
     HostTechJSONAPI,
     _create_record_from_json,
+    _create_zone_from_json,
     _record_to_json,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import DNSRecord
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_cache import ZoneCache
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
     DNSAPIError,
 )
 
+from ..helper import FakeHTTPHelper
+
 
 # The example JSONs for all record types are taken from https://api.ns1.hosttech.eu/api/documentation/
 def test_AAAA():
@@ -348,6 +354,33 @@ def test_list_pagination():
     assert result == ['bar', 'baz', 'foo']
 
 
+def test_list_pagination_concurrent():
+    requested = []
+
+    def get(url, query=None, must_have_content=True, expected=None):
+        requested.append(query['offset'])
+        if query['offset'] > 5:
+            raise DNSAPIError('Offset out of range')
+        return {'data': [query['offset']] if query['offset'] < 5 else []}, {}
+
+    api = HostTechJSONAPI(MagicMock(), '123', concurrency=3)
+    api._get = MagicMock(side_effect=get)
+    result = api._list_pagination('https://example.com', block_size=1)
+    assert result == [0, 1, 2, 3, 4]
+    # The first page is fetched alone, the following ones speculatively in groups of three
+    assert sorted(requested) == [0, 1, 2, 3, 4, 5, 6]
+
+    def get_error(url, query=None, must_have_content=True, expected=None):
+        if query['offset'] == 2:
+            raise DNSAPIError('Internal server error')
+        return {'data': [query['offset']]}, {}
+
+    api._get = MagicMock(side_effect=get_error)
+    with pytest.raises(DNSAPIError) as exc:
+        api._list_pagination('https://example.com', block_size=1)
+    assert exc.value.args[0] == 'Internal server error'
+
+
 def test_update_id_missing():
     api = HostTechJSONAPI(MagicMock(), '123')
     with pytest.raises(DNSAPIError) as exc:
@@ -373,3 +406,64 @@ def test_extract_error_message():
     assert api._extract_error_message({'message': 'foo', 'errors': {}}) == ' with message "foo"'
     assert api._extract_error_message({'message': 'foo', 'errors': {'bar': 'baz'}}) == ' with message "foo" (field "bar": baz)'
     assert api._extract_error_message({'errors': {'bar': ['baz', 'bam'], 'arf': 'fra'}}) == ' (field "arf": fra) (field "bar": baz; bam)'
+
+
+def _json_response(data, status=200):
+    return json.dumps(data).encode('utf-8'), {'status': status, 'content-type': 'application/json'}
+
+
+HOSTTECH_ZONE = {'id': 42, 'name': 'example.com', 'email': 'test@example.com', 'ttl': 10800, 'dnssec': False}
+
+HOSTTECH_A_RECORD = {'id': 10, 'type': 'A', 'name': 'www', 'ipv4': '1.2.3.4', 'ttl': 3600, 'comment': ''}
+
+
+def _get_calls(http_helper):
+    return [(method, url.split('?')[0]) for method, url, headers, data in http_helper.calls]
+
+
+def test_get_zone_with_records_type_filter(tmpdir):
+    # Only the records of the requested type are fetched, not the zone with all records
+    http_helper = FakeHTTPHelper([
+        _json_response({'data': [HOSTTECH_ZONE]}),
+        _json_response({'data': [HOSTTECH_A_RECORD]}),
+    ])
+    api = HostTechJSONAPI(http_helper, '123')
+    zone = api.get_zone_with_records_by_name('example.com', prefix='www', record_type='A')
+    assert zone.zone.id == 42
+    assert [(record.prefix, record.target) for record in zone.records] == [('www', '1.2.3.4')]
+    assert _get_calls(http_helper) == [
+        ('GET', 'https://api.ns1.hosttech.eu/api/user/v1/zones'),
+        ('GET', 'https://api.ns1.hosttech.eu/api/user/v1/zones/42/records'),
+    ]
+    assert http_helper.calls[1][1].endswith('?type=A')
+
+    # With a zone cache, lookups by ID do not need the zone either
+    cache = ZoneCache(str(tmpdir), 'hosttech')
+    http_helper = FakeHTTPHelper([
+        _json_response({'data': dict(HOSTTECH_ZONE, records=[HOSTTECH_A_RECORD])}),
+        _json_response({'data': [HOSTTECH_A_RECORD]}),
+    ])
+    api = HostTechJSONAPI(http_helper, '123', zone_cache=cache)
+    assert len(api.get_zone_with_records_by_id(42, record_type='A').records) == 1
+    assert len(api.get_zone_with_records_by_id(42, record_type='A').records) == 1
+    assert _get_calls(http_helper) == [
+        ('GET', 'https://api.ns1.hosttech.eu/api/user/v1/zones/42'),
+        ('GET', 'https://api.ns1.hosttech.eu/api/user/v1/zones/42/records'),
+    ]
+
+
+def test_get_zone_with_records_type_filter_stale_cache(tmpdir):
+    cache = ZoneCache(str(tmpdir), 'hosttech')
+    cache.put(_create_zone_from_json(HOSTTECH_ZONE))
+    # The zone has been deleted in the meantime
+    http_helper = FakeHTTPHelper([
+        _json_response({'message': 'Not found'}, status=404),
+        _json_response({'message': 'Not found'}, status=404),
+    ])
+    api = HostTechJSONAPI(http_helper, '123', zone_cache=cache)
+    assert api.get_zone_with_records_by_id(42, record_type='A') is None
+    assert _get_calls(http_helper) == [
+        ('GET', 'https://api.ns1.hosttech.eu/api/user/v1/zones/42/records'),
+        ('GET', 'https://api.ns1.hosttech.eu/api/user/v1/zones/42'),
+    ]
+    assert cache.get_by_id(42) is None
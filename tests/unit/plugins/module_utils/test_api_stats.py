@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import json
+import os
+
+import pytest
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.api_stats import (
+    APIStats,
+    create_api_stats,
+    get_url_template,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import HTTPHelper
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.json_api_helper import (
+    JSONAPIHelper,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.module._utils import (
+    get_api_stats_result,
+)
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://dns.hetzner.com/api/v1/records?zone_id=abc&page=2', '/api/v1/records'),
+    ('https://dns.hetzner.com/api/v1/records/abc', '/api/v1/records/{id}'),
+    ('https://dns.hetzner.com/api/v1/records/bulk', '/api/v1/records/bulk'),
+    ('https://api.hetzner.cloud/v1/zones/example.com/rrsets/www/A', '/v1/zones/{id}/rrsets/{id}/{id}'),
+    ('https://api.hetzner.cloud/v1/zones/example.com/rrsets/@/TXT/actions/set_records', '/v1/zones/{id}/rrsets/{id}/{id}/actions/set_records'),
+    ('https://api.hetzner.cloud/v1/actions/12345', '/v1/actions/{id}'),
+    ('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records/17', '/api/user/v1/zones/{id}/records/{id}'),
+])
+def test_get_url_template(url, expected):
+    assert get_url_template(url) == expected
+
+
+class Options(object):
+    def __init__(self, **options):
+        self.options = options
+
+    def get_option(self, name):
+        return self.options.get(name)
+
+
+def test_api_stats(tmpdir):
+    trace_file = os.path.join(str(tmpdir), 'trace.jsonl')
+    stats = APIStats(trace_file=trace_file, clock=lambda: 1700000000.0)
+    stats.record('GET', 'https://example.com/v1/zones/1', 200, 100, 0.25)
+    stats.record('GET', 'https://example.com/v1/zones/2', 404, 10, 0.5, wait=1.5)
+    stats.record('POST', 'https://example.com/api', 200, 5, 0.125, url_template='/api#getZone')
+    assert stats.to_dict() == {
+        'requests': 3,
+        'time': 0.875,
+        'wait': 1.5,
+        'bytes': 115,
+        'statuses': {'200': 2, '404': 1},
+        'endpoints': [
+            {
+                'method': 'GET',
+                'url': '/v1/zones/{id}',
+                'requests': 2,
+                'time': 0.75,
+                'wait': 1.5,
+                'bytes': 110,
+                'statuses': {'200': 1, '404': 1},
+            },
+            {
+                'method': 'POST',
+                'url': '/api#getZone',
+                'requests': 1,
+                'time': 0.125,
+                'wait': 0.0,
+                'bytes': 5,
+                'statuses': {'200': 1},
+            },
+        ],
+    }
+    with open(trace_file, 'rb') as f:
+        lines = [json.loads(line.decode('utf-8')) for line in f.read().splitlines()]
+    assert len(lines) == 3
+    assert lines[1] == {
+        'timestamp': 1700000000.0,
+        'method': 'GET',
+        'url': 'https://example.com/v1/zones/2',
+        'url_template': '/v1/zones/{id}',
+        'status': 404,
+        'bytes': 10,
+        'latency': 0.5,
+        'wait': 1.5,
+    }
+
+    assert create_api_stats(Options(collect_api_stats=False)) is None
+    assert create_api_stats(Options(collect_api_stats=True)).trace_file is None
+    assert create_api_stats(Options(collect_api_stats=False, api_trace_file=trace_file)).trace_file == trace_file
+
+
+class FakeHTTPHelper(HTTPHelper):
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def fetch_url(self, url, method='GET', headers=None, data=None, timeout=None):
+        content, info = self.responses.pop(0)
+        info = dict(info)
+        info['url'] = url
+        return content, info
+
+
+def test_json_api_helper_stats(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('time.sleep', sleeps.append)
+    http_helper = FakeHTTPHelper([
+        (b'{}', {'status': 429, 'content-type': 'application/json', 'retry-after': '3', 'rate_limit_wait': 0.5}),
+        (b'{"a": 1}', {'status': 200, 'content-type': 'application/json'}),
+        (None, {'status': 204}),
+    ])
+    stats = APIStats()
+    api = JSONAPIHelper(http_helper, '123', 'https://example.com/', api_stats=stats)
+    result, info = api._get('v1/zones/abc', expected=[200])
+    assert result == {'a': 1}
+    assert 'rate_limit_wait' not in info
+    api._delete('v1/zones/abc', must_have_content=False, expected=[204])
+    assert sleeps == [3]
+    data = stats.to_dict()
+    assert data['requests'] == 3
+    assert data['wait'] == 3.5
+    assert data['statuses'] == {'200': 1, '204': 1, '429': 1}
+    assert [(endpoint['method'], endpoint['url'], endpoint['requests']) for endpoint in data['endpoints']] == [
+        ('GET', '/v1/zones/{id}', 2),
+        ('DELETE', '/v1/zones/{id}', 1),
+    ]
+
+
+class FakeModule(object):
+    def __init__(self, params):
+        self.params = params
+
+
+class FakeAPI(object):
+    def __init__(self, api_stats):
+        self.api_stats = api_stats
+
+
+def test_get_api_stats_result():
+    stats = APIStats()
+    stats.record('GET', 'https://example.com/v1/zones', 200, 1, 0.5)
+
+    module = FakeModule({'collect_api_stats': True})
+    assert get_api_stats_result(module, FakeAPI(stats)) == {'api_stats': stats.to_dict()}
+
+    module = FakeModule({'collect_api_stats': False, 'api_trace_file': '/tmp/foo'})
+    assert get_api_stats_result(module, FakeAPI(stats)) == {}
+
+    module = FakeModule({'collect_api_stats': True})
+    assert get_api_stats_result(module, FakeAPI(None)) == {}
+    # The API could not be created
+    assert get_api_stats_result(module, None) == {}
+
+
+def test_wsdl_composer_stats():
+    pytest.importorskip('lxml.etree')
+    from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.wsdl import Composer
+
+    response = '\n'.join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        ''.join([
+            '<SOAP-ENV:Envelope',
+            ' xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/"',
+            ' xmlns:ns1="https://example.com/api"',
+            ' xmlns:xsd="http://www.w3.org/2001/XMLSchema"',
+            ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"',
+            ' SOAP-ENV:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"',
+            '>',
+        ]),
+        '  <SOAP-ENV:Body>',
+        '    <ns1:getZoneResponse>',
+        '      <return xsi:type="xsd:boolean">true</return>',
+        '    </ns1:getZoneResponse>',
+        '  </SOAP-ENV:Body>',
+        '</SOAP-ENV:Envelope>',
+    ]).encode('utf-8')
+    stats = APIStats()
+    http_helper = FakeHTTPHelper([(response, {'status': 200, 'rate_limit_wait': 0.25})])
+    composer = Composer(http_helper, 'https://example.com/api', api_stats=stats)
+    composer.add_simple_command('getZone', sZoneName='example.com')
+    assert composer.execute().get_result('getZoneResponse') is True
+    data = stats.to_dict()
+    assert data['requests'] == 1
+    assert data['wait'] == 0.25
+    assert data['bytes'] == len(response)
+    assert data['endpoints'][0]['method'] == 'POST'
+    assert data['endpoints'][0]['url'] == '/api#getZone'
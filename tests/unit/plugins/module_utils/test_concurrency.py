@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import threading
+import time
+
+import pytest
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.concurrency import (
+    run_concurrently,
+)
+
+
+def test_run_concurrently_sequential():
+    order = []
+
+    def job(index):
+        def f():
+            order.append(index)
+            return index * 2
+        return f
+
+    assert run_concurrently([job(i) for i in range(5)]) == [0, 2, 4, 6, 8]
+    assert order == [0, 1, 2, 3, 4]
+    assert run_concurrently([], 4) == []
+
+
+def test_run_concurrently_parallel():
+    lock = threading.Lock()
+    state = {'running': 0, 'max_running': 0}
+
+    def job(index):
+        def f():
+            with lock:
+                state['running'] += 1
+                state['max_running'] = max(state['max_running'], state['running'])
+            # Later jobs finish earlier
+            time.sleep(0.001 * (10 - index))
+            with lock:
+                state['running'] -= 1
+            return index
+        return f
+
+    assert run_concurrently([job(i) for i in range(10)], 3) == list(range(10))
+    assert 1 <= state['max_running'] <= 3
+
+
+def test_run_concurrently_error():
+    started = []
+
+    def job(index):
+        def f():
+            started.append(index)
+            if index in (1, 2):
+                raise ValueError('Job {0} failed'.format(index))
+            return index
+        return f
+
+    with pytest.raises(ValueError) as exc:
+        run_concurrently([job(i) for i in range(3)], 1)
+    assert exc.value.args[0] == 'Job 1 failed'
+    assert started == [0, 1]
+
+    with pytest.raises(ValueError) as exc:
+        run_concurrently([job(i) for i in range(3)], 4)
+    assert exc.value.args[0] == 'Job 1 failed'
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import os
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import HTTPHelper
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http_cache import (
+    ResponseCache,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.json_api_helper import (
+    JSONAPIHelper,
+)
+
+
+class FakeClock(object):
+    def __init__(self, now=1700000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeHTTPHelper(HTTPHelper):
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def fetch_url(self, url, method='GET', headers=None, data=None, timeout=None):
+        self.calls.append((method, url, dict(headers or {})))
+        content, info = self.responses.pop(0)
+        info = dict(info)
+        info['url'] = url
+        return content, info
+
+
+def test_response_cache(tmpdir):
+    clock = FakeClock()
+    directory = os.path.join(str(tmpdir), 'cache')
+    cache = ResponseCache(directory, max_age=5, clock=clock)
+    assert cache.get('a') is None
+    cache.clear()
+
+    cache.put('a', b'foo', {'status': 200, 'etag': '"1"'})
+    cache.put('b', b'bar', {'status': 200})
+    cache.put('c', None, {'status': 200})
+    a = cache.get('a')
+    assert a.content == b'foo'
+    assert a.etag == '"1"'
+    assert a.last_modified is None
+    assert not cache.is_fresh(a)
+    b = cache.get('b')
+    assert b.content == b'bar'
+    assert cache.is_fresh(b)
+    assert cache.get('c').content is None
+    clock.now += 5
+    assert not cache.is_fresh(b)
+
+    with open(cache._get_path('d'), 'wb') as f:
+        f.write(b'{')
+    assert cache.get('d') is None
+
+    cache.clear()
+    assert cache.get('a') is None
+    assert os.listdir(directory) == []
+
+    cache = ResponseCache(directory, max_age=0, clock=clock)
+    cache.put('b', b'bar', {'status': 200})
+    assert cache.get('b') is None
+
+
+def test_json_api_helper_conditional_get(tmpdir):
+    clock = FakeClock()
+    cache = ResponseCache(str(tmpdir), max_age=0, clock=clock)
+    http_helper = FakeHTTPHelper([
+        (b'{"a": 1}', {'status': 200, 'content-type': 'application/json', 'etag': '"x"', 'last-modified': 'yesterday'}),
+        (b'', {'status': 304}),
+        (b'{"a": 2}', {'status': 200, 'content-type': 'application/json', 'etag': '"y"'}),
+    ])
+    api = JSONAPIHelper(http_helper, '123', 'https://example.com/', response_cache=cache)
+    assert api._get('zones', expected=[200])[0] == {'a': 1}
+    assert api._get('zones', expected=[200])[0] == {'a': 1}
+    assert api._get('zones', expected=[200])[0] == {'a': 2}
+    assert [headers.get('If-None-Match') for method, url, headers in http_helper.calls] == [None, '"x"', '"x"']
+    assert [headers.get('If-Modified-Since') for method, url, headers in http_helper.calls] == [None, 'yesterday', 'yesterday']
+
+    # Another token does not see the stored response
+    http_helper = FakeHTTPHelper([
+        (b'{"a": 3}', {'status': 200, 'content-type': 'application/json'}),
+    ])
+    api = JSONAPIHelper(http_helper, '456', 'https://example.com/', response_cache=cache)
+    assert api._get('zones', expected=[200])[0] == {'a': 3}
+    assert 'If-None-Match' not in http_helper.calls[0][2]
+
+
+def test_json_api_helper_max_age(tmpdir):
+    clock = FakeClock()
+    cache = ResponseCache(str(tmpdir), max_age=10, clock=clock)
+    http_helper = FakeHTTPHelper([
+        (b'{"a": 1}', {'status': 200, 'content-type': 'application/json'}),
+        (None, {'status': 204}),
+        (b'{"a": 2}', {'status': 200, 'content-type': 'application/json'}),
+        (b'{"a": 3}', {'status': 200, 'content-type': 'application/json'}),
+        (b'{"error": "not found"}', {'status': 404, 'content-type': 'application/json'}),
+        (b'{"error": "not found"}', {'status': 404, 'content-type': 'application/json'}),
+    ])
+    api = JSONAPIHelper(http_helper, '123', 'https://example.com/', response_cache=cache)
+    assert api._get('zones', expected=[200])[0] == {'a': 1}
+    assert api._get('zones', expected=[200])[0] == {'a': 1}
+    assert len(http_helper.calls) == 1
+    # Changes done through the API invalidate the cache
+    api._delete('zones/1', must_have_content=False, expected=[204])
+    assert api._get('zones', expected=[200])[0] == {'a': 2}
+    clock.now += 10
+    assert api._get('zones', expected=[200])[0] == {'a': 3}
+    # Error responses are not stored
+    assert api._get('zones/2', expected=[404])[1]['status'] == 404
+    assert api._get('zones/2', expected=[404])[1]['status'] == 404
+    assert [method for method, url, headers in http_helper.calls] == ['GET', 'DELETE', 'GET', 'GET', 'GET', 'GET']
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import gzip
+import io
+import json
+import sys
+import threading
+import zlib
+
+import pytest
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import (
+    CompressingHTTPHelper,
+    ContentDecoder,
+    NetworkError,
+    OpenURLHelper,
+    PoolingHTTPHelper,
+    decode_content,
+)
+
+
+if sys.version_info < (3, 7):
+    pytest.skip('ThreadingHTTPServer requires Python 3.7+', allow_module_level=True)
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: E402
+
+
+FIXTURE = json.dumps({
+    'records': [
+        {'id': str(index), 'type': 'A', 'name': 'host{0}'.format(index), 'value': '192.0.2.{0}'.format(index % 256), 'ttl': 3600}
+        for index in range(2000)
+    ],
+}).encode('utf-8')
+
+
+def _gzip(data):
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb') as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def _raw_deflate(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+ENCODED = {
+    'gzip': _gzip(FIXTURE),
+    'deflate': zlib.compress(FIXTURE),
+    'raw-deflate': _raw_deflate(FIXTURE),
+}
+
+
+@pytest.mark.parametrize('encoding, data', [
+    ('gzip', ENCODED['gzip']),
+    ('x-gzip', ENCODED['gzip']),
+    ('deflate', ENCODED['deflate']),
+    ('deflate', ENCODED['raw-deflate']),
+    # Already decoded data is passed through
+    ('gzip', FIXTURE),
+    ('deflate', FIXTURE),
+])
+def test_content_decoder(encoding, data):
+    decoder = ContentDecoder.create(encoding)
+    # Feed the data in very small chunks
+    result = b''.join([decoder.decode(data[index:index + 1]) for index in range(min(len(data), 10))])
+    result += decoder.decode(data[10:]) + decoder.flush()
+    assert result == FIXTURE
+
+
+def test_decode_content():
+    info = {'content-encoding': 'gzip', 'content-length': '123'}
+    assert decode_content(ENCODED['gzip'], info) == FIXTURE
+    assert info == {}
+    info = {'content-encoding': 'br'}
+    assert decode_content(b'foo', info) == b'foo'
+    assert info == {'content-encoding': 'br'}
+    assert decode_content(None, {'content-encoding': 'gzip'}) is None
+    assert ContentDecoder.create(None) is None
+    decoder = ContentDecoder.create('deflate')
+    assert decoder.decode(b'x') == b''
+    assert decoder.flush() == b'x'
+    with pytest.raises(NetworkError) as exc:
+        decode_content(b'\x1f\x8bfoo', {'content-encoding': 'gzip'})
+    assert exc.value.args[0].startswith('Cannot decompress gzip encoded response: ')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        accepted = [value.strip() for value in (self.headers.get('Accept-Encoding') or '').split(',') if value.strip()]
+        self.server.accepted.append(accepted)
+        fixture = self.path.strip('/')
+        encoding = 'deflate' if fixture == 'raw-deflate' else fixture
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if encoding in accepted:
+            content = ENCODED[fixture]
+            self.send_header('Content-Encoding', encoding)
+        else:
+            content = FIXTURE
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.accepted = []
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.daemon = True
+    thread.start()
+    try:
+        yield httpd
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.mark.parametrize('helper_factory', [
+    PoolingHTTPHelper,
+    OpenURLHelper,
+])
+@pytest.mark.parametrize('fixture', ['gzip', 'deflate', 'raw-deflate'])
+def test_compressing_http_helper(server, helper_factory, fixture):
+    url = 'http://127.0.0.1:{0}/{1}'.format(server.server_address[1], fixture)
+    helper = CompressingHTTPHelper(helper_factory())
+    content, info = helper.fetch_url(url)
+    assert content == FIXTURE
+    assert info['status'] == 200
+    assert 'content-encoding' not in info
+    assert server.accepted == [['gzip', 'deflate']]
+
+    # The uncompressed helper gets uncompressed data
+    content, info = helper_factory().fetch_url(url)
+    assert content == FIXTURE
+    assert 'gzip' not in server.accepted[1]
+
+    # An explicitly provided Accept-Encoding header is not changed
+    content, info = helper.fetch_url(url, headers={'accept-encoding': 'identity'})
+    assert content == FIXTURE
+    assert server.accepted[2] == ['identity']
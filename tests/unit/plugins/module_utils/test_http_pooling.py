@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import sys
+import threading
+
+import pytest
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import (
+    ModuleHTTPHelper,
+    NetworkError,
+    OpenURLHelper,
+    PoolingHTTPHelper,
+    create_http_helper,
+)
+
+from .helper import CustomProvideOptions
+
+
+if sys.version_info < (3, 7):
+    pytest.skip('ThreadingHTTPServer requires Python 3.7+', allow_module_level=True)
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        self.server.requests.append((self.command, self.path, self.client_address[1]))
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        content = b'{"method": "%s", "body": "%s"}' % (self.command.encode('ascii'), body)
+        self.send_response(200 if self.path != '/missing' else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('X-Test', 'a')
+        self.send_header('X-Test', 'b')
+        if self.path == '/close':
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = _respond
+    do_POST = _respond
+    do_PUT = _respond
+    do_DELETE = _respond
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        yield httpd
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _url(server, path):
+    return 'http://127.0.0.1:{0}{1}'.format(server.server_address[1], path)
+
+
+def test_pooling_reuses_connections(server):
+    helper = PoolingHTTPHelper()
+    content, info = helper.fetch_url(_url(server, '/a?x=1'))
+    assert content == b'{"method": "GET", "body": ""}'
+    assert info['status'] == 200
+    assert info['url'] == _url(server, '/a?x=1')
+    assert info['content-type'] == 'application/json'
+    assert info['x-test'] == 'a, b'
+    content, info = helper.fetch_url(_url(server, '/b'), method='POST', data=b'foo', headers={'content-type': 'text/plain'})
+    assert content == b'{"method": "POST", "body": "foo"}'
+    content, info = helper.fetch_url(_url(server, '/missing'), method='DELETE')
+    assert info['status'] == 404
+    assert [(method, path) for method, path, port in server.requests] == [('GET', '/a?x=1'), ('POST', '/b'), ('DELETE', '/missing')]
+    # All requests used the same TCP connection
+    assert len(set(port for method, path, port in server.requests)) == 1
+    helper.close()
+
+
+def test_pooling_connection_close(server):
+    helper = PoolingHTTPHelper()
+    helper.fetch_url(_url(server, '/close'))
+    helper.fetch_url(_url(server, '/a'))
+    helper.fetch_url(_url(server, '/b'))
+    ports = [port for method, path, port in server.requests]
+    assert ports[0] != ports[1]
+    assert ports[1] == ports[2]
+    helper.close()
+
+
+def test_pooling_stale_connection(server):
+    helper = PoolingHTTPHelper()
+    helper.fetch_url(_url(server, '/a'))
+    # Simulate the server dropping the idle connection
+    for connections in helper._idle.values():
+        for connection in connections:
+            connection.sock.close()
+    content, info = helper.fetch_url(_url(server, '/b'))
+    assert info['status'] == 200
+    assert [path for method, path, port in server.requests] == ['/a', '/b']
+    helper.close()
+
+
+def test_pooling_max_connections(server):
+    helper = PoolingHTTPHelper(max_connections=2)
+    results = []
+
+    def run(index):
+        results.append(helper.fetch_url(_url(server, '/{0}'.format(index)))[1]['status'])
+
+    threads = [threading.Thread(target=run, args=(index, )) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [200] * 8
+    assert len(set(port for method, path, port in server.requests)) <= 2
+    assert sum(len(connections) for connections in helper._idle.values()) <= 2
+    helper.close()
+
+
+def test_pooling_errors():
+    helper = PoolingHTTPHelper()
+    with pytest.raises(NetworkError) as exc:
+        helper.fetch_url('ftp://example.com/')
+    assert exc.value.args[0] == 'Connection error: cannot handle URL ftp://example.com/'
+    with pytest.raises(NetworkError) as exc:
+        # Nothing listens on port 1
+        helper.fetch_url('http://127.0.0.1:1/')
+    assert exc.value.args[0].startswith('Connection error: ')
+
+
+class _FakeModule(object):
+    def __init__(self, params):
+        self.params = params
+
+
+@pytest.mark.parametrize('variable', ['http_proxy', 'https_proxy', 'HTTPS_PROXY'])
+def test_create_http_helper_proxy(monkeypatch, variable):
+    for name in ('http_proxy', 'https_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'all_proxy', 'ALL_PROXY'):
+        monkeypatch.delenv(name, raising=False)
+    options = CustomProvideOptions({'http_keepalive': True, 'http_max_connections': 2})
+    default_helper = OpenURLHelper()
+    helper = create_http_helper(options, default_helper)
+    assert isinstance(helper, PoolingHTTPHelper)
+    assert helper._max_connections == 2
+    assert helper._timeout == 10
+    assert helper._validate_certs is True
+
+    # Proxies are not supported by PoolingHTTPHelper, so the default helper must be used
+    monkeypatch.setenv(variable, 'http://proxy.example.com:3128')
+    assert create_http_helper(options, default_helper) is default_helper
+
+
+def test_create_http_helper_validate_certs(monkeypatch):
+    for name in ('http_proxy', 'https_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'all_proxy', 'ALL_PROXY'):
+        monkeypatch.delenv(name, raising=False)
+    options = CustomProvideOptions({'http_keepalive': True, 'http_max_connections': 4})
+    helper = create_http_helper(options, ModuleHTTPHelper(_FakeModule({'validate_certs': False})))
+    assert isinstance(helper, PoolingHTTPHelper)
+    assert helper._validate_certs is False
+    assert not helper._get_ssl_context().check_hostname
+    helper = create_http_helper(options, ModuleHTTPHelper(_FakeModule({})))
+    assert helper._validate_certs is True
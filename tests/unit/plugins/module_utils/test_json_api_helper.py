@@ -18,15 +18,21 @@ from ansible_collections.community.internal_test_tools.tests.unit.utils.open_url
     OpenUrlProxy,
 )
 
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils import (
+    json_api_helper,
+)
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import OpenURLHelper
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.json_api_helper import (
     JSONAPIHelper,
     _get_header_value,
+    consume_entries,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
     DNSAPIError,
 )
 
+from .helper import FakeHTTPHelper
+
 
 def test_get_header_value():
     assert _get_header_value({'Return-Type': 1}, 'return-type') == 1
@@ -35,6 +41,15 @@ def test_get_header_value():
     assert _get_header_value({'return_type': 1}, 'Return-type') is None
 
 
+def test_consume_entries():
+    entries = [1, 2, 3]
+    seen = []
+    for entry in consume_entries(entries):
+        seen.append((entry, list(entries)))
+    assert seen == [(1, [3, 2]), (2, [3]), (3, [])]
+    assert entries == []
+
+
 def test_extract_error_message():
     api = JSONAPIHelper(MagicMock(), '123', 'https://example.com')
     assert api._extract_error_message(None) == ''
@@ -128,6 +143,32 @@ def test__request(mocker):
     mock_sleep.assert_called_once_with(10)
 
 
+def test__request_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(json_api_helper.time, 'sleep', sleeps.append)
+    http_helper = FakeHTTPHelper([
+        (b'{}', {'status': 429, 'retry-after': '3'}),
+        (b'{}', {'status': 429, 'retry-after': 'soon'}),
+        (b'{}', {'status': 200}),
+    ])
+    api_helper = JSONAPIHelper(http_helper, 'foo', 'https://example.com')
+    content, info = api_helper._request('https://example.com/foo')
+    assert (content, info['status']) == (b'{}', 200)
+    # Invalid Retry-After headers are replaced by 10 seconds
+    assert sleeps == [3.0, 10]
+    assert len(http_helper.calls) == 3
+
+    del sleeps[:]
+    http_helper = FakeHTTPHelper([(b'{}', {'status': 429, 'retry-after': '100'})] * 11)
+    api_helper = JSONAPIHelper(http_helper, 'foo', 'https://example.com')
+    with pytest.raises(DNSAPIError) as exc:
+        api_helper._request('https://example.com/foo')
+    assert exc.value.args[0] == 'Stopping after 10 failed retries with 429 Too Many Attempts'
+    # Retry-After is limited to one minute
+    assert sleeps == [60] * 10
+    assert http_helper.responses == []
+
+
 def test__post__put_no_data(mocker):
     def no_content(content):
         return content is None
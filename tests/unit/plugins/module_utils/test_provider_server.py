@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import sys
+
+import pytest
+
+
+if sys.version_info < (3, 6):
+    pytest.skip('The benchmark stand-in server requires Python 3.6+', allow_module_level=True)
+
+from ansible_collections.felixfontein.antsibull_nox_playground.tests.benchmark.benchmark import (  # noqa: E402
+    run_benchmark,
+)
+
+
+# Smoke test for the benchmark suite and its stand-in server. The behavior of the API classes is
+# tested next to them with fake HTTP helpers.
+def test_run_benchmark():
+    results = run_benchmark(
+        ['hetzner-old', 'hosttech-json'], ['record_info', 'record_sets'], [10], {'http_concurrency': 2}, {})
+    assert [(result['provider'], result['scenario'], result['outcome']) for result in results] == [
+        ('hetzner-old', 'record_info', '10 records'),
+        ('hetzner-old', 'record_sets', 'changed'),
+        ('hosttech-json', 'record_info', '10 records'),
+        ('hosttech-json', 'record_sets', 'changed'),
+    ]
+    # Read zone and records, bulk-create one record set, and update one record
+    assert results[1]['requests'] == 4
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import json
+import os
+
+import pytest
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http import (
+    HTTPHelper,
+    RateLimitedHTTPHelper,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.rate_limit import (
+    TokenBucketRateLimiter,
+)
+
+
+class FakeClock(object):
+    def __init__(self, now=1700000000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_pacing():
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(2, burst=3, clock=clock, sleep=clock.sleep)
+    for dummy in range(3):
+        limiter.acquire()
+    assert clock.sleeps == []
+    limiter.acquire()
+    assert clock.sleeps == [0.5]
+    clock.now += 10
+    # The bucket never holds more than burst tokens
+    for dummy in range(3):
+        limiter.acquire()
+    assert clock.sleeps == [0.5]
+    limiter.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(0)
+
+
+@pytest.mark.parametrize('info, expected_sleeps', [
+    ({'status': 200, 'ratelimit-remaining': '5'}, []),
+    ({'status': 200, 'ratelimit-remaining': '0'}, [1.0]),
+    ({'status': 200, 'ratelimit-remaining': '0', 'ratelimit-reset': '7'}, [7.0]),
+    ({'status': 200, 'x-ratelimit-remaining': '0', 'x-ratelimit-reset': '1700000012'}, [12.0]),
+    ({'status': 200, 'ratelimit-remaining': '0', 'ratelimit-reset': '1800000000'}, [60.0]),
+    ({'status': 429, 'retry-after': '3'}, [3.0]),
+    ({'status': 200, 'retry-after': '3'}, []),
+    ({'status': 200, 'ratelimit-remaining': 'foo'}, []),
+])
+def test_token_bucket_headers(info, expected_sleeps):
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(1, burst=10, clock=clock, sleep=clock.sleep)
+    limiter.update(info)
+    limiter.acquire()
+    assert clock.sleeps == expected_sleeps
+
+
+def test_token_bucket_shared_file(tmpdir):
+    state_file = os.path.join(str(tmpdir), 'rate-limit')
+    clock = FakeClock()
+    limiter_1 = TokenBucketRateLimiter(1, burst=2, state_file=state_file, clock=clock, sleep=clock.sleep)
+    limiter_2 = TokenBucketRateLimiter(1, burst=2, state_file=state_file, clock=clock, sleep=clock.sleep)
+    limiter_1.acquire()
+    limiter_2.acquire()
+    assert clock.sleeps == []
+    # Both limiters share one bucket, which is now empty
+    limiter_1.acquire()
+    assert clock.sleeps == [1.0]
+    limiter_2.update({'status': 429, 'retry-after': '5'})
+    limiter_1.acquire()
+    assert clock.sleeps == [1.0, 5.0]
+    with open(state_file, 'rb') as f:
+        state = json.loads(f.read().decode('utf-8'))
+    assert sorted(state) == ['blocked_until', 'tokens', 'updated']
+
+    # A broken state file is ignored
+    with open(state_file, 'wb') as f:
+        f.write(b'foo')
+    limiter_2.acquire()
+    assert clock.sleeps == [1.0, 5.0]
+
+
+class RecordingHTTPHelper(HTTPHelper):
+    def __init__(self, infos):
+        self.infos = list(infos)
+        self.calls = []
+
+    def fetch_url(self, url, method='GET', headers=None, data=None, timeout=None):
+        self.calls.append((url, method, headers, data, timeout))
+        return b'', self.infos.pop(0)
+
+
+def test_rate_limited_http_helper():
+    clock = FakeClock()
+    inner = RecordingHTTPHelper([
+        {'status': 200, 'ratelimit-remaining': '0', 'ratelimit-reset': '2'},
+        {'status': 200},
+    ])
+    helper = RateLimitedHTTPHelper(inner, TokenBucketRateLimiter(1, burst=5, clock=clock, sleep=clock.sleep))
+    helper.fetch_url('https://example.com/a', method='POST', headers={'foo': 'bar'}, data=b'baz', timeout=3)
+    helper.fetch_url('https://example.com/b')
+    assert inner.calls == [
+        ('https://example.com/a', 'POST', {'foo': 'bar'}, b'baz', 3),
+        ('https://example.com/b', 'GET', None, None, None),
+    ]
+    assert clock.sleeps == [2.0]
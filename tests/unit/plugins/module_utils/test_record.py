@@ -140,3 +140,48 @@ def test_record_str_repr():
     A2.extra['foo'] = 'bar'
     assert str(A2) == 'DNSRecord(id: 23, type: A, prefix: "bar", target: "", ttl: 1s, extra: {\'foo\': \'bar\'})'
     assert repr(A2) == 'DNSRecord(id: 23, type: A, prefix: "bar", target: "", ttl: 1s, extra: {\'foo\': \'bar\'})'
+
+
+def test_record_clone():
+    A1 = DNSRecord()
+    A1.id = 23
+    A1.prefix = 'bar'
+    A1.type = u''.join(['A', 'AAA'])
+    A1.ttl = 1
+    A1.target = '::1'
+    assert A1.type == 'AAAA'
+
+    A2 = DNSRecord()
+    A2.type = u''.join(['AA', 'AA'])
+    assert A2.type is A1.type
+
+    # Records without extra data do not allocate a dictionary for their clones
+    A3 = A1.clone()
+    assert (A3.id, A3.prefix, A3.type, A3.ttl, A3.target) == (23, 'bar', 'AAAA', 1, '::1')
+    assert A3.extra == {}
+    assert A1.extra == {}
+    A3.extra['foo'] = 'bar'
+    assert A1.extra == {}
+
+    # Extra data is copied on write
+    A4 = A3.clone()
+    assert A4.extra == {'foo': 'bar'}
+    A4.extra['foo'] = 'baz'
+    assert A3.extra == {'foo': 'bar'}
+    A5 = A3.clone()
+    A3.extra['bar'] = 'baz'
+    assert A5.extra == {'foo': 'bar'}
+    assert A3.extra == {'foo': 'bar', 'bar': 'baz'}
+    A6 = A3.clone()
+    A6.update_extra({'foo': 'baz'})
+    assert A6.extra == {'foo': 'baz', 'bar': 'baz'}
+    assert A3.extra == {'foo': 'bar', 'bar': 'baz'}
+    # Reading extra without copying
+    A7 = A3.clone()
+    assert A7._get_extra() is A3._get_extra()
+    assert A7.extra is not A3.extra
+    assert DNSRecord()._get_extra() == {}
+
+    A5.extra = {'a': 'b'}
+    assert A5.extra == {'a': 'b'}
+    assert str(A5) == 'DNSRecord(id: 23, type: AAAA, prefix: "bar", target: "::1", ttl: 1s, extra: {\'a\': \'b\'})'
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import random
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import DNSRecord
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record_diff import (
+    RecordSetDiff,
+    assign_targets,
+    match_records,
+)
+
+
+def _create_record(target, ttl=300):
+    record = DNSRecord()
+    record.prefix = 'foo'
+    record.type = 'A'
+    record.target = target
+    record.ttl = ttl
+    return record
+
+
+def _quadratic_plan(records, targets, ttl):
+    # The list-based algorithm the diff engine replaced
+    mismatch = []
+    keep = []
+    values = list(targets)
+    for record in records:
+        if record.ttl != ttl:
+            mismatch.append(record)
+            continue
+        if record.target in values:
+            values.remove(record.target)
+            keep.append(record)
+        else:
+            mismatch.append(record)
+    to_change = []
+    to_create = []
+    for target in values:
+        if mismatch:
+            to_change.append((mismatch.pop(), target))
+        else:
+            to_create.append(target)
+    return keep, to_change, to_create, mismatch
+
+
+def test_match_records():
+    A1 = _create_record('1.1.1.1')
+    A2 = _create_record('2.2.2.2')
+    A3 = _create_record('1.1.1.1')
+    A4 = _create_record('3.3.3.3', ttl=600)
+    match = match_records([A1, A2, A3, A4], ['3.3.3.3', '1.1.1.1', '4.4.4.4', '1.1.1.1', '1.1.1.1'], ttl=300)
+    assert match.keep == [A1, A3]
+    assert match.mismatch == [A2, A4]
+    assert match.missing == ['3.3.3.3', '4.4.4.4', '1.1.1.1']
+
+    match = match_records([A1, A2, A3, A4], ['3.3.3.3', '1.1.1.1'], compare_ttl=False)
+    assert match.keep == [A1, A4]
+    assert match.mismatch == [A2, A3]
+    assert match.missing == []
+
+
+def test_assign_targets():
+    A1 = _create_record('1.1.1.1')
+    A2 = _create_record('2.2.2.2')
+    A3 = _create_record('3.3.3.3')
+    assignment = assign_targets([A1, A2, A3], ['4.4.4.4', '5.5.5.5'], 'bar', 'A', 3600)
+    assert assignment.to_change == [A3, A2]
+    assert assignment.to_create == []
+    assert assignment.unused == [A1]
+    assert assignment.records == [A3, A2]
+    assert [(r.prefix, r.type, r.ttl, r.target) for r in assignment.records] == [
+        ('bar', 'A', 3600, '4.4.4.4'),
+        ('bar', 'A', 3600, '5.5.5.5'),
+    ]
+    assert A1.target == '1.1.1.1'
+
+    assignment = assign_targets([A1], ['6.6.6.6', '7.7.7.7'], None, 'AAAA', None)
+    assert assignment.to_change == [A1]
+    assert len(assignment.to_create) == 1
+    assert assignment.unused == []
+    assert assignment.records == [A1, assignment.to_create[0]]
+    assert [(r.prefix, r.type, r.ttl, r.target) for r in assignment.records] == [
+        (None, 'AAAA', None, '6.6.6.6'),
+        (None, 'AAAA', None, '7.7.7.7'),
+    ]
+
+
+def test_record_set_diff():
+    assert not RecordSetDiff()
+    assert RecordSetDiff(added=[_create_record('1.1.1.1')])
+    assert RecordSetDiff(removed=[_create_record('1.1.1.1')])
+
+
+def test_same_plan_as_quadratic_algorithm():
+    rng = random.Random(42)
+    for dummy in range(300):
+        pool = ['v{0}'.format(i) for i in range(rng.randint(1, 6))]
+        records = [
+            _create_record(rng.choice(pool), ttl=rng.choice([300, 300, 600]))
+            for dummy2 in range(rng.randint(0, 8))
+        ]
+        targets = [rng.choice(pool) for dummy2 in range(rng.randint(0, 8))]
+
+        expected_keep, expected_change, expected_create, expected_delete = _quadratic_plan(records, targets, 300)
+
+        match = match_records(records, targets, ttl=300)
+        # assign_targets() modifies the records, so compare the pairing before that
+        reusable = list(match.mismatch)
+        pairs = list(zip(reversed(reusable), match.missing))
+        assignment = assign_targets(match.mismatch, match.missing, 'foo', 'A', 300)
+
+        assert match.keep == expected_keep
+        assert pairs == expected_change
+        assert assignment.to_change == [record for record, dummy2 in expected_change]
+        assert [record.target for record in assignment.to_create] == expected_create
+        assert assignment.unused == expected_delete
@@ -115,3 +115,36 @@ def test_record_str_repr():
         "DNSRecordSet(id: foo/A, type: A, prefix: \"foo\", ttl: default, records: [DNSRecord(type: A,"
         " prefix: \"foo\", target: \"1.2.3.6\", ttl: default)], extra: {'foo': 'bar'})"
     )
+
+
+def test_record_set_clone():
+    A1 = DNSRecord()
+    A1.type = 'A'
+    A1.target = '1.2.3.4'
+    A1.extra['foo'] = 'bar'
+
+    a1 = DNSRecordSet()
+    a1.id = "foo/A"
+    a1.type = 'A'
+    a1.prefix = "foo"
+    a1.ttl = 300
+    a1.records = [A1]
+    a1.extra['foo'] = 'bar'
+
+    a2 = a1.clone()
+    # The extra dictionaries are shared until they are accessed
+    assert a2._get_extra() is a1._get_extra()
+    assert a2.records[0]._get_extra() is A1._get_extra()
+    assert (a2.id, a2.type, a2.prefix, a2.ttl) == ("foo/A", 'A', "foo", 300)
+    assert a2.records is not a1.records
+    assert a2.records[0] is not A1
+    assert a2.records[0].target == '1.2.3.4'
+    assert a2.records[0].extra == {'foo': 'bar'}
+    assert a2.extra == {'foo': 'bar'}
+
+    a2.extra['foo'] = 'baz'
+    a2.records[0].extra['foo'] = 'baz'
+    a2.records[0].target = '1.2.3.5'
+    assert a1.extra == {'foo': 'bar'}
+    assert A1.extra == {'foo': 'bar'}
+    assert A1.target == '1.2.3.4'
@@ -14,6 +14,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_ut
     DNSRecordSet,
 )
 from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone import (
+    NOT_PROVIDED,
     DNSZone,
     DNSZoneWithRecords,
     DNSZoneWithRecordSets,
@@ -111,3 +112,70 @@ def test_zone_with_record_sets_str_repr():
         ' ttl: 5m, records: [DNSRecord(type: A, prefix: (none), target: "1.2.3.4", ttl: 5m)]), DNSRecordSet(type: A, prefix:'
         ' "bar", ttl: 1s, records: [DNSRecord(id: 23, type: A, prefix: "bar", target: "", ttl: 1s, extra: {\'foo\': 23})], extra: {\'baz\': \'bam\'})])'
     )
+
+
+def _create_record(record_id, prefix, record_type, target):
+    record = DNSRecord()
+    record.id = record_id
+    record.prefix = prefix
+    record.type = record_type
+    record.target = target
+    return record
+
+
+def test_zone_with_records_index():
+    A1 = _create_record(1, None, 'A', '1.2.3.4')
+    A2 = _create_record(2, 'foo', 'A', '1.2.3.5')
+    AAAA1 = _create_record(3, None, 'AAAA', '::1')
+    A3 = _create_record(4, None, 'A', '1.2.3.6')
+    TXT1 = _create_record(None, 'foo', 'TXT', 'bar')
+    ZZ = DNSZoneWithRecords(DNSZone('foo'), [A1, A2, AAAA1, A3, TXT1])
+    assert ZZ.find_records() == [A1, A2, AAAA1, A3, TXT1]
+    assert ZZ.find_records(prefix=None) == [A1, AAAA1, A3]
+    assert ZZ.find_records(prefix='foo') == [A2, TXT1]
+    assert ZZ.find_records(prefix='bar') == []
+    assert ZZ.find_records(record_type='A') == [A1, A2, A3]
+    assert ZZ.find_records(prefix=None, record_type='A') == [A1, A3]
+    assert ZZ.find_records(prefix=NOT_PROVIDED, record_type='MX') == []
+    assert ZZ.get_record_by_id(3) is AAAA1
+    assert ZZ.get_record_by_id(5) is None
+    assert list(ZZ.index.by_prefix_and_type) == [(None, 'A'), ('foo', 'A'), (None, 'AAAA'), ('foo', 'TXT')]
+    assert ZZ.index.find_by_types(['A']) == [A1, A2, A3]
+    assert ZZ.index.find_by_types(['A', 'TXT', 'CNAME']) == [A1, A2, A3, TXT1]
+    assert ZZ.index.find_by_types(['A', 'AAAA', 'TXT']) == [A1, A2, AAAA1, A3, TXT1]
+    assert ZZ.index.find_by_types(['CNAME']) == []
+
+    # Returned lists can be modified without affecting the index
+    ZZ.find_records(prefix='foo').append(A1)
+    assert ZZ.find_records(prefix='foo') == [A2, TXT1]
+
+    # Replacing the records resets the index
+    ZZ.records = [A2]
+    assert ZZ.find_records(prefix=None) == []
+    ZZ.records.append(A1)
+    ZZ.invalidate_index()
+    assert ZZ.find_records(prefix=None) == [A1]
+
+
+def test_zone_with_record_sets_index():
+    a1 = DNSRecordSet()
+    a1.id = 'a1'
+    a1.prefix = None
+    a1.type = 'A'
+    a2 = DNSRecordSet()
+    a2.id = 'a2'
+    a2.prefix = 'foo'
+    a2.type = 'A'
+    aaaa1 = DNSRecordSet()
+    aaaa1.id = 'aaaa1'
+    aaaa1.prefix = None
+    aaaa1.type = 'AAAA'
+    ZZ = DNSZoneWithRecordSets(DNSZone('foo'), [a1, a2, aaaa1])
+    assert ZZ.find_record_sets() == [a1, a2, aaaa1]
+    assert ZZ.find_record_sets(prefix=None) == [a1, aaaa1]
+    assert ZZ.find_record_sets(record_type='A') == [a1, a2]
+    assert ZZ.find_record_sets(prefix='foo', record_type='A') == [a2]
+    assert ZZ.get_record_set('foo', 'A') is a2
+    assert ZZ.get_record_set('foo', 'AAAA') is None
+    assert ZZ.get_record_set_by_id('aaaa1') is aaaa1
+    assert ZZ.get_record_set_by_id('aaaa2') is None
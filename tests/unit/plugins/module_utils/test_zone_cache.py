@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import os
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone import DNSZone
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_cache import (
+    ZoneCache,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
+    get_zone_with_entries,
+)
+
+
+class FakeClock(object):
+    def __init__(self, now=1700000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _create_zone(name, zone_id):
+    zone = DNSZone(name, info={'ttl': 3600})
+    zone.id = zone_id
+    return zone
+
+
+def test_zone_cache(tmpdir):
+    clock = FakeClock()
+    directory = os.path.join(str(tmpdir), 'cache')
+    cache = ZoneCache(directory, 'a', max_age=5, clock=clock)
+    assert cache.get_by_name('example.com') is None
+    assert cache.get_by_id(42) is None
+
+    cache.put(_create_zone('example.com', 42), name='example.com.')
+    for zone in (cache.get_by_name('example.com'), cache.get_by_name('example.com.'), cache.get_by_id(42)):
+        assert (zone.name, zone.id, zone.info) == ('example.com', 42, {'ttl': 3600})
+    # IDs are not converted
+    assert cache.get_by_id('42') is None
+    # Other namespaces do not see the zone
+    assert ZoneCache(directory, 'b', max_age=5, clock=clock).get_by_name('example.com') is None
+
+    clock.now += 5
+    assert cache.get_by_name('example.com') is None
+    clock.now -= 5
+
+    cache.invalidate(_create_zone('example.com', 42), name='example.com.')
+    assert cache.get_by_name('example.com') is None
+    assert cache.get_by_name('example.com.') is None
+    assert cache.get_by_id(42) is None
+    cache.invalidate(_create_zone('example.com', 42))
+
+    with open(cache._get_path('name', 'example.org'), 'wb') as f:
+        f.write(b'{')
+    assert cache.get_by_name('example.org') is None
+
+    cache = ZoneCache(os.path.join(str(tmpdir), 'other'), 'a', max_age=0, clock=clock)
+    cache.put(_create_zone('example.com', 42))
+    assert cache.get_by_name('example.com') is None
+
+
+def test_get_zone_with_entries(tmpdir):
+    cache = ZoneCache(str(tmpdir), 'a')
+    zones = {'example.com': _create_zone('example.com', 42)}
+    entries = {42: ['record']}
+    lookups = []
+
+    def get_zone(name):
+        lookups.append(name)
+        return zones.get(name)
+
+    def get_entries(zone):
+        return entries.get(zone.id)
+
+    assert get_zone_with_entries(None, get_zone, get_entries, name='example.com')[1] == ['record']
+    assert get_zone_with_entries(cache, get_zone, get_entries, name='example.com')[1] == ['record']
+    assert get_zone_with_entries(cache, get_zone, get_entries, name='example.com')[1] == ['record']
+    assert get_zone_with_entries(cache, get_zone, get_entries, zone_id=42)[1] == ['record']
+    assert lookups == ['example.com', 'example.com']
+
+    # The zone was deleted and created again with another ID
+    zones['example.com'] = _create_zone('example.com', 43)
+    entries = {43: ['other record']}
+    zone, zone_entries = get_zone_with_entries(cache, get_zone, get_entries, name='example.com')
+    assert (zone.id, zone_entries) == (43, ['other record'])
+    assert lookups == ['example.com', 'example.com', 'example.com']
+    assert cache.get_by_id(42) is None
+    assert cache.get_by_id(43).name == 'example.com'
+
+    # The zone was deleted
+    del zones['example.com']
+    entries = {}
+    assert get_zone_with_entries(cache, get_zone, get_entries, name='example.com') is None
+    assert cache.get_by_name('example.com') is None
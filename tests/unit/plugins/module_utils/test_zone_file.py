@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import pytest
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.conversion.base import DNSConversionError
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import DNSRecord
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_file import (
+    format_zone_file,
+)
+
+
+def _create_record(prefix, record_type, target, ttl=None):
+    record = DNSRecord()
+    record.prefix = prefix
+    record.type = record_type
+    record.target = target
+    record.ttl = ttl
+    return record
+
+
+def test_format_zone_file():
+    records = [
+        _create_record(None, 'NS', 'ns1.example.net.', ttl=3600),
+        _create_record('*', 'A', '1.2.3.4'),
+        _create_record('foo', 'TXT', '"bar baz"', ttl=300),
+        _create_record(None, 'SOA', 'ns1.example.net. hostmaster.example.com. 1 86400 10800 3600000 3600', ttl=3600),
+    ]
+    assert format_zone_file('example.com', records, default_ttl=7200) == '\n'.join([
+        '$ORIGIN example.com.',
+        '$TTL 7200',
+        '@ 3600 IN SOA ns1.example.net. hostmaster.example.com. 1 86400 10800 3600000 3600',
+        '@ 3600 IN NS ns1.example.net.',
+        '* IN A 1.2.3.4',
+        'foo 300 IN TXT "bar baz"',
+        '',
+    ])
+    assert format_zone_file('example.org', []) == '$ORIGIN example.org.\n'
+
+
+def test_format_zone_file_comment():
+    records = [
+        _create_record('foo', 'TXT', '"bar"'),
+        _create_record(None, 'NS', 'ns1.example.net.', ttl=3600),
+    ]
+    records[0].update_extra({'comment': ''})
+    assert format_zone_file('example.com', records) == '\n'.join([
+        '$ORIGIN example.com.',
+        'foo IN TXT "bar"',
+        '@ 3600 IN NS ns1.example.net.',
+        '',
+    ])
+
+    records[1].update_extra({'comment': 'primary'})
+    with pytest.raises(DNSConversionError) as exc:
+        format_zone_file('example.com', records)
+    assert exc.value.error_message == (
+        'Cannot write the comment of the NS record of @ to a zone file. Remove the comment, or do not import a zone file'
+    )
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025, Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import threading
+import time
+
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.record import (
+    DNSRecord,
+)
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.zone_record_api import (
+    NOT_PROVIDED,
+    DNSAPIError,
+    ZoneRecordAPI,
+    run_bulk_changes,
+)
+
+
+def _change(errors=None):
+    def change(zone_id, item):
+        if errors and item in errors:
+            return item, False, errors[item]
+        return item, True, None
+
+    return change
+
+
+def test_run_bulk_changes_sequential():
+    err = DNSAPIError('err')
+    items = {1: ['a', 'b'], 2: [], 3: ['c', 'd'], 4: [], 5: ['e']}
+    assert run_bulk_changes(items, _change()) == {
+        1: [('a', True, None), ('b', True, None)],
+        2: [],
+        3: [('c', True, None), ('d', True, None)],
+        4: [],
+        5: [('e', True, None)],
+    }
+    assert run_bulk_changes(items, _change({'c': err})) == {
+        1: [('a', True, None), ('b', True, None)],
+        2: [],
+        3: [('c', False, err)],
+    }
+    assert run_bulk_changes(items, _change({'d': err})) == {
+        1: [('a', True, None), ('b', True, None)],
+        2: [],
+        3: [('c', True, None), ('d', False, err)],
+    }
+    assert run_bulk_changes(items, _change({'c': err}), stop_early_on_errors=False) == {
+        1: [('a', True, None), ('b', True, None)],
+        2: [],
+        3: [('c', False, err), ('d', True, None)],
+        4: [],
+        5: [('e', True, None)],
+    }
+
+
+def test_run_bulk_changes_concurrent():
+    lock = threading.Lock()
+    state = {'running': 0, 'max_running': 0}
+
+    def change(zone_id, item):
+        with lock:
+            state['running'] += 1
+            state['max_running'] = max(state['max_running'], state['running'])
+        time.sleep(0.02)
+        with lock:
+            state['running'] -= 1
+        return '{0}-{1}'.format(zone_id, item), True, None
+
+    items = {1: list(range(5)), 2: list(range(5))}
+    result = run_bulk_changes(items, change, max_workers=4)
+    assert result == {
+        1: [('1-{0}'.format(i), True, None) for i in range(5)],
+        2: [('2-{0}'.format(i), True, None) for i in range(5)],
+    }
+    assert 1 < state['max_running'] <= 4
+
+
+def test_run_bulk_changes_concurrent_stop_early():
+    err = DNSAPIError('err')
+    started = []
+    lock = threading.Lock()
+
+    def change(zone_id, item):
+        with lock:
+            started.append(item)
+        if item == 0:
+            return item, False, err
+        time.sleep(0.02)
+        return item, True, None
+
+    result = run_bulk_changes({1: list(range(20)), 2: list(range(20, 40))}, change, max_workers=2)
+    # The failing change is reported, together with all changes which were already running;
+    # no further changes are started
+    assert result[1][0] == (0, False, err)
+    assert len(started) < 40
+    assert sorted(item for item, dummy, dummy2 in result[1] + result.get(2, [])) == sorted(started)
+
+
+class _TestZoneRecordAPI(ZoneRecordAPI):
+    def __init__(self, concurrency):
+        self._concurrency = concurrency
+        self._lock = threading.Lock()
+        self.threads = set()
+        self.deleted = []
+
+    def get_zone_by_name(self, name):
+        raise NotImplementedError()  # pragma: no coverage
+
+    def get_zone_by_id(self, zone_id):
+        raise NotImplementedError()  # pragma: no coverage
+
+    def get_zone_records(self, zone_id, prefix=NOT_PROVIDED, record_type=NOT_PROVIDED):
+        raise NotImplementedError()  # pragma: no coverage
+
+    def add_record(self, zone_id, record):
+        raise NotImplementedError()  # pragma: no coverage
+
+    def update_record(self, zone_id, record):
+        raise NotImplementedError()  # pragma: no coverage
+
+    def delete_record(self, zone_id, record):
+        time.sleep(0.01)
+        with self._lock:
+            self.threads.add(threading.current_thread().ident)
+            self.deleted.append(record.id)
+        if record.id == 'missing':
+            raise DNSAPIError('not found')
+        return True
+
+
+def test_delete_records_concurrent():
+    records = []
+    for index in range(6):
+        record = DNSRecord()
+        record.id = str(index)
+        records.append(record)
+
+    api = _TestZoneRecordAPI(3)
+    assert api.delete_records({'z1': records[:3], 'z2': records[3:]}) == {
+        'z1': [(record, True, None) for record in records[:3]],
+        'z2': [(record, True, None) for record in records[3:]],
+    }
+    assert sorted(api.deleted) == [str(index) for index in range(6)]
+    assert len(api.threads) > 1
+
+    missing = DNSRecord()
+    missing.id = 'missing'
+    api = _TestZoneRecordAPI(3)
+    result = api.delete_records({'z1': [records[0], missing, records[1]]}, stop_early_on_errors=False)
+    assert result['z1'][0] == (records[0], True, None)
+    assert result['z1'][1][0] is missing
+    assert result['z1'][1][1] is False
+    assert str(result['z1'][1][2]) == 'not found'
+    assert result['z1'][2] == (records[1], True, None)
@@ -7,6 +7,8 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import json
+
 from ansible_collections.community.internal_test_tools.tests.unit.compat.mock import (
     patch,
 )
@@ -460,6 +462,100 @@ class TestHetznerDNSRecordJSON(BaseTestModule):
             ],
         }
 
+    def test_removal_prune_diff_scope_changed(self, mocker):
+        result = self.run_module_success(mocker, hetzner_dns_record_sets, {
+            'hetzner_token': 'foo',
+            'zone_name': 'example.com',
+            'prune': 'true',
+            'diff_scope': 'changed',
+            'record_sets': [
+                {
+                    'prefix': '*',
+                    'ttl': 3600,
+                    'type': 'A',
+                    'value': ['1.2.3.5'],
+                },
+                {
+                    'prefix': '',
+                    'ttl': 3600,
+                    'type': 'A',
+                    'value': ['1.2.3.4'],
+                },
+                {
+                    'prefix': '@',
+                    'ttl': 3600,
+                    'type': 'AAAA',
+                    'value': [],
+                },
+                {
+                    'record': 'example.com',
+                    'type': 'MX',
+                    'ignore': True,
+                },
+                {
+                    'record': 'example.com',
+                    'type': 'NS',
+                    'ignore': True,
+                },
+                {
+                    'record': 'example.com',
+                    'type': 'SOA',
+                    'ignore': True,
+                },
+                {
+                    'record': 'foo.example.com',
+                    'type': 'TXT',
+                    'ttl': None,
+                    'value': [u'bär "with quotes" (use \\ to escape)'],
+                },
+            ],
+            '_ansible_check_mode': True,
+            '_ansible_diff': True,
+            '_ansible_remote_tmp': '/tmp/tmp',
+            '_ansible_keep_remote_files': True,
+        }, [
+            FetchUrlCall('GET', 200)
+            .expect_header('accept', 'application/json')
+            .expect_header('auth-api-token', 'foo')
+            .expect_url('https://dns.hetzner.com/api/v1/zones', without_query=True)
+            .expect_query_values('name', 'example.com')
+            .return_header('Content-Type', 'application/json')
+            .result_json(HETZNER_JSON_ZONE_LIST_RESULT),
+            FetchUrlCall('GET', 200)
+            .expect_header('accept', 'application/json')
+            .expect_header('auth-api-token', 'foo')
+            .expect_url('https://dns.hetzner.com/api/v1/records', without_query=True)
+            .expect_query_values('zone_id', '42')
+            .expect_query_values('page', '1')
+            .expect_query_values('per_page', '100')
+            .return_header('Content-Type', 'application/json')
+            .result_json(HETZNER_JSON_ZONE_RECORDS_GET_RESULT),
+        ])
+
+        assert result['changed'] is True
+        assert result['zone_id'] == '42'
+        assert result['diff']['before'] == {
+            'record_sets': [
+                {
+                    'record': '*.example.com',
+                    'prefix': '*',
+                    'ttl': 3600,
+                    'type': 'AAAA',
+                    'value': ['2001:1:2::4'],
+                },
+                {
+                    'record': 'example.com',
+                    'prefix': '',
+                    'ttl': 3600,
+                    'type': 'AAAA',
+                    'value': ['2001:1:2::3'],
+                },
+            ],
+        }
+        assert result['diff']['after'] == {
+            'record_sets': [],
+        }
+
     def test_change_add_one_check_mode(self, mocker):
         result = self.run_module_success(mocker, hetzner_dns_record_sets, {
             'hetzner_token': 'foo',
@@ -1079,44 +1175,41 @@ class TestHetznerDNSRecordJSON(BaseTestModule):
             FetchUrlCall('PUT', 200)
             .expect_header('accept', 'application/json')
             .expect_header('auth-api-token', 'foo')
-            .expect_url('https://dns.hetzner.com/api/v1/records/132')
-            .expect_json_value_absent(['id'])
-            .expect_json_value(['type'], 'NS')
-            .expect_json_value(['ttl'], 3600)
-            .expect_json_value(['zone_id'], '42')
-            .expect_json_value(['name'], '@')
-            .expect_json_value(['value'], 'helium.ns.hetzner.de.')
-            .return_header('Content-Type', 'application/json')
-            .result_json({
-                'record': {
-                    'id': '130',
-                    'type': 'NS',
-                    'name': '@',
-                    'value': 'ytterbium.ns.hetzner.com.',
-                    'ttl': 3600,
-                    'zone_id': '42',
-                },
-            }),
-            FetchUrlCall('PUT', 200)
-            .expect_header('accept', 'application/json')
-            .expect_header('auth-api-token', 'foo')
-            .expect_url('https://dns.hetzner.com/api/v1/records/131')
-            .expect_json_value_absent(['id'])
-            .expect_json_value(['type'], 'NS')
-            .expect_json_value(['ttl'], 3600)
-            .expect_json_value(['zone_id'], '42')
-            .expect_json_value(['name'], '@')
-            .expect_json_value(['value'], 'ytterbium.ns.hetzner.com.')
+            .expect_url('https://dns.hetzner.com/api/v1/records/bulk')
+            .expect_json_value(['records', 0, 'id'], '132')
+            .expect_json_value(['records', 0, 'type'], 'NS')
+            .expect_json_value(['records', 0, 'ttl'], 3600)
+            .expect_json_value(['records', 0, 'zone_id'], '42')
+            .expect_json_value(['records', 0, 'name'], '@')
+            .expect_json_value(['records', 0, 'value'], 'helium.ns.hetzner.de.')
+            .expect_json_value(['records', 1, 'id'], '131')
+            .expect_json_value(['records', 1, 'type'], 'NS')
+            .expect_json_value(['records', 1, 'ttl'], 3600)
+            .expect_json_value(['records', 1, 'zone_id'], '42')
+            .expect_json_value(['records', 1, 'name'], '@')
+            .expect_json_value(['records', 1, 'value'], 'ytterbium.ns.hetzner.com.')
+            .expect_json_value_absent(['records', 2])
             .return_header('Content-Type', 'application/json')
             .result_json({
-                'record': {
-                    'id': '131',
-                    'type': 'NS',
-                    'name': '@',
-                    'value': 'ytterbium.ns.hetzner.com.',
-                    'ttl': 3600,
-                    'zone_id': '42',
-                },
+                'records': [
+                    {
+                        'id': '132',
+                        'type': 'NS',
+                        'name': '@',
+                        'value': 'helium.ns.hetzner.de.',
+                        'ttl': 3600,
+                        'zone_id': '42',
+                    },
+                    {
+                        'id': '131',
+                        'type': 'NS',
+                        'name': '@',
+                        'value': 'ytterbium.ns.hetzner.com.',
+                        'ttl': 3600,
+                        'zone_id': '42',
+                    },
+                ],
+                'failed_records': [],
             }),
         ])
 
@@ -2782,6 +2875,149 @@ class TestHetznerDNSRecordNewJSON(BaseTestModule):
         assert result['changed'] is True
         assert result['zone_id'] == '42'
 
+    def test_change_add_one_zone_file_import_comment(self, mocker):
+        # The NS record oxygen.ns.hetzner.com. has a comment, which cannot be imported
+        result = self.run_module_failed(mocker, hetzner_dns_record_sets, {
+            'hetzner_api_token': 'foo',
+            'zone_id': '42',
+            'update_strategy': 'zone_file_import',
+            'record_sets': [
+                {
+                    'record': 'example.com',
+                    'type': 'CAA',
+                    'ttl': 3600,
+                    'value': [
+                        '0 issue "letsencrypt.org"',
+                    ],
+                },
+            ],
+            '_ansible_remote_tmp': '/tmp/tmp',
+            '_ansible_keep_remote_files': True,
+        }, [
+            FetchUrlCall('GET', 200)
+            .expect_header('accept', 'application/json')
+            .expect_header('Authorization', 'Bearer foo')
+            .expect_url('https://api.hetzner.cloud/v1/zones/42')
+            .return_header('Content-Type', 'application/json')
+            .result_json(HETZNER_ZONE_NEW_JSON),
+            FetchUrlCall('GET', 200)
+            .expect_header('accept', 'application/json')
+            .expect_header('Authorization', 'Bearer foo')
+            .expect_url('https://api.hetzner.cloud/v1/zones/42/rrsets', without_query=True)
+            .expect_query_absent('name')
+            .expect_query_absent('type')
+            .expect_query_values('page', '1')
+            .expect_query_values('per_page', '100')
+            .return_header('Content-Type', 'application/json')
+            .result_json(get_hetzner_new_json_records()),
+        ])
+
+        assert result['msg'] == (
+            'Error while converting DNS values: Cannot write the comment of the NS record of @ to a zone file.'
+            ' Remove the comment, or do not import a zone file'
+        )
+
+    def test_change_add_one_zone_file_import(self, mocker):
+        ns_record_set = get_hetzner_new_json_records(name='@', record_type='NS')['rrsets'][0]
+        ns_record_set = dict(ns_record_set, records=[dict(record, comment='') for record in ns_record_set['records']])
+
+        def is_zone_file(content):
+            lines = json.loads(content.decode('utf-8'))['zonefile'].splitlines()
+            return (
+                lines[:3] == [
+                    '$ORIGIN example.com.',
+                    '$TTL 3600',
+                    '@ IN SOA hydrogen.ns.hetzner.com. dns.hetzner.com. 2021070900 86400 10800 3600000 3600',
+                ]
+                and '@ 3600 IN CAA 0 issue "letsencrypt.org"' in lines
+                and '@ IN NS oxygen.ns.hetzner.com.' in lines
+                and '* 3600 IN AAAA 2001:1:2::4' in lines
+            )
+
+        with patch('time.sleep', mock_sleep):
+            result = self.run_module_success(mocker, hetzner_dns_record_sets, {
+                'hetzner_api_token': 'foo',
+                'zone_id': '42',
+                'update_strategy': 'zone_file_import',
+                'record_sets': [
+                    {
+                        'record': 'example.com',
+                        'type': 'CAA',
+                        'ttl': 3600,
+                        'value': [
+                            '0 issue "letsencrypt.org"',
+                        ],
+                    },
+                ],
+                '_ansible_remote_tmp': '/tmp/tmp',
+                '_ansible_keep_remote_files': True,
+            }, [
+                FetchUrlCall('GET', 200)
+                .expect_header('accept', 'application/json')
+                .expect_header('Authorization', 'Bearer foo')
+                .expect_url('https://api.hetzner.cloud/v1/zones/42')
+                .return_header('Content-Type', 'application/json')
+                .result_json(HETZNER_ZONE_NEW_JSON),
+                FetchUrlCall('GET', 200)
+                .expect_header('accept', 'application/json')
+                .expect_header('Authorization', 'Bearer foo')
+                .expect_url('https://api.hetzner.cloud/v1/zones/42/rrsets', without_query=True)
+                .expect_query_absent('name')
+                .expect_query_absent('type')
+                .expect_query_values('page', '1')
+                .expect_query_values('per_page', '100')
+                .return_header('Content-Type', 'application/json')
+                .result_json(get_hetzner_new_json_records(update={('@', 'NS'): ns_record_set})),
+                FetchUrlCall('POST', 201)
+                .expect_header('accept', 'application/json')
+                .expect_header('Authorization', 'Bearer foo')
+                .expect_url('https://api.hetzner.cloud/v1/zones/42/actions/import_zonefile')
+                .expect_content_predicate(is_zone_file)
+                .return_header('Content-Type', 'application/json')
+                .result_json({
+                    "action": {
+                        "id": 1,
+                        "command": "import_zonefile",
+                        "status": "running",
+                        "progress": 0,
+                        "started": "2016-01-30T23:55:00Z",
+                        "finished": None,
+                        "resources": [
+                            {
+                                "id": 42,
+                                "type": "zone",
+                            },
+                        ],
+                        "error": None,
+                    },
+                }),
+                FetchUrlCall('GET', 200)
+                .expect_header('accept', 'application/json')
+                .expect_header('Authorization', 'Bearer foo')
+                .expect_url('https://api.hetzner.cloud/v1/actions/1')
+                .return_header('Content-Type', 'application/json')
+                .result_json({
+                    "action": {
+                        "id": 1,
+                        "command": "import_zonefile",
+                        "status": "success",
+                        "progress": 100,
+                        "started": "2016-01-30T23:55:00Z",
+                        "finished": "2016-01-30T23:56:00Z",
+                        "resources": [
+                            {
+                                "id": 42,
+                                "type": "zone",
+                            },
+                        ],
+                        "error": None,
+                    },
+                }),
+            ])
+
+        assert result['changed'] is True
+        assert result['zone_id'] == '42'
+
     def test_change_add_one_check_mode_prefix(self, mocker):
         result = self.run_module_success(mocker, hetzner_dns_record_sets, {
             'hetzner_api_token': 'foo',
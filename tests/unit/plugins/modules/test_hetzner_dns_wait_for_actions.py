@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.community.internal_test_tools.tests.unit.compat.mock import (
+    patch,
+)
+from ansible_collections.community.internal_test_tools.tests.unit.utils.fetch_url_module_framework import (
+    BaseTestModule,
+    FetchUrlCall,
+)
+
+# These imports are needed so patching below works
+import ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http  # noqa: F401, pylint: disable=unused-import
+from ansible_collections.felixfontein.antsibull_nox_playground.plugins.modules import hetzner_dns_wait_for_actions
+
+
+def mock_sleep(delay):
+    pass
+
+
+def _action(action_id, status, error=None):
+    return {
+        "id": action_id,
+        "command": "set_records",
+        "status": status,
+        "progress": 100 if status != "running" else 50,
+        "started": "2016-01-30T23:55:00Z",
+        "finished": "2026-01-30T23:55:00Z" if status != "running" else None,
+        "resources": [
+            {
+                "id": 42,
+                "type": "zone",
+            },
+        ],
+        "error": error,
+    }
+
+
+class TestHetznerDNSWaitForActions(BaseTestModule):
+    MOCK_ANSIBLE_MODULEUTILS_BASIC_ANSIBLEMODULE = (
+        'ansible_collections.felixfontein.antsibull_nox_playground.plugins.modules.hetzner_dns_wait_for_actions.AnsibleModule'
+    )
+    MOCK_ANSIBLE_MODULEUTILS_URLS_FETCH_URL = 'ansible_collections.felixfontein.antsibull_nox_playground.plugins.module_utils.http.fetch_url'
+
+    def test_wait(self, mocker):
+        with patch('time.sleep', mock_sleep):
+            result = self.run_module_success(mocker, hetzner_dns_wait_for_actions, {
+                'hetzner_api_token': 'foo',
+                'action_ids': [1, 2],
+                '_ansible_remote_tmp': '/tmp/tmp',
+                '_ansible_keep_remote_files': True,
+            }, [
+                FetchUrlCall('GET', 200)
+                .expect_header('accept', 'application/json')
+                .expect_header('Authorization', 'Bearer foo')
+                .expect_url('https://api.hetzner.cloud/v1/actions?id=1&id=2')
+                .return_header('Content-Type', 'application/json')
+                .result_json({
+                    "actions": [
+                        _action(1, "success"),
+                        _action(2, "running"),
+                    ],
+                }),
+                FetchUrlCall('GET', 200)
+                .expect_header('accept', 'application/json')
+                .expect_header('Authorization', 'Bearer foo')
+                .expect_url('https://api.hetzner.cloud/v1/actions/2')
+                .return_header('Content-Type', 'application/json')
+                .result_json({
+                    "action": _action(2, "success"),
+                }),
+            ])
+
+        assert result['changed'] is False
+        assert result['actions'] == [
+            {'id': 1, 'command': 'set_records', 'status': 'success', 'error': None},
+            {'id': 2, 'command': 'set_records', 'status': 'success', 'error': None},
+        ]
+
+    def test_wait_error(self, mocker):
+        with patch('time.sleep', mock_sleep):
+            result = self.run_module_failed(mocker, hetzner_dns_wait_for_actions, {
+                'hetzner_api_token': 'foo',
+                'action_ids': [1],
+                '_ansible_remote_tmp': '/tmp/tmp',
+                '_ansible_keep_remote_files': True,
+            }, [
+                FetchUrlCall('GET', 200)
+                .expect_header('accept', 'application/json')
+                .expect_header('Authorization', 'Bearer foo')
+                .expect_url('https://api.hetzner.cloud/v1/actions/1')
+                .return_header('Content-Type', 'application/json')
+                .result_json({
+                    "action": _action(1, "error", error={"code": "action_failed", "message": "Action failed"}),
+                }),
+            ])
+
+        assert result['msg'] == 'Error while waiting for actions: Action failed (action_failed)'
+        assert result['actions'] == [
+            {'id': 1, 'command': 'set_records', 'status': 'error', 'error': {"code": "action_failed", "message": "Action failed"}},
+        ]
+
+    def test_old_api(self, mocker):
+        result = self.run_module_failed(mocker, hetzner_dns_wait_for_actions, {
+            'hetzner_token': 'foo',
+            'action_ids': [1],
+            '_ansible_remote_tmp': '/tmp/tmp',
+            '_ansible_keep_remote_files': True,
+        }, [])
+
+        assert result['msg'] == 'The old API (hetzner_token) does not use actions. Use hetzner_api_token instead.'
+
+    def test_old_api_no_actions(self, mocker):
+        result = self.run_module_success(mocker, hetzner_dns_wait_for_actions, {
+            'hetzner_token': 'foo',
+            'action_ids': [],
+            '_ansible_remote_tmp': '/tmp/tmp',
+            '_ansible_keep_remote_files': True,
+        }, [])
+
+        assert result['changed'] is False
+        assert result['actions'] == []
@@ -502,9 +502,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'MX')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -544,9 +545,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -576,9 +578,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -606,9 +609,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -636,9 +640,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -668,9 +673,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', record['type'])
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is True
@@ -698,9 +704,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', record['type'])
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('DELETE', 204)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -795,9 +802,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('POST', 201)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -864,9 +872,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('POST', 201)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -919,9 +928,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('POST', 201)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -975,9 +985,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is True
@@ -1005,9 +1016,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('PUT', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -671,9 +671,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'MX')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -713,9 +714,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -754,9 +756,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -787,9 +790,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -820,9 +824,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -853,9 +858,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -887,9 +893,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -921,9 +928,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['msg'] == "Record already exists with different value. Set on_existing=replace to remove it"
@@ -953,9 +961,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', record['type'])
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('DELETE', 204)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -987,9 +996,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('DELETE', 204)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1033,9 +1043,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('DELETE', 204)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1075,9 +1086,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', record['type'])
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('DELETE', 204)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1176,9 +1188,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('POST', 201)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1233,9 +1246,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('POST', 201)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1290,9 +1304,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('POST', 201)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1347,9 +1362,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'CAA')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('POST', 500)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1397,9 +1413,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['msg'] == "Record already exists with different value. Set on_existing=replace to replace it"
@@ -1431,9 +1448,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert result['changed'] is False
@@ -1478,9 +1496,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
 
         assert extract_warnings_texts(result) == []  # pylint: disable=use-implicit-booleaness-not-comparison
@@ -1524,9 +1543,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('DELETE', 204)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1604,9 +1624,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('PUT', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1768,9 +1789,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('PUT', 500)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -1819,9 +1841,10 @@ class TestHosttechDNSRecordJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'NS')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             FetchUrlCall('PUT', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
@@ -25,6 +25,7 @@ from ansible_collections.felixfontein.antsibull_nox_playground.plugins.modules i
 from .hosttech import (
     HOSTTECH_JSON_ZONE_GET_RESULT,
     HOSTTECH_JSON_ZONE_LIST_RESULT,
+    HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT,
     HOSTTECH_WSDL_DEFAULT_ZONE_RESULT,
     HOSTTECH_WSDL_ZONE_NOT_FOUND,
     expect_wsdl_authentication,
@@ -441,9 +442,10 @@ class TestHosttechDNSRecordSetInfoJSON(BaseTestModule):
                 FetchUrlCall('GET', 200)
                 .expect_header('accept', 'application/json')
                 .expect_header('authorization', 'Bearer foo')
-                .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+                .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+                .expect_query_values('type', 'A')
                 .return_header('Content-Type', 'application/json')
-                .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+                .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
             ])
         assert result['changed'] is False
         assert result['zone_id'] == 42
@@ -474,9 +476,10 @@ class TestHosttechDNSRecordSetInfoJSON(BaseTestModule):
             FetchUrlCall('GET', 200)
             .expect_header('accept', 'application/json')
             .expect_header('authorization', 'Bearer foo')
-            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42')
+            .expect_url('https://api.ns1.hosttech.eu/api/user/v1/zones/42/records', without_query=True)
+            .expect_query_values('type', 'A')
             .return_header('Content-Type', 'application/json')
-            .result_json(HOSTTECH_JSON_ZONE_GET_RESULT),
+            .result_json(HOSTTECH_JSON_ZONE_RECORDS_GET_RESULT),
         ])
         assert result['changed'] is False
         assert result['zone_id'] == 42